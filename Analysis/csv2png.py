@@ -6,10 +6,14 @@ csv2png.py  – run from inside the analysis/ folder.
 • PNGs are written to analysis/Analysis1/ (created if absent).
 • PNG file names mirror the CSV base-names (just ".png").
 • Prints only the PNG name (not the path) after each save.
+• Tables whose CSV (and this script) are unchanged since the last run are
+  skipped – see build_cache.py; --explain says why each one is redrawn.
 """
 
 import os
+import sys
 import pathlib
+import argparse
 import math
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -18,6 +22,9 @@ HERE      = pathlib.Path(__file__).resolve().parent         # .../analysis
 PNG_DIR   = HERE / "Analysis1"
 PNG_DIR.mkdir(exist_ok=True)
 
+sys.path.insert(0, str(HERE.parent))                        # build_cache.py
+import build_cache
+
 # ------------------------------------------------------------------
 # Helper – Format floats so they do not overflow the table cells
 # ------------------------------------------------------------------
@@ -78,19 +85,29 @@ def csv_to_png(csv_path: pathlib.Path,
 # ------------------------------------------------------------------
 # Main
 # ------------------------------------------------------------------
-def main():
+def main(argv=None):
+    ap = build_cache.add_cli_flags(argparse.ArgumentParser(
+        description="Render every CSV in this folder as a PNG table."))
+    args = ap.parse_args(argv)
+
     csv_files = sorted(HERE.glob("*.csv"))
     if not csv_files:
         print("No CSV files found; nothing to convert.")
         return
 
+    cache = build_cache.BuildCache(explain=args.explain, force=args.force)
     for csv_f in csv_files:
         png_f = PNG_DIR / f"{csv_f.stem}.png"
+        if not cache.needs_build(png_f, inputs=build_cache.digest_file(csv_f),
+                                 code=[csv_to_png, prettify_dataframe]):
+            continue
         try:
             csv_to_png(csv_f, png_f)
+            cache.record(png_f)
             print(png_f.name)      # just the file name
         except Exception as exc:
             print(f"[!] Failed on {csv_f.name}: {exc}")
+    cache.save()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
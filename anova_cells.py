@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+anova_cells.py  –  Type-II factorial ANOVA from per-cell aggregates
+
+Every term of the exp_stats model is a function of the factors, so the
+fitted values are constant within a cell (one combination of all factors).
+The residual sum of squares of any such model therefore splits into
+
+    RSS = W + Σ_c n_c · (ȳ_c − ŷ_c)²
+
+with W = Σ_c m2_c the within-cell sum of squares.  The second part is a
+weighted least-squares fit on the cell means, so the whole ANOVA table
+needs only (n, mean, m2) per cell – group_stats.CellMoments – and memory
+proportional to the number of cells, not rows.  Results equal
+statsmodels' anova_lm(ols(...), typ=2) for the same formula.
+
+For a balanced full factorial (every level combination present with the
+same count, as runExperiments.m produces) the effects are orthogonal and
+the Type-II sums of squares reduce to the textbook closed forms over
+marginal means, with no least-squares fit at all:
+
+    SS_A  = Σ_a  n_a  (ȳ_a − ȳ)²
+    SS_AB = Σ_ab n_ab (ȳ_ab − ȳ_a − ȳ_b + ȳ)²
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+# Same model as exp_stats.run_anova
+TERMS = [("MapWidth",), ("NumBuildings",), ("NumSurvivors",),
+         ("useRRTStar",), ("Approach",),
+         ("MapWidth", "NumBuildings"),
+         ("useRRTStar", "Approach")]
+
+def term_name(term):
+    return ":".join(f"C({f})" for f in term)
+
+# ------------------------------------------------------------------
+# Weighted fit on cell means
+# ------------------------------------------------------------------
+def _indicators(keys, term):
+    """One-hot columns for every level combination of *term*."""
+    codes = keys.groupby(list(term), sort=True, observed=True).ngroup().to_numpy()
+    X = np.zeros((len(keys), codes.max() + 1))
+    X[np.arange(len(keys)), codes] = 1.0
+    return X
+
+def _fit(cols, w, y):
+    """(weighted RSS between cells, rank) of the model spanned by *cols*."""
+    X  = np.column_stack([np.ones(len(y))] + cols)
+    sw = np.sqrt(w)
+    Xw = X * sw[:, None]
+    beta, _, rank, _ = np.linalg.lstsq(Xw, y * sw, rcond=None)
+    r = y - X @ beta
+    return float(np.sum(w * r * r)), int(rank)
+
+# ------------------------------------------------------------------
+# Balanced designs
+# ------------------------------------------------------------------
+def _cell_view(cells, value_col, terms):
+    """Cells over the factors of *terms* that hold at least one value."""
+    factors = list(dict.fromkeys(f for t in terms for f in t))
+    c = cells.rollup(factors)
+    j = c.values.index(value_col)
+    keep = c.n[:, j] > 0
+    keys = c.keys[keep].reset_index(drop=True)
+    return keys, c.n[keep, j], c.mean[keep, j], c.m2[keep, j]
+
+def is_balanced(cells, value_col="TimeTaken", terms=TERMS):
+    """Every level combination present, all with the same (non-zero) count."""
+    keys, n, _, _ = _cell_view(cells, value_col, terms)
+    full = np.prod([keys[f].nunique() for f in keys.columns])
+    return len(keys) == full and len(n) > 0 and np.all(n == n[0])
+
+def _balanced_table(keys, n, ybar, m2, terms):
+    N     = n.sum()
+    grand = np.sum(n * ybar) / N
+
+    def effect(term):
+        """Cell-level effect of *term* by inclusion–exclusion of marginal means."""
+        eff = np.zeros(len(keys))
+        for r in range(len(term) + 1):
+            for sub in itertools.combinations(term, r):
+                sign = (-1) ** (len(term) - r)
+                if sub:
+                    m = (pd.Series(n * ybar).groupby([keys[f] for f in sub]).transform("sum") /
+                         pd.Series(n).groupby([keys[f] for f in sub]).transform("sum"))
+                    eff += sign * m.to_numpy()
+                else:
+                    eff += sign * grand
+        return eff
+
+    rows, ss_model, df_model = {}, 0.0, 0.0
+    for t in terms:
+        e  = effect(t)
+        ss = float(np.sum(n * e * e))
+        df = float(np.prod([keys[f].nunique() - 1 for f in t]))
+        rows[term_name(t)] = [ss, df]
+        ss_model += ss
+        df_model += df
+
+    ss_total = float(m2.sum() + np.sum(n * (ybar - grand) ** 2))
+    rss_full = ss_total - ss_model
+    df_resid = N - 1 - df_model
+    return rows, max(rss_full, 0.0), df_resid
+
+# ------------------------------------------------------------------
+# Type-II table
+# ------------------------------------------------------------------
+def anova_from_cells(cells, value_col="TimeTaken", terms=TERMS):
+    """
+    anova_lm(typ=2)-style DataFrame (index = term names + "Residual",
+    columns sum_sq, df, F, PR(>F)) from a CellMoments over the factors
+    used in *terms*.  Balanced designs use the closed forms, anything else
+    the weighted fit on cell means.
+    """
+    keys, n, ybar, m2 = _cell_view(cells, value_col, terms)
+    if is_balanced(cells, value_col, terms):
+        ss_df, rss_full, df_resid = _balanced_table(keys, n, ybar, m2, terms)
+        return _finish(ss_df, rss_full, df_resid)
+
+    W    = float(m2.sum())
+    N    = float(n.sum())
+    cols = {t: _indicators(keys, t) for t in terms}
+
+    def rss(model):
+        between, rank = _fit([cols[t] for t in model], n, ybar)
+        return W + between, rank
+
+    rss_full, rank_full = rss(terms)
+    df_resid = N - rank_full
+
+    ss_df = {}
+    for t in terms:
+        # Type II: compare the model of all terms that do not contain t,
+        # with and without t itself
+        base = [u for u in terms if not set(t) <= set(u)]
+        rss0, rank0 = rss(base)
+        rss1, rank1 = rss(base + [t])
+        ss_df[term_name(t)] = [max(rss0 - rss1, 0.0), float(rank1 - rank0)]
+    return _finish(ss_df, rss_full, df_resid)
+
+def _finish(ss_df, rss_full, df_resid):
+    """Add F / p columns and the Residual row."""
+    rows = {}
+    for name, (ss, df) in ss_df.items():
+        F = (ss / df) / (rss_full / df_resid) if df and rss_full > 0 else np.nan
+        rows[name] = [ss, df, F, stats.f.sf(F, df, df_resid)]
+    rows["Residual"] = [rss_full, float(df_resid), np.nan, np.nan]
+
+    return pd.DataFrame.from_dict(rows, orient="index",
+                                  columns=["sum_sq", "df", "F", "PR(>F)"])
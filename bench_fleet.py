@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+bench_fleet.py  –  mission time and wall-clock cost vs fleet size
+
+Runs the headless port (uavsim) for fleets of 4 … 256 vehicles, half
+ground vehicles and half drones at runRescueMission's speeds, on one map
+and reports per fleet size:
+
+    TimeTaken      simulated mission time (s), mean over seeds
+    Rescued        fraction of survivors rescued
+    WallEvent      wall-clock seconds per mission, event-driven kernel
+    StepUs         µs per vectorized Fleet.step with every vehicle moving
+    LoopUs         µs per tick for the per-vehicle move_step loop (views)
+
+    $ python3 bench_fleet.py                       # 4 … 256, 3 seeds
+    $ python3 bench_fleet.py --sizes 4 16 64 --seeds 1 --survivors 100
+
+Results go to Analysis/fleet_scaling_bench.csv.
+"""
+
+import argparse
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from uavsim import config, cached_environment, make_fleet, run_rescue_mission
+from uavsim.mission import MISSION_FLEET
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+SIZES     = [4, 8, 16, 32, 64, 128, 256]
+SEEDS     = [1, 2, 3]
+MAP_M     = 500
+BUILDINGS = 60
+SURVIVORS = 64
+STEP_REPS = 200                  # Fleet.step calls timed per size
+OUT_CSV   = Path("Analysis") / "fleet_scaling_bench.csv"
+
+# ------------------------------------------------------------------
+# Benchmarks
+# ------------------------------------------------------------------
+def fleet_config(size, survivors, approach="nearest"):
+    ground = size // 2
+    return config(mapWidth=MAP_M, mapHeight=MAP_M, numBuildings=BUILDINGS,
+                  numSurvivors=survivors,
+                  centroidApproach=approach == "centroid",
+                  hungarianApproach=approach == "hungarian",
+                  **dict(MISSION_FLEET, numGround=ground, numAerial=size - ground))
+
+def step_cost(cfg, env, reps=STEP_REPS):
+    """(µs per Fleet.step, µs per per-vehicle tick) with long random paths."""
+    rng   = np.random.default_rng(0)
+    fleet = make_fleet(cfg, env)
+    for k in range(len(fleet)):
+        fleet.set_path(k, rng.random((50, 3)) * [MAP_M, MAP_M, cfg.mapDepth])
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fleet.step(1.0)
+    vec = (time.perf_counter() - t0) / reps
+    loops = max(1, reps // 20)
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        for v in fleet:
+            v.move_step(1.0)
+    loop = (time.perf_counter() - t0) / loops
+    return vec * 1e6, loop * 1e6
+
+def bench(sizes=SIZES, seeds=SEEDS, survivors=SURVIVORS, approach="nearest"):
+    rows = []
+    for size in sizes:
+        cfg = fleet_config(size, survivors, approach)
+        env = cached_environment(cfg)
+        times, rescued, walls = [], [], []
+        for seed in seeds:
+            t0 = time.perf_counter()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                t, counts, _ = run_rescue_mission(cfg, env, seed=seed)
+            walls.append(time.perf_counter() - t0)
+            times.append(t)
+            rescued.append(sum(counts) / survivors)
+        step_us, loop_us = step_cost(cfg, env)
+        rows.append({"FleetSize": size, "Approach": approach,
+                     "TimeTaken": np.mean(times), "Rescued": np.mean(rescued),
+                     "WallEvent": np.mean(walls),
+                     "StepUs": step_us, "LoopUs": loop_us})
+        print("{FleetSize:4d} vehicles: TimeTaken {TimeTaken:6.1f} s, rescued "
+              "{Rescued:4.0%}, {WallEvent:6.2f} s/mission, step {StepUs:7.1f} us "
+              "(loop {LoopUs:9.1f} us)".format(**rows[-1]), flush=True)
+    return pd.DataFrame(rows)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fleet-size scaling benchmark.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--seeds", type=int, nargs="+", default=SEEDS)
+    ap.add_argument("--survivors", type=int, default=SURVIVORS)
+    ap.add_argument("--approach", default="nearest",
+                    choices=["nearest", "centroid", "hungarian"])
+    ap.add_argument("-o", "--output", type=Path, default=OUT_CSV)
+    args = ap.parse_args(argv)
+
+    res = bench(args.sizes, args.seeds, args.survivors, args.approach)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    res.to_csv(args.output, index=False)
+    print(f"[✓] {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+bench_planners.py  –  planning latency and path length per planner
+
+Plans the same random start / goal pairs on free ground with every
+planning.PLANNERS backend that applies to the vehicle kind (with --aerial
+in 3-D, starts raised to AERIAL_Z like the default drones) and reports
+per map size and planner:
+
+    MsMean / MsP95   wall-clock milliseconds per plan (first call per map,
+                     which builds any cached per-environment tables, is
+                     reported separately as MsSetup)
+    Length           mean raw path length (m) over the pairs every planner
+                     solved, before smoothing.py
+    Failed           fraction of pairs without a path
+
+    $ python3 bench_planners.py                        # 300 and 500 m maps
+    $ python3 bench_planners.py --sizes 500 --pairs 50 --buildings 120
+    $ python3 bench_planners.py --sizes 5000 --buildings 6000 --planners hier
+    $ python3 bench_planners.py --aerial                # rrt vs layered
+
+Results go to Analysis/planner_bench.csv.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from uavsim import PLANNERS, config, cached_environment, path_length
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+SIZES     = [300, 500]
+BUILDINGS = 60
+PAIRS     = 30
+GROUND    = ["rrt", "jps", "hier"]
+AERIAL    = ["rrt", "layered"]
+AERIAL_Z  = 50                       # (m) drone start altitude
+OUT_CSV   = Path("Analysis") / "planner_bench.csv"
+
+# ------------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------------
+def free_pairs(env, n, rng, start_z=0.0):
+    """*n* (start, goal) pairs of free ground points, z = 0 (starts at *start_z*)."""
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    pick = free[rng.integers(len(free), size=(n, 2))] + rng.random((n, 2, 2))
+    out  = np.concatenate([pick, np.zeros((n, 2, 1))], axis=2)
+    out[:, 0, 2] = start_z
+    return out
+
+def bench(sizes=SIZES, buildings=BUILDINGS, pairs=PAIRS, planners=GROUND, mode="2D"):
+    rows = []
+    for size in sizes:
+        cfg   = config(mapWidth=size, mapHeight=size, numBuildings=buildings)
+        env   = cached_environment(cfg)
+        jobs  = free_pairs(env, pairs + 1, np.random.default_rng(size),
+                           AERIAL_Z if mode == "3D" else 0.0)
+        paths = {}
+        for name in planners:
+            plan = PLANNERS[name]
+            t0 = time.perf_counter()
+            plan(*jobs[0], env, cfg, mode=mode, rng=np.random.default_rng(0))
+            setup = time.perf_counter() - t0
+            ms, out = [], []
+            for i, (s, g) in enumerate(jobs[1:]):
+                t0 = time.perf_counter()
+                out.append(plan(s, g, env, cfg, mode=mode, rng=np.random.default_rng(i)))
+                ms.append((time.perf_counter() - t0) * 1e3)
+            paths[name] = out
+            rows.append({"MapWidth": size, "Mode": mode, "Planner": name,
+                         "MsSetup": setup * 1e3,
+                         "MsMean": np.mean(ms), "MsP95": np.percentile(ms, 95),
+                         "Failed": np.mean([p is None for p in out])})
+        both = [i for i in range(pairs) if all(paths[n][i] is not None for n in planners)]
+        for row in rows[-len(planners):]:
+            row["Length"] = np.mean([path_length(paths[row["Planner"]][i]) for i in both])
+            print("{MapWidth:5d} m  {Planner:7s} setup {MsSetup:7.1f} ms  plan "
+                  "{MsMean:7.1f} ms (p95 {MsP95:7.1f})  length {Length:6.1f} m  "
+                  "failed {Failed:4.0%}".format(**row), flush=True)
+    return pd.DataFrame(rows)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Planner latency / length benchmark.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--buildings", type=int, default=BUILDINGS)
+    ap.add_argument("--pairs", type=int, default=PAIRS)
+    ap.add_argument("--planners", nargs="+", choices=sorted(PLANNERS),
+                    help=f"default {GROUND} (ground), {AERIAL} (--aerial)")
+    ap.add_argument("--aerial", action="store_true", help="plan drones in 3-D")
+    ap.add_argument("-o", "--output", type=Path, default=OUT_CSV)
+    args = ap.parse_args(argv)
+
+    mode = "3D" if args.aerial else "2D"
+    planners = args.planners or (AERIAL if args.aerial else GROUND)
+    res = bench(args.sizes, args.buildings, args.pairs, planners, mode)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    res.to_csv(args.output, index=False)
+    print(f"[✓] {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+build_cache.py  –  skip figures / tables whose inputs have not changed
+
+For every artifact (PNG or CSV) the cache records three hashes:
+
+    inputs   the data slice it is drawn from (selected DataFrame columns,
+             or the bytes of an input file)
+    code     source of the generating function(s)
+    params   any extra parameters (dpi, labels, ...)
+
+An artifact is rebuilt only if one of them differs from the last build, or
+the file itself is missing.  The records live in .build_cache.json in the
+repository root, keyed by the artifact path relative to it.
+
+    cache = BuildCache(explain=True)
+    if cache.needs_build(out, inputs=digest_frame(df, cols), code=[fn]):
+        fn(df)
+        cache.record(out)
+    cache.save()
+
+With explain=True every decision is printed, e.g.
+
+    [rebuild] figures/aerial_distance_box.png: input data changed
+    [ fresh ] figures/avg_time_taken.png
+"""
+
+import json
+import hashlib
+import inspect
+from pathlib import Path
+
+import pandas as pd
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+ROOT       = Path(__file__).resolve().parent
+CACHE_NAME = ".build_cache.json"
+CACHE_FILE = ROOT / CACHE_NAME
+
+# ------------------------------------------------------------------
+# Digests
+# ------------------------------------------------------------------
+def _sha(*chunks):
+    h = hashlib.sha1()
+    for c in chunks:
+        h.update(c if isinstance(c, bytes) else str(c).encode())
+    return h.hexdigest()
+
+def digest_frame(df, columns=None):
+    """
+    Hash of the selected columns (names, dtypes and values, row order);
+    *columns* may be a function of *df* returning them.
+    """
+    if callable(columns):
+        columns = columns(df)
+    sub = df if columns is None else df[list(columns)]
+    rows = pd.util.hash_pandas_object(sub, index=False).to_numpy()
+    return _sha(list(sub.columns), [str(t) for t in sub.dtypes], rows.tobytes())
+
+def digest_file(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def digest_code(funcs):
+    """Hash of the source of one function or a list of them."""
+    if callable(funcs):
+        funcs = [funcs]
+    return _sha(*[inspect.getsource(f) for f in funcs])
+
+def digest_params(params):
+    return _sha(json.dumps(params, sort_keys=True, default=str))
+
+# ------------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------------
+_LABELS = {"inputs": "input data", "code": "generating code", "params": "parameters"}
+
+class BuildCache:
+
+    def __init__(self, path=CACHE_FILE, explain=False, force=False):
+        self.path    = Path(path)
+        self.explain = explain
+        self.force   = force
+        self._pending = {}
+        try:
+            self._records = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._records = {}
+
+    def _key(self, output):
+        p = Path(output).resolve()
+        try:
+            return str(p.relative_to(self.path.parent.resolve()))
+        except ValueError:
+            return str(p)
+
+    def needs_build(self, output, inputs="", code=(), params=None):
+        """
+        True if *output* must be (re)generated.  *inputs* is a digest string
+        (or a list of them), *code* a function or list of functions.
+        """
+        if not isinstance(inputs, str):
+            inputs = _sha(*inputs)
+        sig = {"inputs": inputs,
+               "code"  : digest_code(code) if code else "",
+               "params": digest_params(params)}
+        key = self._key(output)
+        self._pending[key] = sig
+
+        old = self._records.get(key)
+        if self.force:
+            reason = "forced"
+        elif old is None:
+            reason = "no previous build recorded"
+        elif not Path(output).exists():
+            reason = "output file missing"
+        else:
+            changed = [label for what, label in _LABELS.items()
+                       if old.get(what) != sig[what]]
+            reason  = ", ".join(changed) + " changed" if changed else None
+
+        if self.explain:
+            if reason:
+                print(f"[rebuild] {key}: {reason}")
+            else:
+                print(f"[ fresh ] {key}")
+        return reason is not None
+
+    def record(self, output):
+        """Mark *output* as built with the signature from needs_build()."""
+        key = self._key(output)
+        self._records[key] = self._pending.pop(key)
+
+    def forget(self, output):
+        """Drop the record of *output*, e.g. after it was written out-of-band."""
+        self._records.pop(self._key(output), None)
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self._records, indent=1, sort_keys=True))
+        tmp.replace(self.path)
+
+def add_cli_flags(ap):
+    """--explain / --force, shared by every script that uses the cache."""
+    ap.add_argument("--explain", action="store_true",
+                    help="print why each artifact is rebuilt or skipped")
+    ap.add_argument("--force", action="store_true",
+                    help="rebuild every artifact regardless of the cache")
+    return ap
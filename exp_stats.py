@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
 """
 analysis_script.py  – enhanced: all outputs go to ./Analysis/
+
+    $ python3 exp_stats.py                     # full pass (build-cached)
+    $ python3 exp_stats.py --stream            # bounded memory, chunked read
+    $ python3 exp_stats.py --append batch.csv  # fold a new batch into the state
+    $ python3 exp_stats.py --merge a.pkl b.pkl # combine shard states
+    $ python3 exp_stats.py --ci bca --permutation  # bootstrap CIs, permutation p
+    $ python3 exp_stats.py --vehicles          # fleet-size tables from
+                                               # experiment_vehicles.csv
 """
 
+import argparse
+from collections import namedtuple
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from scipy import stats
 import statsmodels.api as sm
 from statsmodels.formula.api import ols
 
+import results_store
+import group_stats
+import stats_state
+import build_cache
+import anova_cells
+import streaming
+import resampling
+import uav_long
+
 # ------------------------------------------------------------------
 # CONFIGURATION
 # ------------------------------------------------------------------
@@ -17,11 +35,24 @@ CSV_IN   = Path("experiment_results.csv")
 OUT_DIR  = Path("Analysis")          # <-- all results will live here
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Resampling settings (see resampling.py); CI_METHOD "normal" keeps the
+# 1.96·SE intervals, "percentile" / "bca" bootstrap them from the rows.
+CI_METHOD     = "normal"
+RESAMPLING_KW = {"n_resamples": resampling.N_RESAMPLES,
+                 "seed"       : resampling.SEED,
+                 "workers"    : 1}
+
 # ------------------------------------------------------------------
 # 0) Read Data
 # ------------------------------------------------------------------
-def read_data(csv_file=CSV_IN):
-    df = pd.read_csv(csv_file)
+def read_data(csv_file=CSV_IN, use_store=True):
+    if use_store:
+        df = results_store.load_frame(csv_file)   # memory-mapped, see results_store.py
+    else:
+        df = pd.read_csv(csv_file)
+    return coerce(df)
+
+def coerce(df):
     df["useRRTStar"] = df["useRRTStar"].astype(bool)
     df["Seed"]       = df["Seed"].astype(int)
     return df
@@ -29,26 +60,29 @@ def read_data(csv_file=CSV_IN):
 # ------------------------------------------------------------------
 # 1) One-Way Descriptive Stats
 # ------------------------------------------------------------------
-def one_way_descriptive(df, factor_list, value_col="TimeTaken"):
-    results = {}
-    for factor in factor_list:
-        g      = df.groupby(factor)[value_col]
-        n      = g.count()
-        mean   = g.mean()
-        std    = g.std(ddof=1)
-        var    = g.var(ddof=1)
-        ci95   = 1.96 * std / np.sqrt(n)
-        tbl = pd.DataFrame({
-            factor       : n.index,
-            "N"          : n.values,
-            "Mean"       : mean.values,
-            "StdDev"     : std.values,
-            "Variance"   : var.values,
-            "CI95_Lower" : (mean - ci95).values,
-            "CI95_Upper" : (mean + ci95).values,
-        })
-        results[factor] = tbl.reset_index(drop=True)
-    return results
+def one_way_descriptive(df, factor_list, value_col="TimeTaken", ci="normal"):
+    """
+    One table per factor (N, Mean, StdDev, Variance, CI95).  All factors are
+    served from a single scan of *df* – see group_stats.CellMoments.
+    ci="percentile" / "bca" replaces the 1.96·SE interval by a bootstrap one.
+    """
+    cells = group_stats.CellMoments.from_frame(df, factor_list, [value_col])
+    out   = {f: cells.rollup(f).describe(value_col) for f in factor_list}
+    if ci != "normal":
+        for f, tbl in out.items():
+            bootstrap_ci_columns(tbl, df, f, value_col, ci)
+    return out
+
+def bootstrap_ci_columns(tbl, df, factor, value_col="TimeTaken",
+                         method="percentile", **kw):
+    """Overwrite CI95_Lower / CI95_Upper of *tbl* with bootstrap intervals."""
+    kw = {**RESAMPLING_KW, **kw}
+    groups = {k: g.to_numpy() for k, g in df.groupby(factor)[value_col]}
+    bounds = [resampling.bootstrap_ci(groups[k], method=method, **kw)
+              for k in tbl[factor]]
+    tbl["CI95_Lower"] = [lo for lo, _ in bounds]
+    tbl["CI95_Upper"] = [hi for _, hi in bounds]
+    return tbl
 
 # ------------------------------------------------------------------
 # 2) Two-Way Planner × Assignment Table
@@ -59,9 +93,17 @@ def two_way_table(df, planner_col="useRRTStar",
     Returns a 2 × 2 (or however many) table whose cells contain
     “mean ± std dev” for each Planner × Assignment combination.
     """
-    g      = df.groupby([planner_col, assign_col])[value_col]
-    means  = g.mean()
-    stds   = g.std(ddof=1)
+    cells = group_stats.CellMoments.from_frame(df, [planner_col, assign_col],
+                                               [value_col])
+    return two_way_from_cells(cells, planner_col, assign_col, value_col)
+
+def two_way_from_cells(cells, planner_col="useRRTStar",
+                       assign_col="Approach", value_col="TimeTaken"):
+    g      = cells.rollup([planner_col, assign_col])
+    j      = g.values.index(value_col)
+    index  = pd.MultiIndex.from_frame(g.keys)
+    means  = pd.Series(g.mean[:, j], index=index)
+    stds   = pd.Series(np.sqrt(g.var(value_col)), index=index)
 
     # String like “123.4 ± 5.6”
     combined = means.round(2).astype(str) + " ± " + stds.round(2).astype(str)
@@ -85,6 +127,16 @@ def two_way_table(df, planner_col="useRRTStar",
 # 3) Factorial ANOVA
 # ------------------------------------------------------------------
 def run_anova(df):
+    """
+    Type-II factorial ANOVA.  The runExperiments.m grid is a balanced full
+    factorial, so the table normally comes straight from cell aggregates
+    (anova_cells.py); unbalanced data falls back to the statsmodels OLS fit.
+    """
+    cells = group_stats.CellMoments.from_frame(df, group_stats.FACTORS, ["TimeTaken"])
+    if anova_cells.is_balanced(cells):
+        an = anova_cells.anova_from_cells(cells).round(3)
+        return an.reset_index().rename(columns={"index": "Factor"})
+
     df["MapWidth"]     = df["MapWidth"].astype(str)
     df["NumBuildings"] = df["NumBuildings"].astype(str)
     df["NumSurvivors"] = df["NumSurvivors"].astype(str)
@@ -98,55 +150,217 @@ def run_anova(df):
     an = sm.stats.anova_lm(m, typ=2).round(3)
     return an.reset_index().rename(columns={"index": "Factor"})
 
+def anova_from_state(state):
+    """Same table as run_anova, from per-cell moments (anova_cells.py)."""
+    an = anova_cells.anova_from_cells(state.cells).round(3)
+    return an.reset_index().rename(columns={"index": "Factor"})
+
 # ------------------------------------------------------------------
 # 4) CV for UAV Distances
 # ------------------------------------------------------------------
-def cv_table(df, cols=("UAV1dist","UAV2dist","UAV3dist","UAV4dist")):
+def cv_table(df, cols=None):
+    """CV per UAV; *cols* default to every UAV<i>dist column in *df*."""
+    cols  = uav_long.uav_cols(df) if cols is None else list(cols)
+    cells = group_stats.CellMoments.from_frame(df, [], cols)
+    return cv_from_cells(cells, cols)
+
+def cv_from_cells(cells, cols=None):
+    """CV per UAV from moments; *cols* default to every UAV<i>dist held."""
+    if cols is None:
+        cols = [v for v in cells.values
+                if uav_long.UAV_COL.match(v) and v.endswith("dist")]
+    tot  = cells.total()
     rows = []
     for c in cols:
-        mu  = df[c].mean()
-        sd  = df[c].std(ddof=1)
+        j   = tot.values.index(c)
+        mu  = tot.mean[0, j]
+        sd  = np.sqrt(tot.var(c)[0])
         cv  = sd / mu if mu else np.nan
         rows.append({"UAV": c.replace("dist",""),
                      "MeanDist": mu, "StdDist": sd, "CV": cv})
     return pd.DataFrame(rows)
 
+# ------------------------------------------------------------------
+# 4b) Fleet size (long per-vehicle file from sweep.py)
+# ------------------------------------------------------------------
+def fleet_tables(long):
+    """
+    {stem: table} from uav_long.read_vehicles(): TimeTaken by fleet size
+    (one value per run) and per-vehicle distance CV by fleet size × kind.
+    """
+    runs = long.drop_duplicates("Row")
+    time = group_stats.CellMoments.from_frame(runs, ["FleetSize"], ["TimeTaken"])
+    dist = group_stats.CellMoments.from_frame(long, ["FleetSize", "Kind"],
+                                              ["Dist", "Resc"])
+    cv   = dist.describe("Dist")[["FleetSize", "Kind", "N", "Mean", "StdDev"]]
+    cv   = cv.rename(columns={"Mean": "MeanDist", "StdDev": "StdDist"})
+    cv["CV"]       = (cv.StdDist / cv.MeanDist).where(cv.MeanDist != 0)
+    cv["MeanResc"] = dist.describe("Resc")["Mean"].to_numpy()
+    return {"fleet_size_time_stats": time.describe("TimeTaken"),
+            "fleet_cv_table": cv}
+
 # ------------------------------------------------------------------
 # 5) Representative Runs
 # ------------------------------------------------------------------
-def representative_runs(df, value_col="TimeTaken"):
-    srt = df.sort_values(value_col).reset_index(drop=True)
-    return pd.DataFrame([srt.iloc[0],               # min
-                         srt.iloc[len(srt)//2],     # median
-                         srt.iloc[-1]])             # max
+def representative_runs(df):
+    """
+    Min / median / max run by TimeTaken.  Ties are broken by the smallest
+    (Seed, factor ...) key so the pick matches stats_state merges.
+    """
+    return stats_state.StatsState.from_frame(df).representative_runs()
 
 # ------------------------------------------------------------------
 # MAIN
 # ------------------------------------------------------------------
+def append_rows(batch_csv, csv_file=CSV_IN):
+    """Append the data lines of *batch_csv* to *csv_file* (headers must match)."""
+    with open(batch_csv) as src:
+        header = src.readline()
+        with open(csv_file) as dst:
+            if dst.readline().strip() != header.strip():
+                raise ValueError(f"{batch_csv}: header does not match {csv_file}")
+        with open(csv_file, "a") as dst:
+            for line in src:
+                dst.write(line)
+
 def save(df, stem):
     path = OUT_DIR / f"{stem}.csv"
     df.to_csv(path, index=False)
     print(f"[✓] {path}")
 
-def main():
-    df = read_data()
+# Every Analysis/ table in output order: how to build it from the StatsState
+# (and the rows, when a full pass has them), which columns it reads and which
+# code makes it.
+# The last two feed the build cache.
+Table = namedtuple("Table", "stem build inputs code resampled",
+                   defaults=(False,))
 
-    # 1) One-way stats
-    factors = ["MapWidth","NumBuildings","NumSurvivors","useRRTStar","Approach"]
-    for f, tbl in one_way_descriptive(df, factors).items():
-        save(tbl, f"{f}_time_stats")
+def one_way_table(state, df, factor):
+    tbl = state.one_way(factor)
+    if CI_METHOD != "normal":
+        bootstrap_ci_columns(tbl, df, factor, method=CI_METHOD)
+    return tbl
 
+CellMoments = group_stats.CellMoments
+StatsState  = stats_state.StatsState
+
+TABLES = (
+    # 1) One-way stats
+    [Table(f"{f}_time_stats", lambda st, df, f=f: one_way_table(st, df, f),
+           [f, "TimeTaken"], [CellMoments, one_way_table, resampling], True)
+     for f in group_stats.FACTORS] +
+    [
     # 2) Planner × Assignment
-    save(two_way_table(df), "planner_x_approach")
+    Table("planner_x_approach", lambda st, df: two_way_from_cells(st.cells),
+          ["useRRTStar", "Approach", "TimeTaken"], [two_way_from_cells, CellMoments]),
+    # 3) ANOVA – from the rows if we have them, else from the cell moments
+    Table("anova_results", lambda st, df: run_anova(df.copy()) if df is not None
+                                          else anova_from_state(st),
+          group_stats.FACTORS + ["TimeTaken"], [run_anova, anova_cells]),
+    # 4) CV table
+    Table("uav_cv_table", lambda st, df: cv_from_cells(st.cells),
+          uav_long.uav_cols, [cv_from_cells, CellMoments]),
+    # 5) Representative runs
+    Table("representative_runs", lambda st, df: st.representative_runs(),
+          None, [StatsState.representative_runs, stats_state._pick_reps]),
+    ])
 
-    # 3) ANOVA
-    save(run_anova(df.copy()), "anova_results")
+def main(argv=None):
+    global CI_METHOD
+    ap = argparse.ArgumentParser(description="Chapter-5 statistics -> ./Analysis/")
+    ap.add_argument("--append", nargs="+", metavar="CSV",
+                    help="fold new batch CSV(s) into the saved state and append "
+                         f"their rows to {CSV_IN}")
+    ap.add_argument("--merge", nargs="+", metavar="STATE",
+                    help="combine shard states (see stats_state.py) instead of "
+                         f"reading {CSV_IN}")
+    ap.add_argument("--stream", action="store_true",
+                    help=f"read {CSV_IN} in bounded chunks instead of all at once")
+    ap.add_argument("--chunk-rows", type=int, default=streaming.CHUNK_ROWS,
+                    help="rows per chunk in --stream mode")
+    ap.add_argument("--ci", choices=resampling.CI_METHODS, default=CI_METHOD,
+                    help="CI95 columns: normal approximation or bootstrap "
+                         "(full pass only)")
+    ap.add_argument("--permutation", action="store_true",
+                    help="also write planner/approach permutation p-values")
+    ap.add_argument("--resamples", type=int, default=resampling.N_RESAMPLES)
+    ap.add_argument("--seed", type=int, default=resampling.SEED)
+    ap.add_argument("--workers", type=int, default=1,
+                    help="processes for resampling shards")
+    ap.add_argument("--vehicles", nargs="?", const=uav_long.VEHICLES_CSV,
+                    metavar="CSV",
+                    help="write the fleet-size tables from a per-vehicle "
+                         "results file instead")
+    build_cache.add_cli_flags(ap)
+    args = ap.parse_args(argv)
 
-    # 4) CV table
-    save(cv_table(df), "uav_cv_table")
+    if args.vehicles:
+        for stem, tbl in fleet_tables(uav_long.read_vehicles(args.vehicles)).items():
+            save(tbl, stem)
+        return
 
-    # 5) Representative runs
-    save(representative_runs(df), "representative_runs")
+    CI_METHOD = args.ci
+    RESAMPLING_KW.update(n_resamples=args.resamples, seed=args.seed,
+                         workers=args.workers)
+    needs_rows = args.ci != "normal" or args.permutation
+    if needs_rows and (args.append or args.merge or args.stream):
+        ap.error("--ci bootstrap / --permutation need a full pass over the rows")
+
+    cache = build_cache.BuildCache(explain=args.explain, force=args.force)
+
+    df = None
+    if args.append:
+        if stats_state.STATE_FILE.exists():
+            state = StatsState.load()
+        elif CSV_IN.exists():
+            # no saved state yet: seed it with a full pass over the rows so far
+            print(f"[!] no {stats_state.STATE_FILE} – building it from {CSV_IN}")
+            state = StatsState.from_frame(read_data())
+        else:
+            ap.error(f"--append needs {stats_state.STATE_FILE} or {CSV_IN}; "
+                     "run a full pass first")
+        for batch_csv in args.append:
+            state.update(read_data(batch_csv, use_store=False))
+            append_rows(batch_csv, CSV_IN)
+    elif args.merge:
+        state = stats_state.merge_states(args.merge)
+    elif args.stream:
+        state = None
+        for chunk in streaming.iter_chunks(CSV_IN, args.chunk_rows, prep=coerce):
+            part  = StatsState.from_frame(chunk)
+            state = part if state is None else state.merge(part)
+    else:
+        df   = read_data()
+        todo = [t for t in TABLES
+                if cache.needs_build(OUT_DIR / f"{t.stem}.csv",
+                                     inputs=build_cache.digest_frame(df, t.inputs),
+                                     code=t.code,
+                                     params=[CI_METHOD, RESAMPLING_KW]
+                                            if t.resampled else None)]
+        if not todo and not args.permutation and stats_state.STATE_FILE.exists():
+            print("[=] all tables up to date")
+            return
+        state = StatsState.from_frame(df)
+
+    if df is None:
+        # state-only modes: everything is rebuilt, no input digest to record
+        todo = TABLES
+
+    for t in todo:
+        save(t.build(state, df), t.stem)
+        if df is not None:
+            cache.record(OUT_DIR / f"{t.stem}.csv")
+        else:
+            cache.forget(OUT_DIR / f"{t.stem}.csv")
+    cache.save()
+
+    # 6) Permutation tests (opt-in)
+    if args.permutation:
+        save(resampling.planner_approach_tests(df, **RESAMPLING_KW),
+             "planner_x_approach_permutation")
+
+    state.save()
+    print(f"[✓] {stats_state.STATE_FILE}  ({state.rows:,} rows)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+group_stats.py  –  one-pass grouped N / mean / variance / CI95
+
+Instead of one pandas groupby per factor (and per aggregate), the rows are
+scanned once: every row is mapped to its *cell* (the combination of all
+requested factors) and per-cell sufficient statistics
+
+    n      count of non-NaN values
+    mean   cell mean
+    m2     sum of squared deviations from the cell mean
+
+are accumulated for every value column at the same time with np.bincount.
+Any coarser grouping (a single factor, or a combination of factors) is then
+a roll-up over the – few – cells using Chan's parallel-variance formula, so
+its cost does not depend on the number of rows.
+
+    cells = CellMoments.from_frame(df, FACTORS, ["TimeTaken", "UAV1dist"])
+    cells.rollup("MapWidth").describe("TimeTaken")     # == MapWidth_time_stats.csv
+"""
+
+import numpy as np
+import pandas as pd
+
+import uav_long
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+FACTORS    = ["MapWidth", "NumBuildings", "NumSurvivors", "useRRTStar", "Approach"]
+Z95        = 1.96
+
+def value_cols(df):
+    """TimeTaken and the UAV<i>dist of every UAV in *df*."""
+    return ["TimeTaken"] + uav_long.uav_cols(df)
+
+# ------------------------------------------------------------------
+# Per-cell sufficient statistics
+# ------------------------------------------------------------------
+class CellMoments:
+    """
+    keys   DataFrame, one row per cell, one column per factor
+    values list of value-column names
+    n, mean, m2   float arrays of shape (cells, len(values))
+    """
+
+    def __init__(self, keys, values, n, mean, m2):
+        self.keys   = keys.reset_index(drop=True)
+        self.values = list(values)
+        self.n      = np.asarray(n,    dtype=float).reshape(len(self.keys), -1)
+        self.mean   = np.asarray(mean, dtype=float).reshape(len(self.keys), -1)
+        self.m2     = np.asarray(m2,   dtype=float).reshape(len(self.keys), -1)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def factors(self):
+        return list(self.keys.columns)
+
+    # -------------------------------------------------------------- build
+    @classmethod
+    def from_frame(cls, df, factors, value_cols=("TimeTaken",)):
+        """Accumulate moments of *value_cols* per cell of *factors*."""
+        factors    = [factors] if isinstance(factors, str) else list(factors)
+        value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+
+        if factors:
+            gb    = df.groupby(factors, sort=True, observed=True)
+            codes = gb.ngroup().to_numpy()
+            keys  = gb.size().index.to_frame(index=False)
+        else:                                   # no factors: one cell
+            codes = np.zeros(len(df), dtype=int)
+            keys  = pd.DataFrame(index=[0])
+        ok    = codes >= 0                      # rows with a NaN factor drop out
+        if not ok.all():
+            codes = codes[ok]
+        C = len(keys)
+
+        n    = np.zeros((C, len(value_cols)))
+        mean = np.zeros_like(n)
+        m2   = np.zeros_like(n)
+        for j, col in enumerate(value_cols):
+            v = df[col].to_numpy(dtype=float)
+            if not ok.all():
+                v = v[ok]
+            fin = ~np.isnan(v)
+            # shift by a representative value to keep s2 - s1²/n well conditioned
+            shift = v[fin][:1024].mean() if fin.any() else 0.0
+            x  = np.where(fin, v - shift, 0.0)
+            nj = np.bincount(codes, weights=fin, minlength=C)
+            s1 = np.bincount(codes, weights=x,   minlength=C)
+            s2 = np.bincount(codes, weights=x*x, minlength=C)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mu = s1 / nj
+            n[:, j]    = nj
+            mean[:, j] = np.where(nj > 0, mu + shift, np.nan)
+            m2[:, j]   = np.where(nj > 0, np.maximum(s2 - s1 * mu, 0.0), 0.0)
+        return cls(keys, value_cols, n, mean, m2)
+
+    # -------------------------------------------------------------- combine
+    def _reduce(self, keys, codes):
+        """Chan merge of cells sharing the same *codes* entry."""
+        G = len(keys)
+        n    = np.zeros((G, len(self.values)))
+        mean = np.zeros_like(n)
+        m2   = np.zeros_like(n)
+        for j in range(len(self.values)):
+            nj, mj, qj = self.n[:, j], np.nan_to_num(self.mean[:, j]), self.m2[:, j]
+            N = np.bincount(codes, weights=nj, minlength=G)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                M = np.bincount(codes, weights=nj * mj, minlength=G) / N
+            d = mj - np.nan_to_num(M)[codes]
+            n[:, j]    = N
+            mean[:, j] = np.where(N > 0, M, np.nan)
+            m2[:, j]   = np.bincount(codes, weights=qj + nj * d * d, minlength=G)
+        return CellMoments(keys, self.values, n, mean, m2)
+
+    def rollup(self, by):
+        """Merge cells down to the factor (or tuple/list of factors) *by*."""
+        by    = [by] if isinstance(by, str) else list(by)
+        gb    = self.keys.groupby(by, sort=True, observed=True)
+        codes = gb.ngroup().to_numpy()
+        keys  = gb.size().index.to_frame(index=False)
+        return self._reduce(keys, codes)
+
+    def total(self):
+        """All cells merged into a single, key-less row."""
+        keys = pd.DataFrame(index=[0])
+        return self._reduce(keys, np.zeros(len(self), dtype=int))
+
+    def merge(self, other):
+        """
+        Cell-wise merge with another CellMoments over the same factors.  The
+        value columns are the union of both (a column one side lacks counts
+        as n = 0 there, e.g. the UAV5dist of a 2 + 2 fleet).
+        """
+        if self.factors != other.factors:
+            raise ValueError("CellMoments.merge: factors do not match")
+        values = self.values + [v for v in other.values if v not in self.values]
+        a, b   = self.widen(values), other.widen(values)
+        both   = CellMoments(pd.concat([a.keys, b.keys], ignore_index=True),
+                             values,
+                             np.vstack([a.n, b.n]),
+                             np.vstack([a.mean, b.mean]),
+                             np.vstack([a.m2, b.m2]))
+        return both.rollup(self.factors)
+
+    def widen(self, values):
+        """The same cells over *values*; columns not held here are empty."""
+        if values == self.values:
+            return self
+        n    = np.zeros((len(self), len(values)))
+        mean = np.full_like(n, np.nan)
+        m2   = np.zeros_like(n)
+        for j, v in enumerate(values):
+            if v in self.values:
+                k = self.values.index(v)
+                n[:, j], mean[:, j], m2[:, j] = self.n[:, k], self.mean[:, k], self.m2[:, k]
+        return CellMoments(self.keys, values, n, mean, m2)
+
+    # -------------------------------------------------------------- output
+    def var(self, value_col):
+        j = self.values.index(value_col)
+        n = self.n[:, j]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(n > 1, self.m2[:, j] / (n - 1), np.nan)
+
+    def describe(self, value_col="TimeTaken"):
+        """Table in the *_time_stats.csv layout (one row per key)."""
+        j    = self.values.index(value_col)
+        n    = self.n[:, j]
+        mean = self.mean[:, j]
+        var  = self.var(value_col)
+        std  = np.sqrt(var)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ci95 = Z95 * std / np.sqrt(n)
+        tbl = self.keys.copy()
+        tbl["N"]          = n.astype(np.int64)
+        tbl["Mean"]       = mean
+        tbl["StdDev"]     = std
+        tbl["Variance"]   = var
+        tbl["CI95_Lower"] = mean - ci95
+        tbl["CI95_Upper"] = mean + ci95
+        return tbl
+
+# ------------------------------------------------------------------
+# Convenience
+# ------------------------------------------------------------------
+def describe_all(df, factors=FACTORS, value_cols=("TimeTaken",), combos=()):
+    """
+    One scan of *df*, then every factor in *factors* and every tuple in
+    *combos* described for every value column:
+
+        {value_col: {factor_or_tuple: table}}
+    """
+    needed = list(dict.fromkeys(list(factors) + [f for c in combos for f in c]))
+    cells  = CellMoments.from_frame(df, needed, value_cols)
+    out = {}
+    for v in cells.values:
+        out[v] = {}
+        for key in list(factors) + [tuple(c) for c in combos]:
+            out[v][key] = cells.rollup(key).describe(v)
+    return out
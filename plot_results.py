@@ -7,13 +7,40 @@ plot_results.py  –  regenerate all Chapter-5 figures from experiment_results.c
 
 PNG names match those already referenced in the .tex file, so Overleaf will
 simply pick up the new versions and you won’t accumulate duplicates.
+
+Each figure is an independent FIGURES entry; once the derived columns are
+in place they are drawn in parallel worker processes (Agg backend):
+
+    $ python3 plot_results.py            # one worker per core
+    $ python3 plot_results.py --jobs 1   # serial, e.g. for debugging
+
+Figures whose input columns and code are unchanged since the last run are
+skipped (build_cache.py); add --explain to see why each one is redrawn.
+For results files larger than RAM, --stream reads the CSV in chunks and
+draws the figures from bounded accumulators (streaming.py): the bars and
+the heat-map are exact, the boxplots come from BOX_BIN_M-wide histograms
+and the Pareto plot shows only the frontier.
+--ci percentile|bca swaps the ±1.96·SEM bar errors for bootstrap intervals
+(resampling.py).  --vehicles draws the fleet-size figure from the
+per-vehicle file of a fleet sweep (sweep.py, uav_long.py).
 """
 
 import os
-import pandas as pd
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")                    # files only – also safe in workers
 import matplotlib.pyplot as plt
 
+import results_store
+import build_cache
+import uav_long
+import streaming
+import resampling
+
 # ------------------------------------------------------------------ #
 #  Folders & CSV
 # ------------------------------------------------------------------ #
@@ -21,6 +48,8 @@ CSV_FILE  = "experiment_results.csv"
 FIG_DIR   = "figures"
 ANA_DIR   = "analysis"
 
+CI_METHOD = "normal"        # or "percentile" / "bca" (bootstrap error bars)
+
 for d in (FIG_DIR, ANA_DIR):
     os.makedirs(d, exist_ok=True)
 
@@ -32,11 +61,30 @@ def bar_with_ci(gb_obj, title, ylabel, fname):
     gb_obj is a pandas GroupBy of a single numeric column:
         df.groupby([...])["metric"]
 
-    Saves <fname> to FIG_DIR.
+    Saves <fname> to FIG_DIR and returns its path.
     """
     means = gb_obj.mean().unstack()
-    sems  = gb_obj.sem().unstack() * 1.96       # 95 % CI
+    if CI_METHOD == "normal":
+        sems = gb_obj.sem().unstack() * 1.96    # 95 % CI
+    else:
+        sems = bootstrap_errors(gb_obj, means)
+    return draw_bars(means, sems, title, ylabel, fname)
 
+def bootstrap_errors(gb_obj, means):
+    """Asymmetric (columns, 2, rows) error array of bootstrap CIs for plot(yerr=)."""
+    ci  = {k: resampling.bootstrap_ci(g.to_numpy(), method=CI_METHOD)
+           for k, g in gb_obj}
+    err = np.full((means.shape[1], 2, means.shape[0]), np.nan)
+    for j, col in enumerate(means.columns):
+        for i, row in enumerate(means.index):
+            if (row, col) in ci:
+                lo, hi = ci[(row, col)]
+                m = means.loc[row, col]
+                err[j, :, i] = m - lo, hi - m
+    return err
+
+def draw_bars(means, sems, title, ylabel, fname):
+    """Grouped bars of *means* with *sems* error bars (both Planner × Approach)."""
     fig, ax = plt.subplots(figsize=(8, 4))
     means.plot(kind="bar", yerr=sems, ax=ax,
                capsize=4, legend=True, rot=0)
@@ -47,89 +95,83 @@ def bar_with_ci(gb_obj, title, ylabel, fname):
     out = os.path.join(FIG_DIR, fname)
     plt.savefig(out, dpi=300)
     plt.close(fig)
-    print(f"✓  {out}")
+    return out
 
 # ------------------------------------------------------------------ #
-#  Main
+#  Derived columns (computed once, shared by every figure)
 # ------------------------------------------------------------------ #
-def main():
+def prepare(df):
+    df["Scenario"] = ("M" + df.MapWidth.astype(str) +
+                      "_B" + df.NumBuildings.astype(str) +
+                      "_S" + df.NumSurvivors.astype(str))
 
-    if not os.path.isfile(CSV_FILE):
-        raise FileNotFoundError(f"Cannot see {CSV_FILE} – run runExperiments.m first.")
+    df["TotalRescued"]     = df[uav_long.uav_cols(df, "resc")].sum(axis=1)
+    df["FractionRescued"]  = df.TotalRescued / df.NumSurvivors
+    df["Planner"]          = df.useRRTStar.map({0:"RRT", 1:"RRT*"})
+    return df
 
-    df = pd.read_csv(CSV_FILE)
+# ------------------------------------------------------------------ #
+#  Figures – each takes the prepared frame and returns the PNG path
+# ------------------------------------------------------------------ #
+def fig_avg_time(df):
+    """Figure 1 : Mean TimeTaken (95 % CI)"""
+    return bar_with_ci(df.groupby(["Planner","Approach"])["TimeTaken"],
+                       "Average TimeTaken by Planner × Approach (95 % CI)",
+                       "TimeTaken (s)",
+                       "avg_time_taken.png")
 
-    # Convenience columns ---------------------------------------------------
-    df["Scenario"] = df.apply(
-        lambda r: f"M{r.MapWidth}_B{r.NumBuildings}_S{r.NumSurvivors}", axis=1)
+def fig_fraction_rescued(df):
+    """Figure 2 : Fraction rescued"""
+    return bar_with_ci(df.groupby(["Planner","Approach"])["FractionRescued"],
+                       "Fraction of Survivors Rescued (mean ± 95 % CI)",
+                       "Fraction rescued",
+                       "fraction_rescued.png")
 
-    df["TotalRescued"]     = df[["UAV1resc","UAV2resc","UAV3resc","UAV4resc"]].sum(axis=1)
-    df["FractionRescued"]  = df.TotalRescued / df.NumSurvivors
-    df["Planner"]          = df.useRRTStar.map({0:"RRT", 1:"RRT*"})
+def distance_box(df, kind, title, fname):
+    """
+    Boxplot of Dist per Planner_Approach_UAV label of the *kind* ("ground" /
+    "aerial") vehicles; returns the PNG path.
+    """
+    long = uav_long.to_long(df)
+    long = long[long.Kind == kind]
+    data = uav_long.group_arrays(long, ["Planner", "Approach", "UAV"], "Dist")
 
-    # ---------------- Figure 1 : Mean TimeTaken (95 % CI) ------------------
-    bar_with_ci(df.groupby(["Planner","Approach"])["TimeTaken"],
-                "Average TimeTaken by Planner × Approach (95 % CI)",
-                "TimeTaken (s)",
-                "avg_time_taken.png")
-
-    # ---------------- Figure 2 : Fraction rescued --------------------------
-    bar_with_ci(df.groupby(["Planner","Approach"])["FractionRescued"],
-                "Fraction of Survivors Rescued (mean ± 95 % CI)",
-                "Fraction rescued",
-                "fraction_rescued.png")
-
-    # ---------------- Figure 3 : Aerial distance boxplot -------------------
-    aerial_rows = []
-    for _, r in df.iterrows():
-        aerial_rows += [
-            {"Method":f"{r.Planner}_{r.Approach}", "UAV":"UAV3", "Dist":r.UAV3dist},
-            {"Method":f"{r.Planner}_{r.Approach}", "UAV":"UAV4", "Dist":r.UAV4dist},
-        ]
-    a_df = pd.DataFrame(aerial_rows)
-    a_df["Label"] = a_df.Method + "_" + a_df.UAV
+    labels = list(data)
+    return draw_box(title, fname, data=[data[lab] for lab in labels], labels=labels)
 
+def draw_box(title, fname, data=None, labels=None, stats=None):
+    """Boxplot from raw *data* arrays, or from precomputed ax.bxp *stats*."""
     fig, ax = plt.subplots(figsize=(10,4))
-    labels  = sorted(a_df.Label.unique())
-    data    = [a_df.loc[a_df.Label==lab,"Dist"] for lab in labels]
-    ax.boxplot(data, labels=labels, showfliers=True)
-    ax.set_title("Aerial-drone distances")
+    if stats is None:
+        ax.boxplot(data, labels=labels, showfliers=True)
+    else:
+        ax.bxp(stats, showfliers=True)
+    ax.set_title(title)
     ax.set_ylabel("Distance (m)")
     plt.xticks(rotation=45, ha="right")
     plt.tight_layout()
-    out = os.path.join(FIG_DIR, "aerial_distance_box.png")
+    out = os.path.join(FIG_DIR, fname)
     plt.savefig(out, dpi=300)
     plt.close(fig)
-    print(f"✓  {out}")
-
-    # ---------------- Figure 4 : Ground distance boxplot -------------------
-    ground_rows = []
-    for _, r in df.iterrows():
-        ground_rows += [
-            {"Method":f"{r.Planner}_{r.Approach}", "UAV":"UAV1", "Dist":r.UAV1dist},
-            {"Method":f"{r.Planner}_{r.Approach}", "UAV":"UAV2", "Dist":r.UAV2dist},
-        ]
-    g_df = pd.DataFrame(ground_rows)
-    g_df["Label"] = g_df.Method + "_" + g_df.UAV
+    return out
 
-    fig, ax = plt.subplots(figsize=(10,4))
-    labels  = sorted(g_df.Label.unique())
-    data    = [g_df.loc[g_df.Label==lab,"Dist"] for lab in labels]
-    ax.boxplot(data, labels=labels, showfliers=True)
-    ax.set_title("Ground-vehicle distances")
-    ax.set_ylabel("Distance (m)")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    out = os.path.join(FIG_DIR, "ground_distance_box.png")
-    plt.savefig(out, dpi=300)
-    plt.close(fig)
-    print(f"✓  {out}")
+def fig_aerial_box(df):
+    """Figure 3 : Aerial distance boxplot"""
+    return distance_box(df, "aerial", "Aerial-drone distances",
+                        "aerial_distance_box.png")
+
+def fig_ground_box(df):
+    """Figure 4 : Ground distance boxplot"""
+    return distance_box(df, "ground", "Ground-vehicle distances",
+                        "ground_distance_box.png")
 
-    # --------------- Extra analysis : Pareto & workload heat-map -----------
+def fig_pareto(df):
+    """Pareto plot: time vs fraction rescued"""
+    return draw_pareto(df.TimeTaken, df.FractionRescued)
 
-    # Pareto plot: time vs fraction rescued
+def draw_pareto(x, y):
     fig, ax = plt.subplots(figsize=(6,4))
-    ax.scatter(df.TimeTaken, df.FractionRescued, alpha=0.6)
+    ax.scatter(x, y, alpha=0.6)
     ax.set_xlabel("TimeTaken (s)")
     ax.set_ylabel("Fraction rescued")
     ax.set_title("Pareto front – time vs rescued")
@@ -138,11 +180,14 @@ def main():
     plt.tight_layout()
     plt.savefig(out, dpi=300)
     plt.close(fig)
-    print(f"✓  {out}")
+    return out
 
-    # Workload heat-map (total distance / UAV / scenario)
-    dist_cols = ["UAV1dist","UAV2dist","UAV3dist","UAV4dist"]
-    heat_df   = df.groupby("Scenario")[dist_cols].mean()
+def fig_heatmap(df):
+    """Workload heat-map (total distance / UAV / scenario)"""
+    return draw_heatmap(df.groupby("Scenario")[uav_long.uav_cols(df)].mean())
+
+def draw_heatmap(heat_df):
+    dist_cols = list(heat_df.columns)
     fig, ax   = plt.subplots(figsize=(6,6))
     im = ax.imshow(heat_df.values, cmap="viridis", aspect="auto")
     ax.set_yticks(range(len(heat_df.index)))
@@ -155,9 +200,165 @@ def main():
     out = os.path.join(ANA_DIR, "workload_heatmap.png")
     plt.savefig(out, dpi=300)
     plt.close(fig)
-    print(f"✓  {out}")
+    return out
+
+def fig_fleet_scaling(long):
+    """Mean TimeTaken (95 % CI) and rescues per vehicle vs fleet size"""
+    runs = long.drop_duplicates("Row")
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10,4))
+    for appr, g in runs.groupby("Approach"):
+        t = g.groupby("FleetSize")["TimeTaken"].agg(["mean", "sem"]).fillna(0)
+        ax1.errorbar(t.index, t["mean"], yerr=1.96*t["sem"], marker="o",
+                     capsize=3, label=appr)
+    for kind, g in long.groupby("Kind"):
+        r = g.groupby("FleetSize")["Resc"].mean()
+        ax2.plot(r.index, r.values, marker="o", label=kind)
+    for ax in (ax1, ax2):
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Fleet size (vehicles)")
+        ax.legend()
+    ax1.set_ylabel("TimeTaken (s)")
+    ax1.set_title("Mission time vs fleet size")
+    ax2.set_ylabel("Rescues per vehicle")
+    ax2.set_title("Workload per vehicle")
+    plt.tight_layout()
+    out = os.path.join(ANA_DIR, "fleet_scaling.png")
+    plt.savefig(out, dpi=300)
+    plt.close(fig)
+    return out
+
+# ------------------------------------------------------------------ #
+#  Streaming variants – same drawings from a streaming.PlotAccumulator
+# ------------------------------------------------------------------ #
+def render_stream(acc):
+    """Yield the PNG paths of every figure drawn from accumulated chunks."""
+    yield draw_bars(*acc.means_sems("TimeTaken"),
+                    "Average TimeTaken by Planner × Approach (95 % CI)",
+                    "TimeTaken (s)", "avg_time_taken.png")
+    yield draw_bars(*acc.means_sems("FractionRescued"),
+                    "Fraction of Survivors Rescued (mean ± 95 % CI)",
+                    "Fraction rescued", "fraction_rescued.png")
+    yield draw_box("Aerial-drone distances", "aerial_distance_box.png",
+                   stats=acc.box("aerial"))
+    yield draw_box("Ground-vehicle distances", "ground_distance_box.png",
+                   stats=acc.box("ground"))
+    yield draw_pareto(acc.pareto.TimeTaken, acc.pareto.FractionRescued)
+    yield draw_heatmap(acc.heat_means())
+
+# (function, output, input columns, helpers) – columns/helpers feed the
+# build cache, so a figure is only redrawn when its own slice changes; the
+# columns are a function of the frame where they depend on the fleet
+Figure = namedtuple("Figure", "fn out inputs helpers")
+
+def box_inputs(df):
+    """Columns the distance boxplots read: every UAV and the fleet split."""
+    return (["Planner","Approach"] + uav_long.uav_cols(df) + uav_long.uav_cols(df, "resc")
+            + [c for c in ["NumGround"] if c in df])
+
+def heatmap_inputs(df):
+    return ["Scenario"] + uav_long.uav_cols(df)
+
+BAR_HELPERS = [bar_with_ci, bootstrap_errors, draw_bars]
+
+FIGURES = [
+    Figure(fig_avg_time,         os.path.join(FIG_DIR, "avg_time_taken.png"),
+           ["Planner","Approach","TimeTaken"],              BAR_HELPERS),
+    Figure(fig_fraction_rescued, os.path.join(FIG_DIR, "fraction_rescued.png"),
+           ["Planner","Approach","FractionRescued"],        BAR_HELPERS),
+    Figure(fig_aerial_box,       os.path.join(FIG_DIR, "aerial_distance_box.png"),
+           box_inputs,        [distance_box, draw_box, uav_long.to_long, uav_long.kinds]),
+    Figure(fig_ground_box,       os.path.join(FIG_DIR, "ground_distance_box.png"),
+           box_inputs,        [distance_box, draw_box, uav_long.to_long, uav_long.kinds]),
+    Figure(fig_pareto,           os.path.join(ANA_DIR, "pareto_time_vs_rescued.png"),
+           ["TimeTaken","FractionRescued"],                 [draw_pareto]),
+    Figure(fig_heatmap,          os.path.join(ANA_DIR, "workload_heatmap.png"),
+           heatmap_inputs,                                  [draw_heatmap]),
+]
+
+# ------------------------------------------------------------------ #
+#  Scheduler
+# ------------------------------------------------------------------ #
+_WORKER_DF = None
+
+def _init_worker(df, ci_method="normal"):
+    global _WORKER_DF, CI_METHOD
+    _WORKER_DF = df                      # shipped once per worker, not per figure
+    CI_METHOD  = ci_method
+
+def _render(fig_fn):
+    return fig_fn(_WORKER_DF)
+
+def render_all(df, figures=tuple(f.fn for f in FIGURES), jobs=None):
+    """Draw *figures* from the prepared *df*; yields PNG paths as they finish."""
+    jobs = min(jobs or os.cpu_count() or 1, len(figures))
+    if jobs <= 1:
+        for fig_fn in figures:
+            yield fig_fn(df)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(df, CI_METHOD)) as pool:
+        yield from pool.map(_render, figures)
+
+# ------------------------------------------------------------------ #
+#  Main
+# ------------------------------------------------------------------ #
+def main(argv=None):
+    global CI_METHOD
+    ap = argparse.ArgumentParser(description="Regenerate the Chapter-5 figures.")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="worker processes (default: one per core)")
+    ap.add_argument("--stream", action="store_true",
+                    help="read the CSV in bounded chunks (no build cache; "
+                         "binned boxplots, Pareto frontier only)")
+    ap.add_argument("--chunk-rows", type=int, default=streaming.CHUNK_ROWS,
+                    help="rows per chunk in --stream mode")
+    ap.add_argument("--ci", choices=resampling.CI_METHODS, default=CI_METHOD,
+                    help="bar-chart error bars: 1.96·SEM or bootstrap CI")
+    ap.add_argument("--vehicles", nargs="?", const=uav_long.VEHICLES_CSV,
+                    metavar="CSV",
+                    help="only draw the fleet-size figure from a per-vehicle file")
+    build_cache.add_cli_flags(ap)
+    args = ap.parse_args(argv)
+
+    if args.vehicles:
+        print(f"✓  {fig_fleet_scaling(uav_long.read_vehicles(args.vehicles))}")
+        return
+
+    CI_METHOD = args.ci
+    if args.stream and args.ci != "normal":
+        ap.error("--ci bootstrap needs the full rows; drop --stream")
+
+    if not os.path.isfile(CSV_FILE):
+        raise FileNotFoundError(f"Cannot see {CSV_FILE} – run runExperiments.m first.")
+
+    if args.stream:
+        acc = streaming.PlotAccumulator()
+        for chunk in streaming.iter_chunks(CSV_FILE, args.chunk_rows, prep=prepare):
+            acc.add(chunk)
+        for out in render_stream(acc):
+            print(f"✓  {out}")
+        print("\nAll figures regenerated (streamed) – upload any updated PNGs to Overleaf.")
+        return
+
+    df = prepare(results_store.load_frame(CSV_FILE))
+
+    cache = build_cache.BuildCache(explain=args.explain, force=args.force)
+    todo  = [f.fn for f in FIGURES
+             if cache.needs_build(f.out,
+                                  inputs=build_cache.digest_frame(df, f.inputs),
+                                  code=[f.fn] + f.helpers,
+                                  params=CI_METHOD if f.helpers is BAR_HELPERS
+                                         else None)]
+    if not todo:
+        print("All figures up to date – nothing to redraw.")
+        return
+
+    for out in render_all(df, todo, jobs=args.jobs):
+        cache.record(out)
+        print(f"✓  {out}")
+    cache.save()
 
-    print("\nAll figures regenerated – upload any updated PNGs to Overleaf.")
+    print(f"\n{len(todo)} figure(s) regenerated – upload any updated PNGs to Overleaf.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+resampling.py  –  bootstrap confidence intervals and permutation tests
+
+TimeTaken is skewed (capped at 600 s), so the normal-approximation
+mean ± 1.96·SE intervals used elsewhere can be misleading.  This module
+offers
+
+    bootstrap_ci(x, method="percentile" | "bca")   CI of the mean / median
+    permutation_test(a, b)                         two-sided p-value of a
+                                                   difference in means
+    planner_approach_tests(df)                     the Planner / Approach
+                                                   contrasts as a table
+
+All resamples of a shard are drawn as one (B, n) NumPy index matrix – no
+Python loop over resamples.  Large jobs are cut into shards of at most
+MAX_CELLS indices (bounded memory), optionally spread over worker
+processes; every shard has its own child seed of *seed*, so results are
+reproducible and independent of the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+N_RESAMPLES = 10_000
+ALPHA       = 0.05
+SEED        = 0
+MAX_CELLS   = 20_000_000      # indices per shard (~160 MB of int64)
+CI_METHODS  = ("normal", "percentile", "bca")
+
+# ------------------------------------------------------------------
+# Statistics: value on a (B, n) matrix and leave-one-out values
+# ------------------------------------------------------------------
+def _median_loo(x):
+    """Median of x with each element left out in turn, without a loop."""
+    order = np.argsort(x, kind="stable")
+    s, m  = x[order], len(x) - 1
+    rank  = np.empty(len(x), dtype=int)
+    rank[order] = np.arange(len(x))
+
+    def kth(k):                       # k-th element of s with `rank` removed
+        return np.where(k < rank, s[k], s[np.minimum(k + 1, len(x) - 1)])
+
+    if m % 2:
+        return kth(m // 2)
+    return 0.5 * (kth(m // 2 - 1) + kth(m // 2))
+
+STATS = {
+    "mean"  : (lambda m: m.mean(axis=-1),
+               lambda x: (x.sum() - x) / (len(x) - 1)),
+    "median": (lambda m: np.median(m, axis=-1),
+               _median_loo),
+}
+
+# ------------------------------------------------------------------
+# Sharded execution
+# ------------------------------------------------------------------
+def _shards(n_resamples, n, seed):
+    """(size, child seed) per shard so that size × n <= MAX_CELLS."""
+    per  = max(1, MAX_CELLS // max(n, 1))
+    k    = -(-n_resamples // per)
+    kids = np.random.SeedSequence(seed).spawn(k)
+    return [(min(per, n_resamples - i * per), kids[i]) for i in range(k)]
+
+def _boot_shard(args):
+    x, stat, size, ss = args
+    rng = np.random.default_rng(ss)
+    idx = rng.integers(0, len(x), size=(size, len(x)))
+    return STATS[stat][0](x[idx])
+
+def _perm_shard(args):
+    pooled, n_a, size, ss = args
+    rng   = np.random.default_rng(ss)
+    perm  = rng.permuted(np.broadcast_to(pooled, (size, len(pooled))), axis=1)
+    return perm[:, :n_a].mean(axis=1) - perm[:, n_a:].mean(axis=1)
+
+def _run(fn, jobs, workers):
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return np.concatenate(list(pool.map(fn, jobs)))
+    return np.concatenate([fn(j) for j in jobs])
+
+# ------------------------------------------------------------------
+# Bootstrap
+# ------------------------------------------------------------------
+def bootstrap_distribution(x, stat="mean", n_resamples=N_RESAMPLES,
+                           seed=SEED, workers=1):
+    x = np.asarray(x, dtype=float)
+    x = x[~np.isnan(x)]
+    jobs = [(x, stat, size, ss) for size, ss in _shards(n_resamples, len(x), seed)]
+    return _run(_boot_shard, jobs, workers)
+
+def bootstrap_ci(x, stat="mean", method="percentile", n_resamples=N_RESAMPLES,
+                 alpha=ALPHA, seed=SEED, workers=1):
+    """(lower, upper) bootstrap interval of *stat*; NaNs are ignored."""
+    x = np.asarray(x, dtype=float)
+    x = x[~np.isnan(x)]
+    if len(x) < 2:
+        return np.nan, np.nan
+    boot  = bootstrap_distribution(x, stat, n_resamples, seed, workers)
+    probs = np.array([alpha / 2, 1 - alpha / 2])
+
+    if method == "bca":
+        theta = STATS[stat][0](x)
+        # bias correction (ties split evenly, so a degenerate sample gives z0 = 0)
+        frac  = (np.sum(boot < theta) + 0.5 * np.sum(boot == theta)) / len(boot)
+        z0    = stats.norm.ppf(frac)
+        # acceleration from the jackknife
+        loo   = STATS[stat][1](x)
+        d     = loo.mean() - loo
+        den   = 6.0 * np.sum(d * d) ** 1.5
+        a     = np.sum(d ** 3) / den if den > 0 else 0.0
+        z     = stats.norm.ppf(probs)
+        probs = stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    elif method != "percentile":
+        raise ValueError(f"unknown bootstrap method {method!r}")
+
+    lo, hi = np.quantile(boot, probs)
+    return lo, hi
+
+# ------------------------------------------------------------------
+# Permutation test
+# ------------------------------------------------------------------
+def permutation_test(a, b, n_resamples=N_RESAMPLES, seed=SEED, workers=1):
+    """Two-sided p-value for mean(a) − mean(b) under label exchange."""
+    a = np.asarray(a, dtype=float); a = a[~np.isnan(a)]
+    b = np.asarray(b, dtype=float); b = b[~np.isnan(b)]
+    pooled   = np.concatenate([a, b])
+    observed = a.mean() - b.mean()
+    jobs = [(pooled, len(a), size, ss)
+            for size, ss in _shards(n_resamples, len(pooled), seed)]
+    diffs = _run(_perm_shard, jobs, workers)
+    # +1 so the observed labelling counts as one of the permutations
+    hits  = np.sum(np.abs(diffs) >= abs(observed) - 1e-12)
+    return (hits + 1) / (len(diffs) + 1)
+
+def _level(col, value, planner_col):
+    if col == planner_col:
+        return "RRT*" if value else "RRT"
+    return str(value)
+
+def planner_approach_tests(df, value_col="TimeTaken", planner_col="useRRTStar",
+                           assign_col="Approach", n_resamples=N_RESAMPLES,
+                           seed=SEED, workers=1):
+    """
+    Permutation p-values for every pair of planners, every pair of
+    approaches, and every approach pair within each planner.
+    """
+    rows = []
+    for col, within in ((planner_col, None), (assign_col, None),
+                        (assign_col, planner_col)):
+        scopes = [(None, df)] if within is None else list(df.groupby(within))
+        for scope, sub in scopes:
+            where  = "" if within is None else \
+                     f" | {_level(within, scope, planner_col)}"
+            groups = {k: g[value_col].to_numpy() for k, g in sub.groupby(col)}
+            for ka, kb in combinations(sorted(groups), 2):
+                a, b = groups[ka], groups[kb]
+                rows.append({"Comparison": f"{_level(col, ka, planner_col)} vs "
+                                           f"{_level(col, kb, planner_col)}{where}",
+                             "MeanA"     : np.nanmean(a),
+                             "MeanB"     : np.nanmean(b),
+                             "Diff"      : np.nanmean(a) - np.nanmean(b),
+                             "p_value"   : permutation_test(a, b, n_resamples,
+                                                            seed, workers)})
+    return pd.DataFrame(rows)
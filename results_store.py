@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+results_store.py  –  columnar, memory-mapped cache of experiment_results.csv
+
+The CSV written by runExperiments.m is parsed once and stored as a folder of
+NumPy ``.npy`` files (one per column) next to it:
+
+    experiment_results.csv
+    experiment_results.store/
+        meta.json          column order, dtypes, category levels, row count
+        Seed.npy
+        MapWidth.npy
+        ...
+        Approach.npy       int32 codes into meta["columns"][i]["levels"]
+
+Every analysis script opens the store with ``np.load(mmap_mode="r")`` so a
+column is only paged in when it is touched.  The store is rebuilt whenever
+the CSV is newer than it.
+
+    $ python3 results_store.py                       # (re-)ingest default CSV
+    $ python3 results_store.py other.csv --force
+"""
+
+import os
+import json
+import shutil
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+CSV_IN        = Path("experiment_results.csv")
+STORE_SUFFIX  = ".store"
+META_FILE     = "meta.json"
+STORE_VERSION = 1
+
+# Column schema written by runExperiments.m.  Text columns are stored as
+# categorical codes; anything not listed here is left to pandas' inference.
+SCHEMA = {
+    "Seed"         : "int64",
+    "MapWidth"     : "int64",
+    "MapHeight"    : "int64",
+    "NumBuildings" : "int64",
+    "NumSurvivors" : "int64",
+    "useRRTStar"   : "int64",
+    "Approach"     : "category",
+}
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+def store_path(csv_file=CSV_IN):
+    """experiment_results.csv  ->  experiment_results.store/"""
+    csv_file = Path(csv_file)
+    return csv_file.with_name(csv_file.stem + STORE_SUFFIX)
+
+def is_stale(csv_file=CSV_IN):
+    """True if the store is missing, unreadable or older than the CSV."""
+    meta_f = store_path(csv_file) / META_FILE
+    if not meta_f.is_file():
+        return True
+    try:
+        meta = json.loads(meta_f.read_text())
+    except (OSError, ValueError):
+        return True
+    if meta.get("version") != STORE_VERSION:
+        return True
+    return os.path.getmtime(csv_file) > meta_f.stat().st_mtime
+
+# ------------------------------------------------------------------
+# Ingest
+# ------------------------------------------------------------------
+def ingest(csv_file=CSV_IN):
+    """
+    Parse *csv_file* once and write the columnar store.  The new store is
+    assembled in a temporary folder and swapped in, so a crashed ingest
+    never leaves a half-written store behind.
+    """
+    csv_file = Path(csv_file)
+    if not csv_file.is_file():
+        raise FileNotFoundError(f"Cannot see {csv_file} – run runExperiments.m first.")
+
+    header = pd.read_csv(csv_file, nrows=0).columns
+    dtype  = {c: t for c, t in SCHEMA.items()
+              if c in header and t == "category"}
+    df = pd.read_csv(csv_file, dtype=dtype)
+
+    out = store_path(csv_file)
+    tmp = out.with_name(out.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    columns = []
+    for name in df.columns:
+        col  = df[name]
+        info = {"name": name}
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            info["levels"] = [str(v) for v in col.cat.categories]
+            arr = col.cat.codes.to_numpy(dtype=np.int32)
+        else:
+            want = SCHEMA.get(name)
+            if want and want != "category" and not col.isna().any():
+                col = col.astype(want)
+            arr = col.to_numpy()
+            if not pd.api.types.is_numeric_dtype(col):   # stray text column
+                cat = col.astype("category")
+                info["levels"] = [str(v) for v in cat.cat.categories]
+                arr = cat.cat.codes.to_numpy(dtype=np.int32)
+        info["dtype"] = arr.dtype.str
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+        columns.append(info)
+
+    meta = {"version": STORE_VERSION,
+            "source" : csv_file.name,
+            "rows"   : int(len(df)),
+            "columns": columns}
+    # meta.json is written last: its mtime is what is_stale() compares
+    (tmp / META_FILE).write_text(json.dumps(meta, indent=1))
+
+    shutil.rmtree(out, ignore_errors=True)
+    tmp.rename(out)
+    return out
+
+# ------------------------------------------------------------------
+# Read access
+# ------------------------------------------------------------------
+class ResultsStore:
+    """
+    Read-only view over a store folder.  ``store[col]`` returns the raw
+    memory-mapped array (category codes for text columns); ``to_frame``
+    wraps the columns in a DataFrame without copying numeric data.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / META_FILE).read_text())
+        self._info = {c["name"]: c for c in self.meta["columns"]}
+        self._cols = {}
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def __contains__(self, name):
+        return name in self._info
+
+    def __getitem__(self, name):
+        if name not in self._cols:
+            self._cols[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._cols[name]
+
+    @property
+    def columns(self):
+        return [c["name"] for c in self.meta["columns"]]
+
+    def levels(self, name):
+        """Category labels of a text column (None for numeric columns)."""
+        return self._info[name].get("levels")
+
+    def column(self, name):
+        """Column as a pandas Series (Categorical for text columns)."""
+        arr  = self[name]
+        lvls = self.levels(name)
+        if lvls is not None:
+            return pd.Series(pd.Categorical.from_codes(arr, lvls), name=name)
+        return pd.Series(arr, name=name, copy=False)
+
+    def to_frame(self, columns=None, categorical=False):
+        """
+        DataFrame over the requested columns.  Text columns come back as
+        plain strings unless *categorical* is set, so downstream code that
+        was written against pd.read_csv keeps working unchanged.
+        """
+        data = {}
+        for name in (columns or self.columns):
+            s = self.column(name)
+            if self.levels(name) is not None and not categorical:
+                s = s.astype(str)
+            data[name] = s
+        return pd.DataFrame(data, copy=False)
+
+def open_store(csv_file=CSV_IN, refresh=True):
+    """Open the store for *csv_file*, re-ingesting first if it is stale."""
+    if refresh and is_stale(csv_file):
+        ingest(csv_file)
+    return ResultsStore(store_path(csv_file))
+
+def load_frame(csv_file=CSV_IN, columns=None, categorical=False):
+    """Drop-in replacement for ``pd.read_csv(csv_file)``."""
+    return open_store(csv_file).to_frame(columns, categorical)
+
+# ------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("csv", nargs="?", default=str(CSV_IN))
+    ap.add_argument("--force", action="store_true",
+                    help="re-ingest even if the store is up to date")
+    args = ap.parse_args()
+
+    if args.force or is_stale(args.csv):
+        out = ingest(args.csv)
+        print(f"[✓] {out}  ({len(ResultsStore(out)):,} rows)")
+    else:
+        print(f"[=] {store_path(args.csv)} is up to date")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+function row = runSingleExperiment(seed, mw, bCount, sCount, useRRTStar, approach)
+% RUNSINGLEEXPERIMENT  One cell of the runExperiments grid, for external drivers.
+%
+%   row = runSingleExperiment(seed, mapWidth, numBuildings, numSurvivors, ...
+%                             useRRTStar, approach)
+%
+% Builds the same config as the body of runExperiments' nested loops, runs
+% runRescueMission once and returns the 16 result values in the column order
+% of experiment_results.csv.  The values are also printed on a single line
+% prefixed with "RESULT," so that sweep.py can read them from
+%
+%   matlab -batch "runSingleExperiment(1, 300, 30, 15, false, 'nearest')"
+%
+% The RNG is seeded with "seed" for every job, so each row is reproducible
+% on its own, independent of the order in which the grid is executed.
+
+    rng(seed);
+
+    mh  = mw;  % square maps, as in runExperiments
+    cfg = config();
+    cfg.mapWidth     = mw;
+    cfg.mapHeight    = mh;
+    cfg.numBuildings = bCount;
+    cfg.numSurvivors = sCount;
+    cfg.useRRTStar   = logical(useRRTStar);
+
+    cfg.centroidApproach = false;
+    cfg.kmeansApproach   = false;
+    if string(approach) == "centroid"
+        cfg.centroidApproach = true;
+    end
+
+    try
+        [timeTaken, uavRescueCounts, uavDistances] = runRescueMission(cfg);
+    catch ME
+        warning('Scenario failed (seed=%d, map=%dx%d, build=%d, surv=%d, RRTStar=%d, approach=%s). Error: %s',...
+            seed, mw, mh, bCount, sCount, useRRTStar, approach, ME.message);
+        timeTaken       = NaN;
+        uavRescueCounts = [NaN NaN NaN NaN];
+        uavDistances    = [NaN NaN NaN NaN];
+    end
+    if isempty(uavDistances)
+        uavDistances = [NaN NaN NaN NaN];
+    end
+
+    row = {seed, mw, mh, bCount, sCount, logical(useRRTStar), char(approach), ...
+           timeTaken, uavRescueCounts(1), uavRescueCounts(2), ...
+           uavRescueCounts(3), uavRescueCounts(4), ...
+           uavDistances(1), uavDistances(2), uavDistances(3), uavDistances(4)};
+
+    fprintf('RESULT,%d,%d,%d,%d,%d,%d,%s,%.17g,%.17g,%.17g,%.17g,%.17g,%.17g,%.17g,%.17g,%.17g\n', ...
+        seed, mw, mh, bCount, sCount, logical(useRRTStar), char(approach), ...
+        timeTaken, uavRescueCounts(1:4), uavDistances(1:4));
+end
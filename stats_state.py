@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+stats_state.py  –  mergeable sufficient statistics behind exp_stats.py
+
+A StatsState holds everything the descriptive outputs of exp_stats.py need,
+in a form that can be updated batch by batch and merged across shards:
+
+    cells   group_stats.CellMoments over the five factors, for TimeTaken and
+            every UAV<i>dist             -> *_time_stats, planner_x_approach,
+                                            uav_cv_table
+    hist    count of every (cell, TimeTaken) value
+                                         -> per-group min / median / max
+    reps    one full result row per distinct TimeTaken value
+                                         -> representative_runs
+
+Updating with a batch costs O(batch + cells + distinct values); the history
+is never re-read.  Merging is associative and order independent, so
+
+    StatsState.from_frame(a).merge(StatsState.from_frame(b))
+        == StatsState.from_frame(pd.concat([a, b]))
+
+Ties (several runs with the same TimeTaken) are broken deterministically by
+the smallest (Seed, factor ...) key, so shard merges reproduce a full pass.
+
+    $ python3 stats_state.py shard3.csv -o Analysis/shard3_state.pkl
+"""
+
+import pickle
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from group_stats import FACTORS, CellMoments, value_cols
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+STATE_FILE    = Path("Analysis") / "stats_state.pkl"
+STATE_VERSION = 1
+RANK_COL      = "TimeTaken"
+TIE_KEY       = ["Seed"] + FACTORS
+
+# ------------------------------------------------------------------
+# State
+# ------------------------------------------------------------------
+class StatsState:
+
+    def __init__(self, cells, hist, reps, columns):
+        self.cells   = cells
+        self.hist    = hist
+        self.reps    = reps
+        self.columns = list(columns)
+
+    @property
+    def rows(self):
+        return int(self.hist["count"].sum())
+
+    # -------------------------------------------------------------- build
+    @classmethod
+    def from_frame(cls, df):
+        cells = CellMoments.from_frame(df, FACTORS, value_cols(df))
+        hist  = (df.groupby(FACTORS + [RANK_COL], sort=True, dropna=False,
+                            observed=True)
+                   .size().rename("count").reset_index())
+        reps  = _pick_reps(df)
+        return cls(cells, hist, reps, df.columns)
+
+    def update(self, batch):
+        """Fold a new batch of result rows into the state (in place)."""
+        self._absorb(StatsState.from_frame(batch))
+        return self
+
+    def merge(self, other):
+        """New state equal to the union of both inputs."""
+        out = StatsState(self.cells, self.hist, self.reps, self.columns)
+        out._absorb(other)
+        return out
+
+    def _absorb(self, other):
+        if list(other.columns) != self.columns:      # e.g. a wider fleet
+            self.columns += [c for c in other.columns if c not in self.columns]
+            self.reps = self.reps.reindex(columns=self.columns)
+            other_reps = other.reps.reindex(columns=self.columns)
+        else:
+            other_reps = other.reps
+        self.cells = self.cells.merge(other.cells)
+        self.hist  = (pd.concat([self.hist, other.hist], ignore_index=True)
+                        .groupby(FACTORS + [RANK_COL], sort=True, dropna=False,
+                                 observed=True)["count"]
+                        .sum().reset_index())
+        self.reps  = _pick_reps(pd.concat([self.reps, other_reps],
+                                          ignore_index=True))
+
+    # -------------------------------------------------------------- persist
+    def save(self, path=STATE_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump({"version": STATE_VERSION,
+                         "columns": self.columns,
+                         "keys"   : self.cells.keys,
+                         "values" : self.cells.values,
+                         "n"      : self.cells.n,
+                         "mean"   : self.cells.mean,
+                         "m2"     : self.cells.m2,
+                         "hist"   : self.hist,
+                         "reps"   : self.reps}, fh)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        with open(path, "rb") as fh:
+            d = pickle.load(fh)
+        if d.get("version") != STATE_VERSION:
+            raise ValueError(f"{path}: state version {d.get('version')} "
+                             f"!= {STATE_VERSION}, rebuild with a full pass")
+        cells = CellMoments(d["keys"], d["values"], d["n"], d["mean"], d["m2"])
+        return cls(cells, d["hist"], d["reps"], d["columns"])
+
+    # -------------------------------------------------------------- queries
+    def one_way(self, factor, value_col="TimeTaken"):
+        return self.cells.rollup(factor).describe(value_col)
+
+    def group_quantiles(self, by, q=(0.0, 0.5, 1.0)):
+        """Exact per-group quantiles of TimeTaken from the value counts."""
+        by  = [by] if isinstance(by, str) else list(by)
+        h   = self.hist.dropna(subset=[RANK_COL])
+        h   = h.groupby(by + [RANK_COL], sort=True, observed=True)["count"].sum()
+        out = {}
+        level = list(range(len(by))) if len(by) > 1 else 0
+        for key, grp in h.groupby(level=level, sort=True):
+            vals = grp.index.get_level_values(RANK_COL).to_numpy()
+            cum  = grp.to_numpy().cumsum()
+            out[key] = [vals[np.searchsorted(cum, int(qq * (cum[-1] - 1)), side="right")]
+                        for qq in q]
+        return pd.DataFrame.from_dict(out, orient="index",
+                                      columns=[f"q{qq:g}" for qq in q])
+
+    def representative_runs(self):
+        """Rows at rank 0, len//2 and len-1 of the TimeTaken ordering."""
+        h = self.hist.groupby(RANK_COL, sort=True, dropna=False)["count"].sum()
+        vals = h.index.to_numpy(dtype=float)       # NaN sorts last, as in pandas
+        cum  = h.to_numpy().cumsum()
+        total = int(cum[-1])
+        picks = []
+        for rank in (0, total // 2, total - 1):
+            v = vals[np.searchsorted(cum, rank, side="right")]
+            if np.isnan(v):
+                hit = self.reps[self.reps[RANK_COL].isna()]
+            else:
+                hit = self.reps[self.reps[RANK_COL] == v]
+            picks.append(hit.iloc[0])
+        return pd.DataFrame(picks)[self.columns]
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+def _pick_reps(df):
+    """One row per distinct TimeTaken (NaN included), smallest TIE_KEY wins."""
+    key = [c for c in TIE_KEY if c in df.columns]
+    srt = df.sort_values([RANK_COL] + key, kind="mergesort", na_position="last")
+    return srt.drop_duplicates(subset=[RANK_COL], keep="first").reset_index(drop=True)
+
+def merge_states(paths):
+    states = [StatsState.load(p) for p in paths]
+    out = states[0]
+    for s in states[1:]:
+        out = out.merge(s)
+    return out
+
+# ------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------
+def main():
+    import exp_stats
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("csv", help="results shard to summarise")
+    ap.add_argument("-o", "--out", default=str(STATE_FILE))
+    args = ap.parse_args()
+
+    state = StatsState.from_frame(exp_stats.read_data(args.csv))
+    state.save(args.out)
+    print(f"[✓] {args.out}  ({state.rows:,} rows, {len(state.cells)} cells)")
+
+if __name__ == "__main__":
+    main()
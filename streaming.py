@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+streaming.py  –  bounded-memory analysis of results files larger than RAM
+
+The CSV is read in chunks of CHUNK_ROWS rows; each chunk is folded into
+small accumulators and then dropped, so peak memory is one chunk plus the
+accumulators, whatever the file size:
+
+    StatsState                   (stats_state.py)  exp_stats tables + ANOVA
+    PlotAccumulator              (below)           plot_results figures
+        moments per Planner × Approach    -> bar charts (mean ± 95 % CI)
+        fixed-width histograms per label  -> distance boxplots (by Kind)
+        non-dominated (TimeTaken, Fraction) -> Pareto scatter
+        moments per Scenario              -> workload heat-map
+
+The bar charts and the heat-map are exact.  The other two are deliberate
+approximations of the in-memory figures, since their exact versions need
+every row:
+
+  * box statistics come from BOX_BIN_M-wide histograms: quartiles and
+    whiskers are exact to within half a bin, and the fliers are drawn at
+    bin centres, one marker per non-empty bin;
+  * the Pareto scatter shows only the frontier (no other run is both
+    faster and rescues a larger fraction), not every run.  It holds at
+    most one point per distinct FractionRescued value, so it stays small
+    whatever the number of rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from group_stats import CellMoments
+import uav_long
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+CHUNK_ROWS = 1_000_000
+BOX_BIN_M  = 0.5          # (m) histogram bin width for the boxplots
+WHIS       = 1.5          # matplotlib's default whisker reach (× IQR)
+
+# ------------------------------------------------------------------
+# Chunk reader
+# ------------------------------------------------------------------
+def iter_chunks(csv_file, chunk_rows=CHUNK_ROWS, prep=None):
+    """Yield DataFrames of at most *chunk_rows* rows, optionally *prep*-ed."""
+    for chunk in pd.read_csv(csv_file, chunksize=chunk_rows):
+        yield prep(chunk) if prep else chunk
+
+# ------------------------------------------------------------------
+# Histograms
+# ------------------------------------------------------------------
+def histogram(keys, values, width=BOX_BIN_M):
+    """Counts per (key..., bin) as a Series; NaN values are dropped."""
+    fin  = ~np.isnan(values)
+    bins = np.floor(values[fin] / width).astype(np.int64)
+    frame = keys[fin].assign(bin=bins)
+    return frame.groupby(list(frame.columns), sort=False, observed=True).size()
+
+def merge_counts(a, b):
+    if a is None:
+        return b
+    return a.add(b, fill_value=0)
+
+def _quantile(centres, cum, q):
+    """np.percentile(..., 'linear') of the histogram expanded to its values."""
+    h  = q * (cum[-1] - 1)
+    lo = centres[np.searchsorted(cum, np.floor(h), side="right")]
+    hi = centres[np.searchsorted(cum, np.ceil(h),  side="right")]
+    return lo + (hi - lo) * (h - np.floor(h))
+
+def box_stats(counts, label, width=BOX_BIN_M):
+    """ax.bxp() statistics of one histogram (Series indexed by bin)."""
+    counts  = counts.sort_index()
+    centres = (counts.index.to_numpy(dtype=float) + 0.5) * width
+    cum     = counts.to_numpy().cumsum()
+    q1, med, q3 = (_quantile(centres, cum, q) for q in (0.25, 0.5, 0.75))
+    iqr   = q3 - q1
+    inner = centres[(centres >= q1 - WHIS * iqr) & (centres <= q3 + WHIS * iqr)]
+    return {"label" : label,
+            "q1"    : q1, "med": med, "q3": q3,
+            "whislo": inner.min() if inner.size else q1,
+            "whishi": inner.max() if inner.size else q3,
+            "fliers": centres[(centres < q1 - WHIS * iqr) | (centres > q3 + WHIS * iqr)]}
+
+# ------------------------------------------------------------------
+# Pareto frontier
+# ------------------------------------------------------------------
+def pareto_front(pts):
+    """
+    The (TimeTaken, FractionRescued) rows no other row beats on both (less
+    time, larger fraction), sorted by time; NaN rows are dropped.
+    """
+    pts  = pts.dropna().sort_values(["TimeTaken", "FractionRescued"],
+                                    ascending=[True, False], kind="mergesort")
+    frac = pts["FractionRescued"].to_numpy()
+    best = np.maximum.accumulate(frac)
+    keep = frac > np.concatenate([[-np.inf], best[:-1]])
+    return pts[keep].reset_index(drop=True)
+
+# ------------------------------------------------------------------
+# Figure accumulator
+# ------------------------------------------------------------------
+class PlotAccumulator:
+    """Everything plot_results needs, folded chunk by chunk."""
+
+    BAR_KEYS  = ["Planner", "Approach"]
+    BAR_COLS  = ["TimeTaken", "FractionRescued"]
+
+    def __init__(self):
+        self.bars   = None
+        self.heat   = None
+        self.hist   = None
+        self.pareto = None
+
+    def add(self, df):
+        """Fold one prepared chunk (see plot_results.prepare)."""
+        bars = CellMoments.from_frame(df, self.BAR_KEYS, self.BAR_COLS)
+        heat = CellMoments.from_frame(df, ["Scenario"], uav_long.uav_cols(df))
+        self.bars = bars if self.bars is None else self.bars.merge(bars)
+        self.heat = heat if self.heat is None else self.heat.merge(heat)
+
+        long = uav_long.to_long(df)
+        hist = histogram(long[["Kind"] + self.BAR_KEYS + ["UAV"]], long["Dist"].to_numpy())
+        self.hist = merge_counts(self.hist, hist)
+
+        pts = df[["TimeTaken", "FractionRescued"]]
+        self.pareto = pareto_front(pts if self.pareto is None else
+                                   pd.concat([self.pareto, pts]))
+        return self
+
+    # -------------------------------------------------------------- views
+    def means_sems(self, col):
+        """Planner × Approach tables of mean and 1.96·SEM, as bar_with_ci."""
+        j     = self.bars.values.index(col)
+        index = pd.MultiIndex.from_frame(self.bars.keys)
+        n     = self.bars.n[:, j]
+        mean  = pd.Series(self.bars.mean[:, j], index=index)
+        sem   = pd.Series(np.sqrt(self.bars.var(col) / n), index=index)
+        return mean.unstack(), sem.unstack() * 1.96
+
+    def box(self, kind):
+        """ax.bxp() statistics per Planner_Approach_UAV label of *kind*, sorted."""
+        h   = self.hist.xs(kind, level="Kind")
+        out = {}
+        for key, grp in h.groupby(level=[0, 1, 2], observed=True):
+            label = "_".join(map(str, key))
+            out[label] = box_stats(grp.droplevel([0, 1, 2]), label)
+        return [out[k] for k in sorted(out)]
+
+    def heat_means(self):
+        heat = pd.DataFrame(self.heat.mean, columns=self.heat.values)
+        heat.index = self.heat.keys["Scenario"]
+        return heat
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+sweep.py  –  resumable, parallel version of runExperiments.m
+
+runExperiments.m walks seeds × map sizes × buildings × survivors × planner
+× approach in nested serial loops and writes one CSV at the very end, so a
+crash loses the whole sweep.  This script
+
+  1. expands the same grid into a job manifest   (sweep/manifest.csv)
+  2. runs the jobs through a pluggable backend in a process pool
+  3. appends every finished row to its shard file (sweep/shard-NNN.csv),
+     flushed and fsync-ed, so an interrupted sweep resumes where it stopped
+  4. merges the shards, in grid order, into experiment_results.csv, and
+     the per-vehicle rows into the long-format experiment_vehicles.csv
+
+    $ python3 sweep.py                          # MATLAB backend, all cores
+    $ python3 sweep.py --workers 4 --shards 8
+    $ python3 sweep.py --grid Seed=1,2,3,4,5    # override one grid axis
+    $ python3 sweep.py --backend python --grid NumGround=2,8,32 --grid NumAerial=2,8,32
+    $ python3 sweep.py --backend replay         # stand-in, no MATLAB needed
+    $ python3 sweep.py --backend python         # headless port (uavsim)
+    $ python3 sweep.py --backend mypkg.sim:run  # any Python callable
+    $ python3 sweep.py --merge-only             # just rebuild the CSV
+
+A backend is a callable  job -> {result column: value}  where job holds the
+GRID_COLS of one row (see runSingleExperiment.m for the MATLAB side).
+It may return UAV<i>resc / UAV<i>dist for any number of vehicles: the wide
+CSV has columns for the largest fleet in the grid (NaN for the UAVs a
+smaller fleet lacks), the long file gets one row per vehicle.
+"""
+
+import argparse
+import csv
+import importlib
+import itertools
+import math
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+ROOT       = Path(__file__).resolve().parent
+SWEEP_DIR  = ROOT / "sweep"
+CSV_OUT    = ROOT / "experiment_results.csv"
+VEHICLES_OUT = ROOT / "experiment_vehicles.csv"
+REPLAY_CSV = CSV_OUT                      # rows served by the "replay" backend
+
+MATLAB      = os.environ.get("MATLAB", "matlab")
+JOB_TIMEOUT = 3600                        # (s) per MATLAB job
+
+# Same ranges and nesting order as runExperiments.m
+GRID = {
+    "Seed"        : [1, 2, 3],
+    "MapWidth"    : [300, 500],
+    "NumBuildings": [30, 60],
+    "NumSurvivors": [15, 25],
+    "useRRTStar"  : [False, True],
+    "Approach"    : ["nearest", "centroid"],
+}
+GRID_COLS   = ["Seed", "MapWidth", "MapHeight", "NumBuildings", "NumSurvivors",
+               "useRRTStar", "Approach"]
+RESULT_COLS = ["TimeTaken",
+               "UAV1resc", "UAV2resc", "UAV3resc", "UAV4resc",
+               "UAV1dist", "UAV2dist", "UAV3dist", "UAV4dist"]
+COLUMNS     = GRID_COLS + RESULT_COLS
+
+# Optional fleet-size axes (runRescueMission's 2 + 2 vehicles by default).
+# They are only part of the manifest and CSVs when given with --grid.
+FLEET_GRID   = {"NumGround": [2], "NumAerial": [2]}
+VEHICLE_COLS = ["UAV", "Kind", "Resc", "Dist", "PlanRaw", "PlanSmooth"]
+
+# ------------------------------------------------------------------
+# Job manifest
+# ------------------------------------------------------------------
+def expand_grid(grid=GRID):
+    """Jobs (dicts with JobId + GRID_COLS) in runExperiments' loop order."""
+    cols = GRID_COLS + [c for c in FLEET_GRID if c in grid]
+    jobs = []
+    for i, combo in enumerate(itertools.product(*grid.values())):
+        job = dict(zip(grid, combo))
+        job.setdefault("MapHeight", job["MapWidth"])          # square maps
+        jobs.append({"JobId": i, **{c: job[c] for c in cols}})
+    return jobs
+
+def result_cols(jobs):
+    """RESULT_COLS widened to the largest NumGround + NumAerial fleet in *jobs*."""
+    fleet = [sum(j.get(c, v[0]) for c, v in FLEET_GRID.items()) for j in jobs]
+    n     = max(fleet + [sum(v[0] for v in FLEET_GRID.values())])
+    return (["TimeTaken"] + [f"UAV{i}resc" for i in range(1, n + 1)]
+                          + [f"UAV{i}dist" for i in range(1, n + 1)])
+
+def job_cols(jobs):
+    """Grid columns of a job list (GRID_COLS plus any fleet axes)."""
+    return [c for c in jobs[0] if c != "JobId"] if jobs else list(GRID_COLS)
+
+def _fmt(v):
+    """Cell text as MATLAB's writetable would write it."""
+    if isinstance(v, (bool,)):
+        return str(int(v))
+    if isinstance(v, float):
+        if math.isnan(v):
+            return "NaN"
+        return f"{v:.15g}"
+    return str(v)
+
+def write_manifest(jobs, path):
+    """Write the manifest; refuse to resume a sweep over a different grid."""
+    cols  = ["JobId"] + job_cols(jobs)
+    lines = [",".join(cols)]
+    lines += [",".join(_fmt(j[c]) for c in cols) for j in jobs]
+    text = "\n".join(lines) + "\n"
+    if path.exists() and path.read_text() != text:
+        raise SystemExit(f"{path} describes a different grid – "
+                         "merge or move it, or rerun with --fresh.")
+    path.write_text(text)
+
+# ------------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------------
+BACKENDS = {}
+
+def register_backend(name):
+    def deco(fn):
+        BACKENDS[name] = fn
+        return fn
+    return deco
+
+def resolve_backend(spec):
+    """A registered name or "package.module:function"."""
+    if spec in BACKENDS:
+        return BACKENDS[spec]
+    if ":" not in spec:
+        raise SystemExit(f"unknown backend {spec!r} "
+                         f"(registered: {', '.join(sorted(BACKENDS))})")
+    mod, fn = spec.split(":", 1)
+    return getattr(importlib.import_module(mod), fn)
+
+@register_backend("matlab")
+def matlab_backend(job):
+    """One `matlab -batch runSingleExperiment(...)` process per job."""
+    if any(job.get(c, v[0]) != v[0] for c, v in FLEET_GRID.items()):
+        raise RuntimeError("runRescueMission.m always flies the 2 + 2 vehicle fleet")
+    call = ("runSingleExperiment({Seed}, {MapWidth}, {NumBuildings}, {NumSurvivors}, "
+            "{rrt}, '{Approach}')").format(rrt=str(job["useRRTStar"]).lower(), **job)
+    proc = subprocess.run([MATLAB, "-batch", call], cwd=ROOT, text=True,
+                          capture_output=True, timeout=JOB_TIMEOUT)
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT,"):
+            values = line.split(",")[1:]
+            return dict(zip(RESULT_COLS, map(float, values[len(GRID_COLS):])))
+    raise RuntimeError(f"no RESULT line from MATLAB (exit {proc.returncode}): "
+                       f"{proc.stderr.strip()[-300:]}")
+
+_REPLAY = None
+
+@register_backend("replay")
+def replay_backend(job):
+    """Stand-in simulator: looks the job up in an existing results file."""
+    global _REPLAY
+    if _REPLAY is None:
+        with open(REPLAY_CSV, newline="") as fh:
+            _REPLAY = {tuple(r[c] for c in GRID_COLS): r for r in csv.DictReader(fh)}
+    row = _REPLAY[tuple(_fmt(job[c]) for c in GRID_COLS)]
+    return {c: float(row[c]) for c in RESULT_COLS}
+
+@register_backend("python")
+def python_backend(job):
+    """Headless Python port (uavsim), event-driven mission kernel."""
+    from uavsim.mission import sweep_job
+    return sweep_job(job)
+
+# ------------------------------------------------------------------
+# Durable shards
+# ------------------------------------------------------------------
+def shard_path(k, out_dir=SWEEP_DIR):
+    return out_dir / f"shard-{k:03d}.csv"
+
+def vehicle_path(path):
+    """Per-vehicle companion of a shard file (vehicles-NNN.csv)."""
+    return path.with_name(path.name.replace("shard-", "vehicles-"))
+
+def vehicle_rows(job, res):
+    """
+    Long-format rows (UAV, Kind, Resc, Dist, PlanRaw, PlanSmooth) for every
+    UAV<i> in *res*; the planned path lengths (before / after smoothing)
+    are NaN for backends that do not report them.
+    """
+    n_ground = job.get("NumGround", FLEET_GRID["NumGround"][0])
+    ids = sorted(int(c[3:-4]) for c in res if c.startswith("UAV") and c.endswith("resc"))
+    return [[f"UAV{i}", "ground" if i <= n_ground else "aerial",
+             float(res[f"UAV{i}resc"]), float(res.get(f"UAV{i}dist", math.nan)),
+             float(res.get(f"UAV{i}planraw", math.nan)),
+             float(res.get(f"UAV{i}plansmooth", math.nan))]
+            for i in ids]
+
+def done_jobs(path):
+    """JobIds already in a shard; a torn last line (crash) is cut off."""
+    if not path.exists():
+        return set()
+    data = path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        with open(path, "r+b") as fh:
+            fh.truncate(data.rfind(b"\n") + 1)
+    with open(path, newline="") as fh:
+        return {int(r["JobId"]) for r in csv.DictReader(fh)}
+
+def run_shard(backend, jobs, path, results=RESULT_COLS):
+    """
+    Run *jobs* one after the other, appending each row as it finishes, with
+    the *results* columns.  The per-vehicle rows go to the companion file
+    first, so a job counts as done only once both are on disk.
+    """
+    fn    = resolve_backend(backend)
+    cols  = ["JobId"] + job_cols(jobs)
+    vpath = vehicle_path(path)
+    new   = not path.exists() or path.stat().st_size == 0
+    vnew  = not vpath.exists() or vpath.stat().st_size == 0
+    with open(path, "a", newline="") as fh, open(vpath, "a", newline="") as vh:
+        if new:
+            fh.write(",".join(cols + results) + "\n")
+        if vnew:
+            vh.write(",".join(cols + ["TimeTaken"] + VEHICLE_COLS) + "\n")
+        for job in jobs:
+            try:
+                res = fn(dict((c, job[c]) for c in cols[1:]))
+            except Exception as exc:       # keep the row, like runExperiments.m
+                print(f"[!] job {job['JobId']} failed: {exc}", file=sys.stderr)
+                res = {}
+            row = {**job, **{c: float(res.get(c, math.nan)) for c in results}}
+            for v in vehicle_rows(job, res):
+                vh.write(",".join(map(_fmt, [job[c] for c in cols] +
+                                      [row["TimeTaken"]] + v)) + "\n")
+            vh.flush()
+            os.fsync(vh.fileno())
+            fh.write(",".join(_fmt(row[c]) for c in cols + results) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+            print("Done: seed={Seed}, map=({MapWidth}x{MapHeight}), build={NumBuildings}, "
+                  "surv={NumSurvivors}, RRTStar={rrt}, approach={Approach} => "
+                  "time={TimeTaken:.2f}".format(rrt=int(row["useRRTStar"]), **row),
+                  flush=True)
+    return len(jobs)
+
+def _read_shards(paths):
+    """(header without JobId, {JobId: [rows]}) of a set of shard files."""
+    header, rows = None, {}
+    for path in sorted(paths):
+        done_jobs(path)                                   # repair torn tail
+        with open(path, newline="") as fh:
+            reader = csv.reader(fh)
+            header = next(reader, [None])[1:] or header
+            seen   = set()
+            for r in reader:
+                k = int(r[0])
+                if k not in seen:                         # a rerun replaces rows
+                    rows[k], seen = [], seen | {k}
+                rows[k].append(r[1:])
+    return header, rows
+
+def _write_rows(path, header, rows, keep):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w", newline="") as fh:
+        fh.write(",".join(header) + "\n")
+        for k in sorted(keep):
+            for r in rows.get(k, []):
+                fh.write(",".join(r) + "\n")
+    os.replace(tmp, path)
+
+def merge_shards(out_dir=SWEEP_DIR, csv_out=CSV_OUT, vehicles_out=VEHICLES_OUT):
+    """
+    Concatenate all shards in JobId order into *csv_out* (text kept as is),
+    and their per-vehicle rows into *vehicles_out*.
+    """
+    header, rows = _read_shards(out_dir.glob("shard-*.csv"))
+    _write_rows(csv_out, header or COLUMNS, rows, rows)
+    vheader, vrows = _read_shards(out_dir.glob("vehicles-*.csv"))
+    if vheader and vehicles_out is not None:
+        _write_rows(vehicles_out, vheader, vrows, rows)
+    return len(rows)
+
+# ------------------------------------------------------------------
+# Sweep
+# ------------------------------------------------------------------
+def run_sweep(jobs, backend="matlab", workers=None, shards=None, out_dir=SWEEP_DIR):
+    """Run every job not yet in a shard file; returns the number run now."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    done = set().union(*[done_jobs(p) for p in out_dir.glob("shard-*.csv")])
+    todo = [j for j in jobs if j["JobId"] not in done]
+    if done:
+        print(f"[=] resuming: {len(done)} of {len(jobs)} jobs already done")
+    if not todo:
+        return 0
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo)))
+    shards  = max(1, min(shards or workers, len(todo)))
+    # round-robin, so every shard gets a similar mix of map sizes
+    parts = [todo[k::shards] for k in range(shards)]
+    first = 1 + max([int(p.stem.split("-")[1]) for p in out_dir.glob("shard-*.csv")],
+                    default=-1)
+    paths = [shard_path(first + k, out_dir) for k in range(shards)]
+    wide  = result_cols(jobs)             # the whole grid's, so shards agree
+
+    if workers == 1:
+        return sum(run_shard(backend, part, path, wide)
+                   for part, path in zip(parts, paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futs = [pool.submit(run_shard, backend, part, path, wide)
+                for part, path in zip(parts, paths)]
+        return sum(f.result() for f in as_completed(futs))
+
+def parse_grid(overrides, grid=GRID):
+    """--grid Name=v1,v2 overrides, cast to the type of the default values."""
+    grid = dict(grid)
+    axes = {**grid, **FLEET_GRID}
+    for item in overrides or []:
+        name, _, values = item.partition("=")
+        if name not in axes:
+            raise SystemExit(f"--grid: unknown axis {name!r} ({', '.join(axes)})")
+        kind = type(axes[name][0])
+        cast = (lambda s: s.lower() in ("1", "true")) if kind is bool else kind
+        grid[name] = [cast(v) for v in values.split(",")]
+    return grid
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Resumable parallel experiment sweep.")
+    ap.add_argument("--backend", default="matlab",
+                    help="matlab, replay, or package.module:function")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="worker processes (default: one per core)")
+    ap.add_argument("--shards", type=int, default=None,
+                    help="shard files for this run (default: --workers)")
+    ap.add_argument("--grid", action="append", metavar="NAME=V1,V2",
+                    help="override one grid axis, e.g. Seed=1,2,3,4")
+    ap.add_argument("--dir", type=Path, default=SWEEP_DIR,
+                    help="manifest and shard directory")
+    ap.add_argument("-o", "--output", type=Path, default=CSV_OUT)
+    ap.add_argument("--vehicles-output", type=Path, default=VEHICLES_OUT,
+                    help="long-format per-vehicle results")
+    ap.add_argument("--fresh", action="store_true",
+                    help="discard the shards of a previous sweep first")
+    ap.add_argument("--merge-only", action="store_true",
+                    help="only merge existing shards into --output")
+    args = ap.parse_args(argv)
+
+    if not args.merge_only:
+        args.dir.mkdir(parents=True, exist_ok=True)
+        if args.fresh:
+            for p in [*args.dir.glob("shard-*.csv"), *args.dir.glob("vehicles-*.csv"),
+                      args.dir / "manifest.csv"]:
+                p.unlink(missing_ok=True)
+        jobs = expand_grid(parse_grid(args.grid))
+        write_manifest(jobs, args.dir / "manifest.csv")
+        resolve_backend(args.backend)                 # fail before forking
+        n = run_sweep(jobs, args.backend, args.workers, args.shards, args.dir)
+        print(f"[✓] {n} job(s) run, shards in {args.dir}")
+
+        done = set().union(*[done_jobs(p) for p in args.dir.glob("shard-*.csv")])
+        if len(done) < len(jobs):
+            print(f"[!] {len(jobs) - len(done)} job(s) missing – rerun to resume")
+            return
+
+    n = merge_shards(args.dir, args.output, args.vehicles_output)
+    print(f"[✓] {args.output}  ({n} rows)")
+    if args.vehicles_output.exists():
+        print(f"[✓] {args.vehicles_output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+conftest.py  –  shared fixtures for the uavsim / analysis regression tests
+
+The scripts live at the repository root, so the root goes on sys.path.
+Environments come from cached_environment (fixed ENV_SEED), small enough
+that the whole suite runs in well under a minute.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from uavsim import config, cached_environment   # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def cfg():
+    return config(mapWidth=120, mapHeight=120, numBuildings=12, numSurvivors=6)
+
+
+@pytest.fixture(scope="session")
+def env(cfg):
+    return cached_environment(cfg)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
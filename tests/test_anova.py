@@ -0,0 +1,71 @@
+"""Cell-aggregate ANOVA vs statsmodels' anova_lm(ols(...), typ=2)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+from statsmodels.formula.api import ols
+
+import anova_cells
+import exp_stats
+from conftest import ROOT
+from group_stats import FACTORS, CellMoments
+
+FORMULA = ("TimeTaken ~ C(MapWidth) + C(NumBuildings) + C(NumSurvivors)"
+           " + C(useRRTStar) + C(Approach)"
+           " + C(MapWidth):C(NumBuildings)"
+           " + C(useRRTStar):C(Approach)")
+
+
+def _statsmodels(df):
+    return sm.stats.anova_lm(ols(FORMULA, data=df).fit(), typ=2)
+
+
+def _synthetic(reps, seed):
+    """Full factorial with real effects, an interaction and noise."""
+    rng  = np.random.default_rng(seed)
+    grid = pd.MultiIndex.from_product(
+        [[300, 500, 700], [30, 60], [15, 25], [False, True], ["nearest", "centroid"],
+         range(reps)], names=FACTORS + ["rep"]).to_frame(index=False)
+    grid["TimeTaken"] = (0.4 * grid.MapWidth + 2.0 * grid.NumBuildings
+                         + 30.0 * (grid.Approach == "nearest") * grid.useRRTStar
+                         + rng.gamma(2.0, 20.0, len(grid)))
+    return grid
+
+
+def _check(df, balanced):
+    cells = CellMoments.from_frame(df, FACTORS, ["TimeTaken"])
+    assert anova_cells.is_balanced(cells) == balanced
+    got  = anova_cells.anova_from_cells(cells)
+    want = _statsmodels(df)
+    assert list(got.index) == list(want.index)
+    # zero-effect terms: statsmodels leaves round-off of the total SS behind
+    ss_tol = 1e-9 * float(want.sum_sq.sum())
+    np.testing.assert_allclose(got.sum_sq, want.sum_sq, rtol=1e-6, atol=ss_tol)
+    for col in ["df", "F", "PR(>F)"]:
+        np.testing.assert_allclose(got[col].to_numpy(dtype=float),
+                                   want[col].to_numpy(dtype=float), rtol=1e-6, atol=1e-9)
+
+
+def test_results_file_balanced():
+    _check(exp_stats.read_data(ROOT / "experiment_results.csv", use_store=False), True)
+
+
+@pytest.mark.parametrize("reps", [1, 4])
+def test_balanced_closed_form(reps):
+    _check(_synthetic(reps, reps), True)
+
+
+@pytest.mark.parametrize("drop", [0.05, 0.3])
+def test_unbalanced_weighted_fit(drop):
+    df   = _synthetic(4, 7)
+    keep = np.random.default_rng(1).random(len(df)) >= drop
+    _check(df[keep].reset_index(drop=True), False)
+
+
+def test_run_anova_table_matches_statsmodels():
+    df   = _synthetic(3, 2)
+    got  = exp_stats.run_anova(df.copy()).set_index("Factor")
+    want = _statsmodels(df).round(3)
+    pd.testing.assert_frame_equal(got, want, check_names=False, check_exact=False,
+                                  atol=2e-3)
@@ -0,0 +1,94 @@
+"""Assignment solvers vs brute force; cost matrix; banned / unreachable pairs."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from uavsim import Assigner, config, cost_matrix
+from uavsim.assignment import PRIORITY_WEIGHT, UNREACHABLE, auction, hungarian
+
+
+def _brute(cost):
+    """Cheapest total over every injective rows -> cols (or cols -> rows) map."""
+    U, S = cost.shape
+    if U <= S:
+        return min(cost[np.arange(U), list(p)].sum()
+                   for p in itertools.permutations(range(S), U))
+    return min(cost[list(p), np.arange(S)].sum()
+               for p in itertools.permutations(range(U), S))
+
+
+def _total(cost, sol):
+    hit = sol >= 0
+    assert len(set(sol[hit].tolist())) == hit.sum()        # distinct columns
+    return cost[np.flatnonzero(hit), sol[hit]].sum()
+
+
+@pytest.mark.parametrize("shape", [(3, 3), (2, 5), (4, 6), (5, 3)])
+def test_hungarian_is_optimal(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(5):
+        cost = rng.random(shape) * 100
+        sol  = hungarian(cost)
+        assert (sol >= 0).sum() == min(shape)
+        assert _total(cost, sol) == pytest.approx(_brute(cost))
+
+
+@pytest.mark.parametrize("shape", [(3, 3), (2, 5), (4, 6)])
+def test_auction_within_eps_warm_or_cold(shape):
+    rng    = np.random.default_rng(10 + sum(shape))
+    prices = None
+    for _ in range(5):
+        cost = rng.random(shape) * 100
+        sol, prices = auction(cost, prices)
+        assert (sol >= 0).all()
+        assert _total(cost, sol) <= _brute(cost) + shape[0] * 1e-3 + 1e-9
+
+
+def test_cost_matrix_matches_definition():
+    rng  = np.random.default_rng(0)
+    uav  = rng.random((3, 3)) * 100
+    surv = rng.random((4, 3)) * 100
+    spd  = np.array([5.0, 15.0, 5.0])
+    pri  = np.array([1, 2, 3, 2])
+    got  = cost_matrix(uav, spd, surv, pri)
+    for u in range(3):
+        for s in range(4):
+            want = np.hypot(*(uav[u, :2] - surv[s, :2])) / spd[u] * PRIORITY_WEIGHT[pri[s]]
+            assert got[u, s] == pytest.approx(want)
+
+
+def test_path_cost_marks_unreachable(env):
+    free = np.argwhere(env.top == 0)[:, ::-1] + 0.5
+    roof = np.argwhere(env.top > 0)[0][::-1] + 0.5
+    surv = np.array([[*free[-1], 0.0], [*roof, 0.0]])
+    cost = cost_matrix([[*free[0], 0.0]], [5.0], surv, [2, 2], "path", env, ["2D"])
+    assert cost[0, 0] < UNREACHABLE and cost[0, 1] == UNREACHABLE
+
+
+@pytest.mark.parametrize("solver", ["hungarian", "auction"])
+def test_assigner_respects_banned_and_unreachable(solver):
+    cfg  = config(hungarianApproach=True, assignmentSolver=solver)
+    rng  = np.random.default_rng(2)
+    uav  = rng.random((3, 3)) * 100
+    surv = rng.random((5, 3)) * 100
+    ban  = np.zeros((3, 5), dtype=bool)
+    ban[0, :] = True                                   # UAV 0 may take nothing
+    ban[1, 2] = True
+    out  = Assigner(cfg).assign(uav, [5.0] * 3, [True] * 3, surv, np.full(5, 2),
+                                [True] * 5, banned=ban)
+    assert out[0] == -1 and out[1] not in (-1, 2) and out[2] >= 0
+    assert out[1] != out[2]
+
+
+def test_nearest_takes_closest_free_survivor_in_uav_order():
+    cfg  = config()
+    uav  = np.array([[0.0, 0, 0], [10.0, 0, 0]])
+    surv = np.array([[9.0, 0, 0], [1.0, 0, 0], [50.0, 0, 0]])
+    out  = Assigner(cfg).assign(uav, [5.0, 5.0], [True, True], surv, np.full(3, 2),
+                                [True, True, True])
+    assert out.tolist() == [1, 0]
+    out  = Assigner(cfg).assign(uav, [5.0, 5.0], [False, True], surv, np.full(3, 2),
+                                [False, True, True])
+    assert out.tolist() == [-1, 1]
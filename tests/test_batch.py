@@ -0,0 +1,30 @@
+"""simulate_batch: results schema, and independence from the worker count."""
+
+import pandas as pd
+
+import uav_long
+from uavsim import simulate_batch
+
+GRID = {"Seed": [1, 2], "MapWidth": [120], "NumBuildings": [8], "NumSurvivors": [4],
+        "useRRTStar": [False], "Approach": ["nearest", "centroid"]}
+
+
+def test_schema_and_workers():
+    one = simulate_batch(GRID, n_workers=1)
+    two = simulate_batch(GRID, n_workers=2)
+    pd.testing.assert_frame_equal(one, two)
+    assert list(one.columns[:8]) == ["Seed", "MapWidth", "MapHeight", "NumBuildings",
+                                     "NumSurvivors", "useRRTStar", "Approach", "TimeTaken"]
+    assert uav_long.uav_names(one) == ["UAV1", "UAV2", "UAV3", "UAV4"]
+    assert one.TimeTaken.notna().all() and len(one) == 4
+
+
+def test_fleet_axes_widen_the_table():
+    jobs = [{**{k: v[0] for k, v in GRID.items()}, "NumGround": g, "NumAerial": 1}
+            for g in (1, 4)]
+    df   = simulate_batch(jobs)
+    assert uav_long.uav_names(df)[-1] == "UAV5"
+    assert df.UAV5dist.isna().tolist() == [True, False]
+    long = uav_long.to_long(df.assign(Planner="RRT"))
+    assert long.groupby("Row").Kind.apply(list).tolist() == \
+           [["ground", "aerial"], ["ground"] * 4 + ["aerial"]]
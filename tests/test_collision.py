@@ -0,0 +1,47 @@
+"""Batched, table and scalar segment tests must agree cell for cell."""
+
+import numpy as np
+import pytest
+
+from uavsim import collision
+from uavsim.collision import segments_collide, segment_collides
+
+
+def _segments(env, rng, n, reach):
+    p1 = rng.random((n, 3)) * [env.width, env.height, env.depth]
+    p2 = p1 + rng.normal(scale=reach, size=(n, 3))
+    return p1, p2
+
+
+@pytest.mark.parametrize("reach", [3.0, 30.0, 200.0])
+@pytest.mark.parametrize("kernel", ["walk", "table", "scalar"])
+def test_kernels_match_scalar(env, rng, monkeypatch, reach, kernel):
+    p1, p2 = _segments(env, rng, 400, reach)
+    expect = np.array([segment_collides(env, a, b) for a, b in zip(p1, p2)])
+    if kernel == "walk":
+        monkeypatch.setattr(collision, "TABLE_CELLS", 0)
+    elif kernel == "table":
+        monkeypatch.setattr(collision, "TABLE_CELLS", 10 ** 9)
+    else:
+        monkeypatch.setattr(collision, "SCALAR_MAX", 10 ** 9)
+    np.testing.assert_array_equal(segments_collide(env, p1, p2), expect)
+
+
+def test_ground_segments(env, rng):
+    free = np.argwhere(env.top == 0)[:, ::-1] + 0.5
+    a, b = free[rng.integers(len(free), size=(2, 200))]
+    got = segments_collide(env, a, b)
+    np.testing.assert_array_equal(got, [segment_collides(env, p, q) for p, q in zip(a, b)])
+
+
+def test_ground_plane_round_off_is_free(env):
+    x, y = np.argwhere(env.top == 0)[0][::-1] + 0.5
+    a, b = np.array([[x, y, -2e-16]]), np.array([[x, y, 10.0]])
+    assert not segments_collide(env, a, b)[0]
+    assert not segment_collides(env, a[0], b[0])
+    assert segments_collide(env, a - [0, 0, 1e-3], b)[0]     # really below ground
+
+
+def test_outside_map_collides(env):
+    assert segment_collides(env, (-1, 5, 5), (5, 5, 5))
+    assert segment_collides(env, (5, 5, 5), (5, 5, env.depth))
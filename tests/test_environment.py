@@ -0,0 +1,36 @@
+"""Height-field environment: occupancy conventions and caching."""
+
+import numpy as np
+
+from uavsim import Environment, cached_environment, config, create_environment
+
+
+def test_voxels_match_occupied3d(env, rng):
+    vox = env.voxels(packed=False)
+    pts = rng.random((2000, 3)) * [env.width, env.height, env.depth]
+    c   = pts.astype(int)
+    np.testing.assert_array_equal(env.occupied3d(pts), vox[c[:, 1], c[:, 0], c[:, 2]])
+
+
+def test_ground_map_and_survivors(env):
+    np.testing.assert_array_equal(env.ground_map(), env.top > 0)
+    assert not env.occupied2d(env.survivors[:, :2]).any()
+
+
+def test_ground_plane_round_off(env):
+    x, y = np.argwhere(env.top == 0)[0][::-1] + 0.5
+    assert not env.occupied3d([x, y, -2e-16])
+    assert env.occupied3d([x, y, -1e-3])
+    assert env.occupied3d([-0.5, y, 1.0])
+
+
+def test_cache_and_round_trip(cfg, env, tmp_path):
+    assert cached_environment(cfg) is env
+    again = create_environment(cfg)
+    assert again.digest() == env.digest()
+    env.save(tmp_path / "env.npz")
+    loaded = Environment.load(tmp_path / "env.npz")
+    assert loaded.digest() == env.digest()
+    np.testing.assert_array_equal(loaded.survivors, env.survivors)
+    assert create_environment(config(mapWidth=120, mapHeight=120, numBuildings=13)).digest() \
+        != env.digest()
@@ -0,0 +1,99 @@
+"""Fleets other than 2 + 2: UAV columns and vehicle kinds come from the frame."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import exp_stats
+import stats_state
+import sweep
+import uav_long
+from group_stats import FACTORS
+from streaming import PlotAccumulator
+
+
+def _runs(n_ground, n_aerial, rows, seed):
+    """Wide result rows of a NumGround + NumAerial fleet."""
+    rng = np.random.default_rng(seed)
+    n   = n_ground + n_aerial
+    df  = pd.DataFrame({"Seed": rng.integers(1, 4, rows),
+                        "MapWidth": rng.choice([300, 500], rows),
+                        "NumBuildings": 30, "NumSurvivors": 15,
+                        "useRRTStar": rng.integers(0, 2, rows),
+                        "Approach": rng.choice(["nearest", "centroid"], rows),
+                        "NumGround": n_ground, "NumAerial": n_aerial,
+                        "TimeTaken": rng.gamma(4.0, 50.0, rows).round(1)})
+    for i in range(1, n + 1):
+        df[f"UAV{i}resc"] = rng.integers(0, 5, rows).astype(float)
+    for i in range(1, n + 1):
+        df[f"UAV{i}dist"] = rng.gamma(3.0, 300.0, rows).round(1)
+    df["FractionRescued"] = rng.random(rows).round(2)
+    df["Planner"]  = df.useRRTStar.map({0: "RRT", 1: "RRT*"})
+    df["Scenario"] = df.MapWidth.astype(str)
+    return df
+
+
+@pytest.fixture
+def mixed():
+    return pd.concat([_runs(2, 2, 40, 0), _runs(5, 3, 40, 1)], ignore_index=True)
+
+
+def test_to_long_kinds_follow_num_ground(mixed):
+    long = uav_long.to_long(mixed)
+    assert len(long) == 40 * 4 + 40 * 8                 # absent UAV5..8 dropped
+    small, big = long[long.Row < 40], long[long.Row >= 40]
+    assert set(small[small.Kind == "aerial"].UAV) == {"UAV3", "UAV4"}
+    assert set(big[big.Kind == "ground"].UAV) == {f"UAV{i}" for i in range(1, 6)}
+    assert set(big[big.Kind == "aerial"].UAV) == {"UAV6", "UAV7", "UAV8"}
+
+
+def test_default_fleet_without_num_ground():
+    df = _runs(2, 2, 5, 0).drop(columns=["NumGround", "NumAerial"])
+    kinds = uav_long.to_long(df).groupby("UAV", observed=True).Kind.first()
+    assert list(kinds) == ["ground", "ground", "aerial", "aerial"]
+
+
+def test_stats_state_merges_fleet_sizes(mixed):
+    a, b = mixed.iloc[:40], mixed.iloc[40:].reset_index(drop=True)
+    merged = stats_state.StatsState.from_frame(a).merge(stats_state.StatsState.from_frame(b))
+    full   = stats_state.StatsState.from_frame(mixed)
+    assert merged.cells.values == full.cells.values
+    assert full.cells.values[-1] == "UAV8dist"
+    pd.testing.assert_frame_equal(exp_stats.cv_from_cells(merged.cells),
+                                  exp_stats.cv_from_cells(full.cells))
+    assert len(exp_stats.cv_from_cells(full.cells)) == 8
+    for f in FACTORS:
+        pd.testing.assert_frame_equal(merged.one_way(f), full.one_way(f))
+
+
+def test_stream_boxes_split_by_kind(mixed):
+    acc = PlotAccumulator().add(mixed.iloc[:50]).add(mixed.iloc[50:])
+    long = uav_long.to_long(mixed)
+    for kind in ("ground", "aerial"):
+        sub    = long[long.Kind == kind]
+        labels = uav_long.group_arrays(sub, ["Planner", "Approach", "UAV"])
+        assert [s["label"] for s in acc.box(kind)] == list(labels)
+    assert list(acc.heat_means().columns) == uav_long.uav_cols(mixed)
+
+
+def test_sweep_keeps_every_vehicle(tmp_path, monkeypatch):
+    def backend(job):
+        n = job["NumGround"] + job["NumAerial"]
+        return {"TimeTaken": float(n),
+                **{f"UAV{i}resc": 1.0 for i in range(1, n + 1)},
+                **{f"UAV{i}dist": float(i) for i in range(1, n + 1)}}
+    monkeypatch.setitem(sweep.BACKENDS, "fleet", backend)
+    grid = sweep.parse_grid(["Seed=1", "MapWidth=300", "NumBuildings=30",
+                             "NumSurvivors=15", "useRRTStar=0", "Approach=nearest",
+                             "NumGround=2,8", "NumAerial=2,3"])
+    jobs = sweep.expand_grid(grid)
+    sweep.run_sweep(jobs, "fleet", workers=1, shards=2, out_dir=tmp_path)
+    sweep.merge_shards(tmp_path, tmp_path / "out.csv", tmp_path / "veh.csv")
+
+    wide = pd.read_csv(tmp_path / "out.csv")
+    assert uav_long.uav_names(wide)[-1] == "UAV11"
+    assert wide.UAV11dist.notna().sum() == 1            # only the 8 + 3 run
+    long = uav_long.to_long(wide.assign(Planner="RRT"))
+    assert len(long) == 4 + 5 + 10 + 11
+    big  = long[long.Row == wide.index[(wide.NumGround == 8) & (wide.NumAerial == 3)][0]]
+    assert list(big.Kind) == ["ground"] * 8 + ["aerial"] * 3
@@ -0,0 +1,84 @@
+"""Jump Point Search vs a plain 8-connected Dijkstra on random grids."""
+
+import heapq
+import math
+
+import numpy as np
+import pytest
+
+from uavsim import JumpGrid, config, path_collides, plan_jps
+
+SQRT2 = math.sqrt(2.0)
+
+
+def _dijkstra(blocked, start, goal):
+    """Optimal octile cost, no corner cutting; inf if unreachable."""
+    H, W = blocked.shape
+    free = lambda x, y: 0 <= x < W and 0 <= y < H and not blocked[y, x]
+    best, heap = {start: 0.0}, [(0.0, start)]
+    while heap:
+        d, (x, y) = heapq.heappop(heap)
+        if (x, y) == goal:
+            return d
+        if d > best[(x, y)]:
+            continue
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if (dx, dy) == (0, 0) or not free(x + dx, y + dy):
+                    continue
+                if dx and dy and not (free(x + dx, y) and free(x, y + dy)):
+                    continue
+                nd = d + (SQRT2 if dx and dy else 1.0)
+                if nd < best.get((x + dx, y + dy), math.inf):
+                    best[(x + dx, y + dy)] = nd
+                    heapq.heappush(heap, (nd, (x + dx, y + dy)))
+    return math.inf
+
+
+def _legs_cost(blocked, cells):
+    """Octile length of the jump-point chain; every leg checked cell by cell."""
+    total = 0.0
+    for (x0, y0), (x1, y1) in zip(cells[:-1], cells[1:]):
+        dx, dy = np.sign(x1 - x0), np.sign(y1 - y0)
+        n = max(abs(x1 - x0), abs(y1 - y0))
+        assert (x1 - x0, y1 - y0) == (dx * n, dy * n)       # straight or diagonal
+        for k in range(n):
+            x, y = x0 + k * dx, y0 + k * dy
+            assert not blocked[y + dy, x + dx]
+            if dx and dy:
+                assert not blocked[y, x + dx] and not blocked[y + dy, x]
+        total += n * (SQRT2 if dx and dy else 1.0)
+    return total
+
+
+@pytest.mark.parametrize("density", [0.1, 0.25, 0.4])
+def test_jps_cost_equals_dijkstra(density):
+    rng = np.random.default_rng(int(density * 100))
+    for _ in range(15):
+        blocked = rng.random((24, 31)) < density
+        free    = np.argwhere(~blocked)[:, ::-1]
+        s, g    = (tuple(int(v) for v in free[i])
+                   for i in rng.choice(len(free), 2, replace=False))
+        want  = _dijkstra(blocked, s, g)
+        cells = JumpGrid(blocked).search(s, g)
+        if math.isinf(want):
+            assert cells is None
+            continue
+        assert cells[0] == s and cells[-1] == g
+        assert _legs_cost(blocked, cells) == pytest.approx(want)
+
+
+def test_plan_jps_free_on_environment(env):
+    cfg  = config(mapWidth=120, mapHeight=120)
+    rng  = np.random.default_rng(0)
+    free = np.argwhere(env.top == 0)[:, ::-1]
+    done = 0
+    for _ in range(10):
+        s, g = free[rng.choice(len(free), 2)] + rng.random((2, 2))
+        path = plan_jps([*s, 0], [*g, 0], env, cfg, mode="2D")
+        if path is None:
+            continue
+        assert np.array_equal(path[0, :2], s) and np.array_equal(path[-1, :2], g)
+        assert not path_collides(env, path)
+        done += 1
+    assert done
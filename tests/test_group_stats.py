@@ -0,0 +1,74 @@
+"""CellMoments-backed tables vs the original per-factor pandas groupbys."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import exp_stats
+from conftest import ROOT
+from group_stats import FACTORS, CellMoments, describe_all
+
+
+def _one_way_pandas(df, factor, value_col="TimeTaken"):
+    """exp_stats.one_way_descriptive before the one-pass rewrite."""
+    g    = df.groupby(factor)[value_col]
+    n, mean, std = g.count(), g.mean(), g.std(ddof=1)
+    ci95 = 1.96 * std / np.sqrt(n)
+    return pd.DataFrame({factor: n.index, "N": n.values, "Mean": mean.values,
+                         "StdDev": std.values, "Variance": g.var(ddof=1).values,
+                         "CI95_Lower": (mean - ci95).values,
+                         "CI95_Upper": (mean + ci95).values})
+
+
+@pytest.fixture(scope="module")
+def df():
+    return exp_stats.read_data(ROOT / "experiment_results.csv", use_store=False)
+
+
+@pytest.fixture(scope="module")
+def noisy():
+    """Unbalanced, NaN-holed and far from zero (variance conditioning)."""
+    rng = np.random.default_rng(0)
+    n   = 5000
+    out = pd.DataFrame({"MapWidth": rng.choice([300, 500, 700], n),
+                        "NumBuildings": rng.choice([30, 60], n, p=[0.9, 0.1]),
+                        "NumSurvivors": 15,
+                        "useRRTStar": rng.random(n) < 0.3,
+                        "Approach": rng.choice(["nearest", "centroid", "kmeans"], n),
+                        "TimeTaken": 1e9 + rng.normal(0, 3, n)})
+    out.loc[rng.random(n) < 0.05, "TimeTaken"] = np.nan
+    return out
+
+
+@pytest.mark.parametrize("frame", ["df", "noisy"])
+def test_one_way_matches_pandas(frame, request):
+    data = request.getfixturevalue(frame)
+    for f, tbl in exp_stats.one_way_descriptive(data, FACTORS).items():
+        # 1e9 ± 3 s: both sides carry ~1e-9 relative round-off in the variance
+        pd.testing.assert_frame_equal(tbl, _one_way_pandas(data, f), check_dtype=False,
+                                      check_exact=False, rtol=1e-7)
+
+
+def test_two_way_and_cv_match_pandas(df):
+    g    = df.groupby(["useRRTStar", "Approach"])["TimeTaken"]
+    text = (g.mean().round(2).astype(str) + " ± " + g.std(ddof=1).round(2).astype(str))
+    want = text.unstack()
+    want.index = ["RRT*" if b else "RRT" for b in want.index]
+    got  = exp_stats.two_way_table(df).set_index("useRRTStar")
+    assert got.to_dict() == want.to_dict()
+
+    cv = exp_stats.cv_table(df).set_index("UAV")
+    for u in ["UAV1", "UAV2", "UAV3", "UAV4"]:
+        col = df[f"{u}dist"]
+        assert cv.loc[u, "MeanDist"] == pytest.approx(col.mean())
+        assert cv.loc[u, "StdDist"] == pytest.approx(col.std(ddof=1))
+
+
+def test_rollups_equal_direct_cells(noisy):
+    cells = CellMoments.from_frame(noisy, FACTORS, ["TimeTaken"])
+    for by in (["MapWidth", "Approach"], ["useRRTStar"]):
+        direct = CellMoments.from_frame(noisy, by, ["TimeTaken"]).describe()
+        pd.testing.assert_frame_equal(cells.rollup(by).describe(), direct,
+                                      check_exact=False, rtol=1e-7)
+    out = describe_all(noisy, ["Approach"], combos=[("MapWidth", "NumBuildings")])
+    assert set(out["TimeTaken"]) == {"Approach", ("MapWidth", "NumBuildings")}
@@ -0,0 +1,47 @@
+"""Hierarchical planner: same reachability as full-map JPS, valid 3-D routes."""
+
+import numpy as np
+import pytest
+
+from uavsim import (config, cached_environment, path_collides, path_length,
+                    plan_hierarchical, plan_jps)
+
+
+@pytest.fixture(scope="module")
+def big():
+    cfg = config(mapWidth=400, mapHeight=400, numBuildings=150)
+    return cfg, cached_environment(cfg)
+
+
+def _ground_pairs(env, n, seed):
+    rng  = np.random.default_rng(seed)
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    pts  = free[rng.integers(len(free), size=(n, 2))] + rng.random((n, 2, 2))
+    return np.concatenate([pts, np.zeros((n, 2, 1))], axis=2)
+
+
+def test_matches_jps_reachability(big):
+    cfg, env = big
+    for s, g in _ground_pairs(env, 25, 1):
+        ref = plan_jps(s, g, env, cfg)
+        got = plan_hierarchical(s, g, env, cfg)
+        assert (got is None) == (ref is None)
+        if got is not None:
+            assert not path_collides(env, got)
+            assert np.array_equal(got[0, :2], s[:2]) and np.array_equal(got[-1, :2], g[:2])
+            assert path_length(got) <= 1.6 * path_length(ref)
+
+
+def test_drone_route_stays_off_the_ground(big):
+    cfg, env = big
+    done = 0
+    for s, g in _ground_pairs(env, 10, 2):
+        if plan_jps(s, g, env, cfg) is None:
+            continue
+        s[2] = 45.0
+        path = plan_hierarchical(s, g, env, cfg, mode="3D")
+        assert path is not None and not path_collides(env, path)
+        assert np.array_equal(path[0], s) and np.array_equal(path[-1], g)
+        assert (path[1:-1, 2] == 45.0).all()
+        done += 1
+    assert done
@@ -0,0 +1,47 @@
+"""plan_layered: free routes with exact end points, RRT only as a fallback."""
+
+import numpy as np
+import pytest
+
+from uavsim import config, path_collides, plan_layered
+from uavsim import layered
+from uavsim.layered import CRUISE_MARGIN_M, ceiling_for, leg_ceiling
+
+
+def _pairs(env, rng, n, z):
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    pts  = free[rng.integers(len(free), size=(n, 2))] + rng.random((n, 2, 2))
+    return np.concatenate([pts, np.full((n, 2, 1), z)], axis=2)
+
+
+def test_routes_free_and_anchored(env, monkeypatch):
+    monkeypatch.setattr(layered, "plan_rrt", lambda *a, **k: pytest.fail("fell back to RRT"))
+    cfg = config(mapWidth=120, mapHeight=120)
+    for s, g in _pairs(env, np.random.default_rng(0), 20, 2.0):
+        path = plan_layered(s, g, env, cfg)
+        assert np.array_equal(path[0], s) and np.array_equal(path[-1], g)
+        assert not path_collides(env, path)
+        if len(path) > 2:                     # climbed: level leg above the roofs
+            assert path[1, 2] == path[2, 2] >= leg_ceiling(env, s, g) + CRUISE_MARGIN_M
+
+
+def test_straight_line_when_free(env):
+    cfg = config(mapWidth=120, mapHeight=120)
+    top = float(ceiling_for(env).max()) + 1.0
+    s, g = np.array([5.0, 5.0, top]), np.array([110.0, 100.0, top])
+    assert plan_layered(s, g, env, cfg).tolist() == [s.tolist(), g.tolist()]
+
+
+def test_falls_back_to_rrt_when_no_route_fits(env, monkeypatch):
+    cfg = config(mapWidth=120, mapHeight=120)
+    s, g = _pairs(env, np.random.default_rng(1), 1, 2.0)[0]
+    calls = []
+    monkeypatch.setattr(layered, "segments_collide",           # every candidate blocked
+                        lambda env, a, b: np.ones(len(a), dtype=bool))
+    monkeypatch.setattr(layered, "plan_rrt", lambda *a, **k: calls.append(a) or "rrt")
+    assert plan_layered(s, g, env, cfg) == "rrt" and len(calls) == 1
+
+
+def test_ground_mode_rejected(env):
+    with pytest.raises(ValueError):
+        plan_layered([1, 1, 0], [5, 5, 0], env, config(), mode="2D")
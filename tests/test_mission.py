@@ -0,0 +1,40 @@
+"""Event-driven kernel vs the fixed-step reference, across approaches and planners."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from uavsim import config, run_rescue_mission
+from uavsim.mission import MAX_SIM_TIME, MISSION_FLEET
+
+APPROACHES = ["nearest", "centroid", "kmeans", "hungarian"]
+PLANNERS   = [("rrt", "rrt"), ("jps", "layered"), ("hier", "hier"), ("roadmap", "roadmap")]
+
+
+def _cfg(approach, planners, **kw):
+    ground, aerial = planners
+    return config(numBuildings=30, numSurvivors=15, groundPlanner=ground,
+                  aerialPlanner=aerial, centroidApproach=approach == "centroid",
+                  kmeansApproach=approach == "kmeans",
+                  hungarianApproach=approach == "hungarian", **{**MISSION_FLEET, **kw})
+
+
+@pytest.mark.parametrize("planners", PLANNERS, ids="/".join)
+@pytest.mark.parametrize("approach", APPROACHES)
+def test_kernels_agree(approach, planners):
+    cfg = _cfg(approach, planners)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ev = run_rescue_mission(cfg, seed=1, kernel="event")
+        fx = run_rescue_mission(cfg, seed=1, kernel="fixed")
+    assert ev[0] == fx[0] and ev[1] == fx[1]
+    np.testing.assert_allclose(ev[2], fx[2], atol=1e-6)
+
+
+def test_hungarian_does_not_starve():
+    # a failed plan must not hand the same pair back on every later tick
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        t, counts, _ = run_rescue_mission(_cfg("hungarian", ("rrt", "rrt")), seed=1)
+    assert t < MAX_SIM_TIME and sum(counts) == 15
@@ -0,0 +1,76 @@
+"""PathCache keys, hit validation, tiers and the planner tag."""
+
+import numpy as np
+
+from uavsim import PathCache, cached_environment, config, plan_jps
+from uavsim.path_cache import planner_tag
+
+
+def test_tag_separates_planners_and_budgets():
+    base = config()
+    tags = {planner_tag(base, "2D"), planner_tag(base, "3D"),
+            planner_tag(config(groundPlanner="jps"), "2D"),
+            planner_tag(config(groundClearance=2), "2D"),
+            planner_tag(config(useRRTStar=True), "2D"),
+            planner_tag(config(useRRTStar=True, rrtStarIterations=50), "2D"),
+            planner_tag(config(rrtTimeBudget=0.5), "2D"),
+            planner_tag(config(rrtMaxIterations=500), "2D")}
+    assert len(tags) == 8
+    # settings a planner ignores do not split the cache
+    assert planner_tag(config(rrtStarIterations=50), "2D") == planner_tag(base, "2D")
+    assert planner_tag(config(groundPlanner="jps"), "3D") == planner_tag(base, "3D")
+
+
+def _counting(planner):
+    def plan(*args, **kw):
+        plan.calls += 1
+        return planner(*args, **kw)
+    plan.calls = 0
+    return plan
+
+
+def _free_pair(env):
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    return (np.array([*free[0] + 0.25, 0.0]), np.array([*free[-1] + 0.25, 0.0]))
+
+
+def test_hit_keeps_exact_endpoints(env, cfg):
+    cache = PathCache()
+    inner = _counting(plan_jps)
+    plan  = cache.wrap(inner)
+    s, g  = _free_pair(env)
+    first = plan(s, g, env, cfg, mode="2D")
+    again = plan(s + [0.5, 0.5, 0], g - [0.2, 0.1, 0], env, cfg, mode="2D")  # same cells
+    assert inner.calls == 1 and cache.stats()["hits"] == 1
+    assert np.array_equal(again[0, :2], (s + [0.5, 0.5, 0])[:2])
+    assert np.array_equal(again[-1, :2], (g - [0.2, 0.1, 0])[:2])
+    assert len(again) == len(first)
+
+    other = cached_environment(config(mapWidth=120, mapHeight=120, numBuildings=5))
+    assert cache.get(s, g, other, planner_tag(cfg, "2D")) is None      # env digest
+
+
+def test_colliding_hit_is_rejected(env, cfg):
+    cache = PathCache()
+    tag   = planner_tag(cfg, "2D")
+    s, g  = _free_pair(env)
+    roof  = np.argwhere(env.top > 0)[0][::-1] + 0.5
+    cache.put(s, g, env, tag, np.array([s, [*roof, 0.0], g]))
+    assert cache.get(s, g, env, tag) is None
+    assert cache.stats()["rejected"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_disk_tier_and_bounds(env, cfg, tmp_path):
+    tag  = planner_tag(cfg, "2D")
+    s, g = _free_pair(env)
+    path = plan_jps(s, g, env, cfg, mode="2D")
+    PathCache(tmp_path).put(s, g, env, tag, path)
+    fresh = PathCache(tmp_path)
+    assert fresh.get(s, g, env, tag) is not None and fresh.stats()["hits"] == 1
+
+    small = PathCache(max_entries=3)
+    for k in range(5):
+        small.put(s, g + [0, -k, 0], env, tag, path)
+    assert small.stats()["entries"] == 3
+    assert small.get(s, g, env, tag) is None            # oldest went first
+    assert small.get(s, g + [0, -4, 0], env, tag) is not None
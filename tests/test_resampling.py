@@ -0,0 +1,56 @@
+"""Vectorized bootstrap / permutation engine vs scipy.stats and loops."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+import resampling
+from resampling import _median_loo, bootstrap_ci, bootstrap_distribution, permutation_test
+
+
+@pytest.fixture(scope="module")
+def skewed():
+    return np.minimum(np.random.default_rng(0).gamma(1.5, 120.0, 150), 600.0)
+
+
+@pytest.mark.parametrize("n", [5, 6, 41])
+def test_median_loo_matches_loop(n):
+    x = np.random.default_rng(n).integers(0, 10, n).astype(float)   # with ties
+    want = [np.median(np.delete(x, i)) for i in range(n)]
+    np.testing.assert_allclose(_median_loo(x), want)
+
+
+@pytest.mark.parametrize("stat", ["mean", "median"])
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_ci_close_to_scipy(skewed, stat, method):
+    lo, hi = bootstrap_ci(skewed, stat, method, n_resamples=20_000)
+    ref = stats.bootstrap((skewed,), getattr(np, stat), method=method,
+                          n_resamples=20_000, random_state=1).confidence_interval
+    # different random streams: agree to a few per cent of the width
+    tol = 0.05 * (ref.high - ref.low)
+    assert abs(lo - ref.low) < tol and abs(hi - ref.high) < tol
+
+
+def test_shards_and_workers_do_not_change_results(skewed, monkeypatch):
+    monkeypatch.setattr(resampling, "MAX_CELLS", 150 * 300)      # several shards
+    one = bootstrap_distribution(skewed, n_resamples=1000, seed=3)
+    two = bootstrap_distribution(skewed, n_resamples=1000, seed=3, workers=2)
+    assert len(one) == 1000 and np.array_equal(one, two)
+    assert bootstrap_ci(skewed, seed=3) == bootstrap_ci(skewed, seed=3)
+
+
+def test_nan_and_tiny_samples():
+    assert np.isnan(bootstrap_ci([np.nan, 1.0])).all()
+    lo, hi = bootstrap_ci([2.0, 2.0, 2.0, np.nan], method="bca")
+    assert lo == hi == 2.0
+
+
+@pytest.mark.parametrize("shift", [0.0, 15.0, 60.0])
+def test_permutation_p_close_to_scipy(skewed, shift):
+    a, b = skewed[:70] + shift, skewed[70:]
+    p    = permutation_test(a, b, n_resamples=20_000)
+    ref  = stats.permutation_test((a, b), lambda x, y: x.mean() - y.mean(),
+                                  n_resamples=20_000, random_state=1,
+                                  vectorized=False).pvalue
+    assert abs(p - ref) < 0.02
+    assert 1 / 20_001 <= p <= 1.0
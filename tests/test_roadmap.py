@@ -0,0 +1,48 @@
+"""plan_many: one search per start, consistent with single-goal planning."""
+
+import numpy as np
+import pytest
+
+from uavsim import path_collides, path_length, plan_many, plan_roadmap, roadmap
+from uavsim.roadmap import roadmap_for
+
+
+def _free(env, rng, n, z):
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    pts  = free[rng.integers(len(free), size=n)] + rng.random((n, 2))
+    return np.column_stack([pts, np.full(n, z)])
+
+
+@pytest.mark.parametrize("mode,z", [("2D", 0.0), ("3D", 30.0)])
+def test_many_goals_match_single_queries(env, mode, z):
+    rng   = np.random.default_rng(4)
+    start = _free(env, rng, 1, z)[0]
+    goals = _free(env, rng, 8, z)
+    costs, paths = plan_many(start, goals, env, mode=mode)
+    assert np.isfinite(costs).sum() >= 6
+    for goal, cost, path in zip(goals, costs, paths):
+        single = plan_roadmap(start, goal, env, mode=mode)
+        if path is None:
+            assert single is None and np.isinf(cost)
+            continue
+        assert np.array_equal(path[0], start) and np.array_equal(path[-1], goal)
+        assert path_length(path) == pytest.approx(cost)
+        assert path_length(single) == pytest.approx(cost)
+        assert not path_collides(env, path)
+
+
+def test_goal_inside_building_is_unreachable(env):
+    rng   = np.random.default_rng(1)
+    start = _free(env, rng, 1, 0.0)[0]
+    inner = np.argwhere(env.top > 0)
+    roof  = inner[len(inner) // 2][::-1] + 0.5
+    costs, paths = plan_many(start, [[*roof, 0.0]], env, mode="2D")
+    assert np.isinf(costs[0]) and paths[0] is None
+
+
+def test_roadmaps_shared_and_bounded(env, monkeypatch):
+    assert roadmap_for(env, "2D") is roadmap_for(env, "2D")
+    assert roadmap_for(env, "2D") is not roadmap_for(env, "3D")
+    monkeypatch.setattr(roadmap, "ROADMAP_CACHE", 1)
+    roadmap_for(env, "2D", n_nodes=50)
+    assert len(roadmap._ROADMAPS) == 1
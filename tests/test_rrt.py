@@ -0,0 +1,74 @@
+"""NodeIndex vs brute force; RRT / RRT* paths, tree costs and budgets."""
+
+import time
+
+import numpy as np
+import pytest
+
+from uavsim import RRT, config, path_collides, path_length, plan_rrt
+from uavsim.rrt import NodeIndex, Tree
+
+
+def _free_pairs(env, rng, n, z=0.0):
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    pts  = free[rng.integers(len(free), size=(n, 2))] + 0.5
+    return np.concatenate([pts, np.full((n, 2, 1), z)], axis=2)
+
+
+def test_node_index_matches_brute_force():
+    rng  = np.random.default_rng(1)
+    tree = Tree(rng.random(3) * 100, 16)
+    idx  = NodeIndex(tree)
+    for k in range(600):
+        tree.add(rng.random(3) * 100, 0, 0.0)
+        if k % 7:
+            continue
+        q = rng.random(3) * 100
+        d = np.linalg.norm(tree.pos[:tree.n] - q, axis=1)
+        i, dist = idx.nearest(q)
+        assert dist == pytest.approx(d.min()) and d[i] == pytest.approx(d.min())
+        assert sorted(idx.near(q, 20.0).tolist()) == np.flatnonzero(d <= 20.0).tolist()
+    assert idx.split > 0                       # the KD-tree part was exercised
+
+
+@pytest.mark.parametrize("star", [False, True])
+@pytest.mark.parametrize("mode,z", [("2D", 0.0), ("3D", 40.0)])
+def test_paths_free_and_anchored(env, mode, z, star):
+    cfg  = config(mapWidth=120, mapHeight=120, rrtMaxIterations=4000,
+                  rrtStarIterations=200)
+    rng  = np.random.default_rng(5)
+    done = 0
+    for k, (s, g) in enumerate(_free_pairs(env, rng, 6, z)):
+        path = plan_rrt(s, g, env, cfg, mode, star=star, rng=np.random.default_rng(k))
+        if path is None:
+            continue
+        assert path.shape[1] == 3 and np.array_equal(path[0], s)
+        assert np.linalg.norm(path[-1] - g) < 5.0 + 1e-9
+        assert not path_collides(env, path)
+        done += 1
+    assert done
+
+
+def test_star_tree_costs_consistent(env):
+    cfg = config(mapWidth=120, mapHeight=120, rrtStarIterations=400)
+    s, g = _free_pairs(env, np.random.default_rng(2), 1)[0]
+    rrt = RRT(s, env, cfg, "2D", star=True, rng=np.random.default_rng(0))
+    first = rrt.plan(g)
+    assert first is not None
+    t = rrt.tree
+    edge = np.linalg.norm(t.pos[1:t.n] - t.pos[t.parent[1:t.n]], axis=1)
+    np.testing.assert_allclose(t.cost[1:t.n], t.cost[t.parent[1:t.n]] + edge, atol=1e-6)
+    for i, kids in enumerate(rrt._children):
+        assert all(t.parent[c] == i for c in kids)
+
+    again = rrt.plan(g)                        # anytime: never worse
+    assert path_length(again) <= path_length(first) + 1e-9
+
+
+def test_time_budget_is_a_hard_stop(env):
+    cfg = config(mapWidth=120, mapHeight=120, rrtMaxIterations=10**6,
+                 rrtStarIterations=10**6, rrtTimeBudget=0.2)
+    s, g = _free_pairs(env, np.random.default_rng(3), 1)[0]
+    t0 = time.perf_counter()
+    plan_rrt(s, g, env, cfg, "2D", star=True, rng=np.random.default_rng(0))
+    assert time.perf_counter() - t0 < 2.0
@@ -0,0 +1,43 @@
+"""smooth_path: exact endpoints, collision-free edges, never longer."""
+
+import numpy as np
+import pytest
+
+from uavsim import config, path_collides, path_length, plan_hierarchical, plan_rrt
+from uavsim.smoothing import _dedupe, smooth_path
+
+
+def _pairs(env, rng, n, start_z):
+    free = np.argwhere(env.top == 0)[:, ::-1].astype(float)
+    pts  = free[rng.integers(len(free), size=(n, 2))] + rng.random((n, 2, 2))
+    out  = np.concatenate([pts, np.zeros((n, 2, 1))], axis=2)
+    out[:, 0, 2] = start_z
+    return out
+
+
+@pytest.mark.parametrize("spline", [False, True])
+@pytest.mark.parametrize("planner,mode,start_z", [
+    (plan_rrt, "2D", 0.0), (plan_rrt, "3D", 40.0), (plan_hierarchical, "3D", 40.0)])
+def test_endpoints_exact(env, planner, mode, start_z, spline):
+    cfg = config(pathSpline=spline, splineSpacing=5)
+    rng = np.random.default_rng(7)
+    done = 0
+    for k, (s, g) in enumerate(_pairs(env, rng, 12, start_z)):
+        path = planner(s, g, env, cfg, mode=mode, rng=np.random.default_rng(k))
+        if path is None:
+            continue
+        q, before, after = smooth_path(path, env, cfg, np.random.default_rng(k))
+        assert np.array_equal(q[0], path[0]) and np.array_equal(q[-1], path[-1])
+        assert q[-1][2] == g[2] if mode == "3D" else q[-1][2] == 0.0
+        assert not path_collides(env, q)
+        assert after <= before + 1e-9 and after == pytest.approx(path_length(q))
+        done += 1
+    assert done
+
+
+def test_dedupe_keeps_goal():
+    goal = np.array([5.0, 5.0, 0.0])
+    path = np.array([[0.0, 0.0, 0.0], [2.0, 1.0, 0.0], goal + [0, 0, -2e-16], goal])
+    out  = _dedupe(path)
+    assert np.array_equal(out[-1], goal) and len(out) == 3
+    assert np.array_equal(_dedupe(path[[0, 0, 1, 3]]), path[[0, 1, 3]])
@@ -0,0 +1,84 @@
+"""StatsState shard merges and --append against a full pass over the rows."""
+
+import functools
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import build_cache
+import exp_stats
+from conftest import ROOT
+from group_stats import FACTORS
+from stats_state import TIE_KEY, StatsState
+
+CSV = ROOT / "experiment_results.csv"
+
+
+@pytest.fixture(scope="module")
+def df():
+    return exp_stats.read_data(CSV, use_store=False)
+
+
+def _tables(state):
+    return {"cv": exp_stats.cv_from_cells(state.cells),
+            "px": exp_stats.two_way_from_cells(state.cells),
+            "reps": state.representative_runs().reset_index(drop=True),
+            **{f: state.one_way(f) for f in FACTORS}}
+
+
+@pytest.mark.parametrize("order", [(0, 1, 2), (2, 0, 1)])
+def test_shard_merge_equals_full_pass(df, order):
+    shards = [StatsState.from_frame(df.iloc[k::3]) for k in range(3)]
+    merged = shards[order[0]].merge(shards[order[1]]).merge(shards[order[2]])
+    full   = StatsState.from_frame(df)
+    assert merged.rows == full.rows == len(df)
+    want = _tables(full)
+    for name, got in _tables(merged).items():
+        pd.testing.assert_frame_equal(got, want[name], check_exact=False, rtol=1e-12)
+
+
+def test_representative_runs_match_sorted_rows(df):
+    srt  = df.sort_values(["TimeTaken"] + TIE_KEY, kind="mergesort").reset_index(drop=True)
+    t    = srt.TimeTaken.to_numpy()
+    # the row at each rank, or the smallest-key row sharing its TimeTaken
+    rows = [np.flatnonzero(t == t[r])[0] for r in (0, len(t) // 2, len(t) - 1)]
+    want = srt.iloc[rows].reset_index(drop=True)
+    got  = exp_stats.representative_runs(df).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, want)
+
+
+def test_group_quantiles_match_pandas(df):
+    got = StatsState.from_frame(df).group_quantiles("Approach")
+    for key, g in df.groupby("Approach"):
+        v = np.sort(g.TimeTaken.to_numpy())
+        assert list(got.loc[key]) == [v[0], v[(len(v) - 1) // 2], v[-1]]
+
+
+def _run(workdir, monkeypatch, argv):
+    (workdir / "Analysis").mkdir(parents=True, exist_ok=True)
+    monkeypatch.chdir(workdir)
+    monkeypatch.setattr(build_cache, "BuildCache",
+                        functools.partial(build_cache.BuildCache,
+                                          path=workdir / build_cache.CACHE_NAME))
+    exp_stats.main(argv)
+    return {p.name: pd.read_csv(p) for p in (workdir / "Analysis").glob("*.csv")}
+
+
+def test_append_seeded_from_csv_matches_full_pass(tmp_path, monkeypatch):
+    lines = CSV.read_text().splitlines(keepends=True)
+    part, full = tmp_path / "append", tmp_path / "full"
+    part.mkdir()
+    full.mkdir()
+    (part / "experiment_results.csv").write_text("".join(lines[:61]))
+    (part / "batch.csv").write_text(lines[0] + "".join(lines[61:]))
+    shutil.copy(CSV, full / "experiment_results.csv")
+
+    got  = _run(part, monkeypatch, ["--append", "batch.csv"])
+    want = _run(full, monkeypatch, [])
+    assert (part / "experiment_results.csv").read_text() == CSV.read_text()
+    assert got.keys() == want.keys()
+    for name in want:
+        pd.testing.assert_frame_equal(got[name], want[name], check_exact=False,
+                                      rtol=1e-9, atol=1e-3 if "anova" in name else 0)
@@ -0,0 +1,66 @@
+"""PlotAccumulator over chunks vs the in-memory figure inputs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import uav_long
+from streaming import BOX_BIN_M, PlotAccumulator, pareto_front
+
+
+@pytest.fixture
+def runs():
+    rng  = np.random.default_rng(3)
+    rows = 600
+    df   = pd.DataFrame({"Planner": rng.choice(["RRT", "RRT*"], rows),
+                         "Approach": rng.choice(["nearest", "centroid"], rows),
+                         "Scenario": rng.choice(["300_30", "500_60"], rows),
+                         "TimeTaken": rng.gamma(4.0, 50.0, rows).round(1),
+                         "FractionRescued": rng.integers(0, 16, rows) / 15})
+    for i in range(1, 5):
+        df[f"UAV{i}resc"] = rng.integers(0, 5, rows).astype(float)
+        df[f"UAV{i}dist"] = rng.gamma(3.0, 300.0, rows)
+    df.loc[::37, "UAV2dist"] = np.nan
+    return df
+
+
+def _chunks(df, size):
+    acc = PlotAccumulator()
+    for k in range(0, len(df), size):
+        acc.add(df.iloc[k:k + size])
+    return acc
+
+
+def test_bars_and_heat_exact(runs):
+    acc = _chunks(runs, 97)
+    for col in PlotAccumulator.BAR_COLS:
+        gb = runs.groupby(["Planner", "Approach"])[col]
+        mean, sem = acc.means_sems(col)
+        pd.testing.assert_frame_equal(mean, gb.mean().unstack(), check_names=False)
+        pd.testing.assert_frame_equal(sem, gb.sem().unstack() * 1.96, check_names=False)
+    heat = runs.groupby("Scenario")[uav_long.uav_cols(runs)].mean()
+    np.testing.assert_allclose(acc.heat_means().to_numpy(), heat.to_numpy())
+
+
+@pytest.mark.parametrize("kind", ["ground", "aerial"])
+def test_boxes_within_half_a_bin(runs, kind):
+    long = uav_long.to_long(runs)
+    data = uav_long.group_arrays(long[long.Kind == kind], ["Planner", "Approach", "UAV"])
+    for st in _chunks(runs, 97).box(kind):
+        v = data[st["label"]]
+        v = v[~np.isnan(v)]
+        q1, med, q3 = np.percentile(v, [25, 50, 75])
+        for got, want in ((st["q1"], q1), (st["med"], med), (st["q3"], q3)):
+            assert abs(got - want) <= BOX_BIN_M / 2 + 1e-9
+
+
+def test_pareto_is_the_bounded_frontier(runs):
+    acc   = _chunks(runs, 97)
+    front = pareto_front(runs[["TimeTaken", "FractionRescued"]])
+    pd.testing.assert_frame_equal(acc.pareto, front)
+    assert len(acc.pareto) <= runs.FractionRescued.nunique()
+    t, f = runs.TimeTaken.to_numpy(), runs.FractionRescued.to_numpy()
+    for tp, fp in acc.pareto.to_numpy():
+        assert not ((t <= tp) & (f >= fp) & ((t < tp) | (f > fp))).any()
+    assert np.all(np.diff(acc.pareto.TimeTaken) > 0)
+    assert np.all(np.diff(acc.pareto.FractionRescued) > 0)
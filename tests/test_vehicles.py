@@ -0,0 +1,77 @@
+"""Fleet.step vs per-vehicle moveStep; path-buffer compaction; fleet starts."""
+
+import numpy as np
+import pytest
+
+from uavsim import Fleet, config, make_fleet
+from uavsim.vehicles import DEFAULT_FLEET, PATH_CAPACITY
+
+
+def _move_step(pos, path, wp, speed, dt):
+    """BaseUAV.moveStep for one vehicle: (pos, wp, distance moved)."""
+    if wp >= len(path):
+        return pos, wp, 0.0
+    d_vec = path[wp] - pos
+    d     = float(np.linalg.norm(d_vec))
+    if speed * dt >= d:
+        return path[wp].copy(), wp + 1, d
+    return pos + speed * dt / d * d_vec, wp, speed * dt
+
+
+def test_step_matches_move_step_through_compactions():
+    rng   = np.random.default_rng(0)
+    n     = 12
+    fleet = Fleet([("ground" if k % 2 else "aerial", k + 1, rng.random(3) * 100,
+                    rng.uniform(2, 15)) for k in range(n)])
+    ref   = [[fleet.pos[k].copy(), np.empty((0, 3)), 0, 0.0] for k in range(n)]
+    for tick in range(400):
+        for k in rng.choice(n, size=2, replace=False):
+            if rng.random() < 0.3:                       # replan, as on reassignment
+                path = rng.random((rng.integers(1, 60), 3)) * 100
+                fleet.set_path(k, path)
+                ref[k][1], ref[k][2] = path, 0
+        mask = rng.random(n) < 0.8 if tick % 3 else None
+        fleet.step(0.5, mask)
+        for k in range(n):
+            if mask is None or mask[k]:
+                pos, path, wp, dist = ref[k]
+                pos, wp, moved = _move_step(pos, path, wp, fleet.speed[k], 0.5)
+                ref[k] = [pos, path, wp, dist + moved]
+    for k in range(n):
+        np.testing.assert_allclose(fleet.pos[k], ref[k][0], atol=1e-9)
+        np.testing.assert_array_equal(fleet.path(k), ref[k][1])
+        assert fleet.wp[k] == ref[k][2]
+        assert fleet.dist[k] == pytest.approx(ref[k][3])
+    # replaced paths were dropped: the buffer tracks the live paths, not history
+    assert len(fleet._buf) <= max(PATH_CAPACITY, 4 * int(fleet.count.sum()) + 4 * 60)
+
+
+def test_view_move_step_only_moves_its_row():
+    fleet = Fleet([("ground", 1, (0, 0, 0), 2), ("aerial", 2, (0, 0, 50), 4)])
+    fleet[0].set_path([[10, 0, 0]])
+    fleet[1].set_path([[0, 10, 50]])
+    fleet[0].move_step(1.0)
+    assert fleet[0].position.tolist() == [2.0, 0.0, 0.0]
+    assert fleet[1].position.tolist() == [0.0, 0.0, 50.0]
+    assert fleet[0].total_distance == 2.0 and fleet[1].total_distance == 0.0
+
+
+def test_default_sized_fleet_matches_run_rescue_mission():
+    cfg   = config(mapWidth=120, mapHeight=120)
+    fleet = make_fleet(cfg)
+    for v, (kind, uid, start, _) in zip(fleet, DEFAULT_FLEET):
+        assert (v.kind, v.id, tuple(v.position)) == (kind, uid, tuple(map(float, start)))
+        assert v.speed == (cfg.groundSpeed if kind == "ground" else cfg.aerialSpeed)
+
+
+@pytest.mark.parametrize("n_ground,n_aerial", [(1, 3), (8, 2), (20, 20)])
+def test_fleet_starts_free_and_distinct(env, n_ground, n_aerial):
+    cfg   = config(mapWidth=120, mapHeight=120, numGround=n_ground, numAerial=n_aerial)
+    fleet = make_fleet(cfg, env)
+    assert fleet.ids.tolist() == list(range(1, n_ground + n_aerial + 1))
+    assert fleet.kind == ["ground"] * n_ground + ["aerial"] * n_aerial
+    g, a = fleet.pos[:n_ground], fleet.pos[n_ground:]
+    assert not env.occupied2d(g[:, :2]).any() and not env.occupied3d(a).any()
+    assert (g[:, 2] == 0).all()
+    for pts in (g, a):
+        assert len({tuple(p[:2]) for p in pts}) == len(pts)
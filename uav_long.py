@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+uav_long.py  –  per-UAV long format of the results table
+
+experiment_results.csv is wide: one row per run with UAV<i>resc and
+UAV<i>dist for i = 1..N (N = 4 for runRescueMission's 2 + 2 fleet, more
+for fleet sweeps).  Per-UAV plots and tables want it long, one row per
+(run, UAV):
+
+    Row  Planner  Approach  UAV    Kind     Dist     Resc
+    0    RRT      nearest   UAV3   aerial   1249.4   6
+    0    RRT      nearest   UAV4   aerial    759.9   3
+    1    ...
+
+Vehicles 1..NumGround of a run are ground vehicles, the rest drones
+(make_fleet's id order); without a NumGround column the runs flew the
+NUM_GROUND + 2 default fleet.  UAVs a run did not have (NaN columns) are
+left out.
+
+to_long() builds that with NumPy reshapes only (no iterrows), and
+group_arrays() splits a value column into one array per label with a single
+stable sort, so preparing a boxplot is O(rows) regardless of label count.
+
+Sweeps over fleet size (sweep.py --grid NumGround=... NumAerial=...) write
+this long format directly, with a Kind column, to experiment_vehicles.csv;
+read_vehicles() loads it and to_wide() turns it back into one row per run
+with UAV1..N columns (NaN where a run had fewer vehicles).
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+NUM_GROUND = 2                    # runRescueMission's g1, g2 (then d1, d2)
+
+VEHICLES_CSV = "experiment_vehicles.csv"
+VEHICLE_COLS = ("UAV", "Kind", "Resc", "Dist", "PlanRaw", "PlanSmooth")
+UAV_COL      = re.compile(r"^(UAV\d+)(dist|resc)$")
+
+# ------------------------------------------------------------------
+# Wide -> long
+# ------------------------------------------------------------------
+def to_long(df, uavs=None, id_cols=("Planner", "Approach")):
+    """
+    One row per (run, UAV), runs in their original order and the UAVs of a
+    run next to each other.  Columns: Row, *id_cols, UAV, Kind, Dist, Resc.
+    *uavs* default to every UAV in *df*.
+    """
+    uavs = uav_names(df) if uavs is None else list(uavs)
+    n, k = len(df), len(uavs)
+    out  = {"Row": np.repeat(np.arange(n), k)}
+    for c in id_cols:
+        out[c] = np.repeat(df[c].to_numpy(), k)
+    out["UAV"]  = pd.Categorical.from_codes(np.tile(np.arange(k), n), uavs)
+    out["Kind"] = kinds(df, uavs).ravel()
+    out["Dist"] = df[[f"{u}dist" for u in uavs]].to_numpy(dtype=float).ravel()
+    out["Resc"] = df[[f"{u}resc" for u in uavs]].to_numpy(dtype=float).ravel()
+    long = pd.DataFrame(out)
+    absent = np.isnan(out["Dist"]) & np.isnan(out["Resc"])
+    return long[~absent].reset_index(drop=True) if absent.any() else long
+
+def kinds(df, uavs):
+    """(runs, len(uavs)) "ground" / "aerial" of every UAV label in every run."""
+    ids = np.array([int(u[3:]) for u in uavs])
+    n_ground = (df["NumGround"].to_numpy(dtype=float) if "NumGround" in df
+                else np.full(len(df), NUM_GROUND))
+    return np.where(ids[None, :] <= n_ground[:, None], "ground", "aerial")
+
+def uav_names(df):
+    """UAV labels with a <UAV>dist column in *df*, in id order."""
+    names = {m.group(1) for m in map(UAV_COL.match, df.columns) if m}
+    return sorted(names, key=lambda u: int(u[3:]))
+
+def uav_cols(df, kind="dist"):
+    """["UAV1dist", "UAV2dist", ...] for the UAVs present in *df*."""
+    return [f"{u}{kind}" for u in uav_names(df)]
+
+# ------------------------------------------------------------------
+# Per-vehicle file (experiment_vehicles.csv)
+# ------------------------------------------------------------------
+def read_vehicles(csv_file=VEHICLES_CSV):
+    """
+    The long per-vehicle table with Row (run index, in file order), Planner
+    and FleetSize added, so it can go straight into group_arrays().
+    """
+    long = pd.read_csv(csv_file)
+    runs = [c for c in long.columns if c not in VEHICLE_COLS]
+    long.insert(0, "Row", long.groupby(runs, sort=False, dropna=False).ngroup())
+    long["Planner"]   = long.useRRTStar.map({0: "RRT", 1: "RRT*"})
+    long["FleetSize"] = long.groupby("Row")["UAV"].transform("size")
+    return long
+
+def to_wide(long):
+    """One row per run: the run columns plus UAV<i>resc / UAV<i>dist."""
+    runs = [c for c in long.columns if c not in VEHICLE_COLS]
+    base = long.drop_duplicates("Row")[runs].set_index("Row")
+    resc = long.pivot(index="Row", columns="UAV", values="Resc")
+    dist = long.pivot(index="Row", columns="UAV", values="Dist")
+    uavs = sorted(resc.columns, key=lambda u: int(u[3:]))
+    wide = pd.concat([base,
+                      resc[uavs].add_suffix("resc"),
+                      dist[uavs].add_suffix("dist")], axis=1)
+    return wide.reset_index(drop=True)
+
+# ------------------------------------------------------------------
+# Long -> per-label arrays
+# ------------------------------------------------------------------
+def group_arrays(long_df, by, value="Dist", sep="_"):
+    """
+    {label: ndarray} for every combination of the *by* columns present,
+    with label = the key values joined by *sep* (e.g. "RRT_nearest_UAV3").
+    Labels come back sorted, matching sorted(df.Label.unique()).
+    """
+    by    = [by] if isinstance(by, str) else list(by)
+    gb    = long_df.groupby(by, sort=False, observed=True)
+    codes = gb.ngroup().to_numpy()
+    keys  = list(gb.size().index)
+    vals  = long_df[value].to_numpy()
+    if (codes < 0).any():                       # NaN keys drop out
+        vals, codes = vals[codes >= 0], codes[codes >= 0]
+
+    order  = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(keys))
+    parts  = np.split(vals[order], np.cumsum(counts)[:-1])
+
+    labels = [sep.join(map(str, k if isinstance(k, tuple) else (k,))) for k in keys]
+    return dict(sorted(zip(labels, parts)))
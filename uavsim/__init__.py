@@ -0,0 +1,51 @@
+"""
+uavsim  –  headless Python port of the MATLAB rescue simulation
+
+Mirrors the .m files module by module so that sweeps can run without
+MATLAB or figures:
+
+    config.py        config.m
+    environment.py   environment/createEnvironment.m
+    collision.py     pathPlanning/checkLineCollision.m
+    rrt.py           pathPlanning/planRRT.m
+    gridplan.py      A* + Jump Point Search on the ground map (no .m counterpart)
+    hierarchy.py     coarse-to-fine planning over an occupancy pyramid
+    layered.py       climb / cruise / descend routes for the drones
+    path_cache.py    memoised planPath calls (no .m counterpart)
+    roadmap.py       multi-goal planning for pickSurvivor / planPath
+    assignment.py    pickSurvivor and its nearest / centroid / kmeans pickers
+    vehicles.py      classes/BaseUAV.m, GroundVehicle.m, AerialDrone.m (fleet arrays)
+    planning.py      the vehicles' planPath methods
+    smoothing.py     path shortcutting / spline smoothing before execution
+    mission.py       runRescueMission.m (fixed-step and event-driven kernels)
+    batch.py         runExperiments.m as simulate_batch() -> DataFrame
+"""
+
+from .config import config
+from .environment import Environment, create_environment, cached_environment
+from .collision import (segments_collide, segment_collides, check_line_collision,
+                        path_collides)
+from .rrt import RRT, plan_rrt, path_length
+from .gridplan import JumpGrid, grid_for, plan_jps
+from .hierarchy import Pyramid, pyramid_for, plan_hierarchical
+from .layered import ceiling_for, plan_layered
+from .path_cache import PathCache
+from .roadmap import Roadmap, roadmap_for, plan_many, plan_roadmap
+from .assignment import Assigner, cost_matrix, approach_name
+from .vehicles import (Fleet, BaseUAV, GroundVehicle, AerialDrone, default_fleet,
+                       make_fleet)
+from .planning import PLANNERS, plan_path
+from .smoothing import smooth_path
+from .mission import run_rescue_mission, sweep_job
+from .batch import simulate_batch, iter_batch
+
+__all__ = ["config", "Environment", "create_environment", "cached_environment",
+           "segments_collide", "segment_collides", "check_line_collision",
+           "path_collides", "RRT", "plan_rrt", "path_length",
+           "JumpGrid", "grid_for", "plan_jps", "Pyramid", "pyramid_for",
+           "plan_hierarchical", "ceiling_for", "plan_layered", "PathCache",
+           "Roadmap", "roadmap_for", "plan_many", "plan_roadmap",
+           "Assigner", "cost_matrix", "approach_name", "Fleet", "BaseUAV",
+           "GroundVehicle", "AerialDrone", "default_fleet", "make_fleet", "PLANNERS",
+           "plan_path", "smooth_path", "run_rescue_mission", "sweep_job",
+           "simulate_batch", "iter_batch"]
@@ -0,0 +1,204 @@
+"""
+assignment.py  –  survivor assignment (pickSurvivor in runRescueMission.m)
+
+runRescueMission assigns greedily, one idle UAV at a time, and each of
+pickNearestSurvivor / pickCentroidSurvivor / pickKMeansSurvivor loops over
+the candidate survivors – the k-means variant even reruns kmeans() on every
+call.  Here every approach works on arrays:
+
+    nearest    argmin of the UAV -> survivor xy distances
+    centroid   survivor closest to the centroid of the candidates
+    kmeans     K_CLUSTERS clusters, recomputed only when the candidate set
+               changes
+    hungarian  (new) the full idle-UAV × survivor cost matrix, built in one
+               vectorized call, solved optimally with linear_sum_assignment
+               or by an auction that warm-starts from the previous prices
+
+The cost of UAV u taking survivor s is its travel time, scaled by the
+survivor's priority:
+
+    cost[u, s] = length(u -> s) / speed[u] * PRIORITY_WEIGHT[priority[s]]
+
+where length is the straight xy distance or, with cfg.assignmentCost =
+"path", the roadmap path length (roadmap.plan_many – one graph search per
+UAV, no extra planning calls).
+
+The approach is chosen like the existing cfg flags: hungarianApproach,
+then kmeansApproach, then centroidApproach, else nearest.
+"""
+
+import numpy as np
+from scipy.cluster.vq import kmeans2
+from scipy.optimize import linear_sum_assignment
+
+from .roadmap import plan_many
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+K_CLUSTERS      = 4                        # K in pickKMeansSurvivor
+PRIORITY_WEIGHT = {1: 0.5, 2: 1.0, 3: 1.5} # priority 1 (high) looks closer
+UNREACHABLE     = 1e9                      # cost of a pair with no path
+AUCTION_EPS     = 1e-3                     # final bidding increment (s)
+
+def approach_name(cfg):
+    """Value for the results' Approach column."""
+    if getattr(cfg, "hungarianApproach", False):
+        return "hungarian"
+    if cfg.kmeansApproach:
+        return "kmeans"
+    if cfg.centroidApproach:
+        return "centroid"
+    return "nearest"
+
+# ------------------------------------------------------------------
+# Cost matrix
+# ------------------------------------------------------------------
+def cost_matrix(uav_pos, speed, surv_pos, priority, metric="euclidean",
+                env=None, modes=None):
+    """(U, S) weighted travel times; *modes* ('2D'/'3D' per UAV) for metric="path"."""
+    uav_pos  = np.atleast_2d(np.asarray(uav_pos, dtype=float))
+    surv_pos = np.atleast_2d(np.asarray(surv_pos, dtype=float))
+    if metric == "path":
+        length = np.empty((len(uav_pos), len(surv_pos)))
+        for u, (p, mode) in enumerate(zip(uav_pos, modes)):
+            goals = surv_pos.copy()
+            if mode == "2D":
+                goals[:, 2] = 0.0
+            length[u], _ = plan_many(p, goals, env, mode=mode)
+    else:
+        diff   = uav_pos[:, None, :2] - surv_pos[None, :, :2]
+        length = np.sqrt((diff ** 2).sum(axis=2))
+    w = np.vectorize(PRIORITY_WEIGHT.get, otypes=[float])(np.asarray(priority))
+    cost = length / np.asarray(speed, dtype=float)[:, None] * w[None, :]
+    return np.where(np.isfinite(cost), cost, UNREACHABLE)
+
+# ------------------------------------------------------------------
+# Solvers
+# ------------------------------------------------------------------
+def hungarian(cost):
+    """Optimal rows -> cols (−1 where a row stays unassigned)."""
+    out = np.full(cost.shape[0], -1)
+    r, c = linear_sum_assignment(cost)
+    out[r] = c
+    return out
+
+def auction(cost, prices=None, eps=AUCTION_EPS):
+    """
+    Bertsekas' auction for min-cost assignment of rows to distinct columns
+    (rows <= cols).  Returns (assignment, prices); passing the prices of the
+    previous solve back in warm-starts the next one.  Zero-cost dummy rows
+    square the problem, which keeps the result within rows × eps of the
+    optimum whatever the starting prices.
+    """
+    U, S   = cost.shape
+    value  = -np.vstack([cost, np.zeros((S - U, S))])  # maximise value − price
+    prices = np.zeros(S) if prices is None else np.array(prices, dtype=float)
+    owner  = np.full(S, -1)
+    assign = np.full(S, -1)
+    free   = list(range(S))
+    while free:
+        u     = free.pop()
+        net   = value[u] - prices
+        best  = int(np.argmax(net))
+        first = net[best]
+        net[best] = -np.inf
+        second = net.max() if S > 1 else first
+        prices[best] += first - second + eps
+        if owner[best] >= 0:
+            assign[owner[best]] = -1
+            free.append(owner[best])
+        owner[best], assign[u] = u, best
+    return assign[:U], prices
+
+# ------------------------------------------------------------------
+# Assigner
+# ------------------------------------------------------------------
+class Assigner:
+    """
+    Stateful survivor picker for one mission.  assign() is called whenever
+    UAVs are idle and returns, per idle UAV, a survivor index or −1.
+    """
+
+    def __init__(self, cfg, seed=0):
+        self.cfg      = cfg
+        self.approach = approach_name(cfg)
+        self.metric   = getattr(cfg, "assignmentCost", "euclidean")
+        self.solver   = getattr(cfg, "assignmentSolver", "hungarian")
+        self.seed     = seed
+        self._prices  = None
+        self._km_key  = None
+        self._km      = None
+
+    # ----------------------------------------------------------- greedy
+    def _kmeans(self, xy, cand):
+        key = cand.tobytes()
+        if key != self._km_key:
+            self._km     = kmeans2(xy, K_CLUSTERS, minit="++", seed=self.seed)
+            self._km_key = key
+        return self._km
+
+    def _greedy(self, uav_pos, idle, surv_pos, cand):
+        out = np.full(len(uav_pos), -1)
+        for u in np.flatnonzero(idle):
+            if not cand.any():
+                break
+            idx = np.flatnonzero(cand)
+            xy  = surv_pos[idx, :2]
+            if self.approach == "centroid":
+                d = ((xy - xy.mean(axis=0)) ** 2).sum(axis=1)
+            elif self.approach == "kmeans" and len(idx) >= K_CLUSTERS:
+                centres, label = self._kmeans(xy, cand)
+                best = int(((centres - uav_pos[u, :2]) ** 2).sum(axis=1).argmin())
+                member = label == best
+                if member.any():
+                    d = np.where(member,
+                                 np.sqrt(((xy - centres[best]) ** 2).sum(axis=1)),
+                                 np.inf)
+                else:
+                    d = ((xy - uav_pos[u, :2]) ** 2).sum(axis=1)
+            else:
+                d = ((xy - uav_pos[u, :2]) ** 2).sum(axis=1)
+            s = idx[int(np.argmin(d))]
+            out[u], cand[s] = s, False
+        return out
+
+    # ---------------------------------------------------------- optimal
+    def _optimal(self, uav_pos, speed, idle, surv_pos, priority, cand, env, modes,
+                 banned):
+        out  = np.full(len(uav_pos), -1)
+        rows = np.flatnonzero(idle)
+        cols = np.flatnonzero(cand)
+        if not len(rows) or not len(cols):
+            return out
+        cost = cost_matrix(uav_pos[rows], speed[rows], surv_pos[cols],
+                           priority[cols], self.metric, env,
+                           None if modes is None else [modes[r] for r in rows])
+        if banned is not None:
+            cost[np.asarray(banned, dtype=bool)[np.ix_(rows, cols)]] = UNREACHABLE
+        if self.solver == "auction" and len(rows) <= len(cols):
+            if self._prices is None or len(self._prices) != len(surv_pos):
+                self._prices = np.zeros(len(surv_pos))
+            sol, p = auction(cost, self._prices[cols])
+            self._prices[cols] = p                   # warm start for next call
+        else:
+            sol = hungarian(cost)
+        hit = sol >= 0
+        hit[hit] = cost[np.flatnonzero(hit), sol[hit]] < UNREACHABLE
+        out[rows[hit]] = cols[sol[hit]]
+        return out
+
+    def assign(self, uav_pos, speed, idle, surv_pos, priority, available,
+               env=None, modes=None, banned=None):
+        """
+        Survivor index per UAV (−1 = none); only *idle* rows are filled.
+        *banned* (U, S) marks pairs the optimal approach must not make.
+        """
+        uav_pos = np.asarray(uav_pos, dtype=float)
+        cand    = np.array(available, dtype=bool)
+        idle    = np.asarray(idle, dtype=bool)
+        if self.approach == "hungarian":
+            return self._optimal(uav_pos, np.asarray(speed, dtype=float), idle,
+                                 surv_pos, np.asarray(priority), cand, env, modes,
+                                 banned)
+        return self._greedy(uav_pos, idle, surv_pos, cand)
@@ -0,0 +1,135 @@
+"""
+batch.py  –  runExperiments.m as an in-memory, parallel Python call
+
+Getting numbers into exp_stats.py used to mean running runExperiments.m,
+writing experiment_results.csv and parsing it back.  simulate_batch()
+runs the same scenarios headless (no figures, no pause) in a process pool
+and returns the results table directly, in the schema the analysis
+scripts read from the CSV:
+
+    df = simulate_batch({"Seed": [1, 2], "MapWidth": [300],
+                         "NumBuildings": [30, 60], "NumSurvivors": [15],
+                         "useRRTStar": [False], "Approach": ["nearest"]},
+                        n_workers=4)
+    exp_stats.one_way_descriptive(exp_stats.coerce(df), ["NumBuildings"])
+    plot_results.prepare(df)
+
+Jobs that share an environment (map size, buildings, survivors – the
+layout seed is fixed, as in createEnvironment.m) are sent to the same
+worker in one chunk, so each worker builds an environment, and the
+roadmaps and caches keyed on it, once.  Results do not depend on the
+number of workers: every job's planner stream is seeded from its Seed.
+Jobs with PathCache=True share each worker's path cache (mission.job_config)
+– faster, but those results depend on which jobs a worker ran before.
+
+iter_batch() yields (job, result) pairs as chunks finish, for callers that
+want to fold results into a StatsState while the batch is still running.
+"""
+
+import itertools
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .mission import sweep_job
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+# sweep.py's GRID (runExperiments.m's loops, in nesting order)
+DEFAULT_GRID = {
+    "Seed"        : [1, 2, 3],
+    "MapWidth"    : [300, 500],
+    "NumBuildings": [30, 60],
+    "NumSurvivors": [15, 25],
+    "useRRTStar"  : [False, True],
+    "Approach"    : ["nearest", "centroid"],
+}
+GRID_COLS  = ["Seed", "MapWidth", "MapHeight", "NumBuildings", "NumSurvivors",
+              "useRRTStar", "Approach"]
+FLEET_COLS = ["NumGround", "NumAerial"]
+ENV_COLS   = ["MapWidth", "MapHeight", "NumBuildings", "NumSurvivors"]
+PLAN_COLS  = ["PlanLenRaw", "PlanLenSmooth"]
+
+# ------------------------------------------------------------------
+# Jobs
+# ------------------------------------------------------------------
+def expand(param_grid=None):
+    """
+    Job dicts from a {column: values} grid (missing axes take DEFAULT_GRID
+    values) or from an iterable of job dicts, in grid order.
+    """
+    if param_grid is None or isinstance(param_grid, dict):
+        grid = {**DEFAULT_GRID, **(param_grid or {})}
+        jobs = [dict(zip(grid, combo)) for combo in itertools.product(*grid.values())]
+    else:
+        jobs = [dict(j) for j in param_grid]
+    for j in jobs:
+        j.setdefault("MapHeight", j["MapWidth"])
+    return jobs
+
+def _chunks(jobs, n_workers):
+    """Index lists grouped by environment, big groups split over the workers."""
+    groups = {}
+    for i, j in enumerate(jobs):
+        groups.setdefault(tuple(j[c] for c in ENV_COLS), []).append(i)
+    per = max(1, -(-len(jobs) // (n_workers * 2)))   # ~2 chunks per worker
+    return [idx[k:k + per] for idx in groups.values() for k in range(0, len(idx), per)]
+
+def _job(job):
+    """sweep_job(), with a failed scenario kept as a NaN row (runExperiments.m)."""
+    try:
+        return sweep_job(job)
+    except Exception as exc:
+        warnings.warn(f"scenario {job} failed: {exc}")
+        return {}
+
+def _run_chunk(jobs):
+    return [_job(j) for j in jobs]
+
+def _run(jobs, n_workers):
+    """Yield (job index, result) as they finish."""
+    if n_workers <= 1:
+        for i, j in enumerate(jobs):
+            yield i, _job(j)
+        return
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futs = {pool.submit(_run_chunk, [jobs[i] for i in idx]): idx
+                for idx in _chunks(jobs, n_workers)}
+        for fut in as_completed(futs):
+            yield from zip(futs[fut], fut.result())
+
+def iter_batch(param_grid=None, n_workers=1):
+    """Yield (job, result) as they finish; results as sweep_job() returns them."""
+    jobs = expand(param_grid)
+    for i, res in _run(jobs, n_workers):
+        yield jobs[i], res
+
+# ------------------------------------------------------------------
+# Results table
+# ------------------------------------------------------------------
+def to_frame(pairs):
+    """
+    The experiment_results.csv schema from (job, result) pairs, rows in
+    job order: grid columns (useRRTStar as 0/1), TimeTaken, then
+    UAV<i>resc and UAV<i>dist for the largest fleet (NaN for smaller ones),
+    then the planned path lengths before / after smoothing.
+    """
+    jobs, results = zip(*pairs) if pairs else ((), ())
+    cols = GRID_COLS + [c for c in FLEET_COLS if any(c in j for j in jobs)]
+    n    = max([sum(k.endswith("resc") for k in r) for r in results] + [4])
+    uavs = [f"UAV{i}resc" for i in range(1, n + 1)] + \
+           [f"UAV{i}dist" for i in range(1, n + 1)]
+    df = pd.DataFrame([{**{c: j[c] for c in cols}, **r} for j, r in pairs],
+                      columns=cols + ["TimeTaken"] + uavs + PLAN_COLS)
+    df["useRRTStar"] = df["useRRTStar"].astype(int)
+    return df
+
+def simulate_batch(param_grid=None, n_workers=1):
+    """Run every scenario of *param_grid*; returns the results DataFrame."""
+    jobs    = expand(param_grid)
+    results = [None] * len(jobs)
+    for i, res in _run(jobs, n_workers):
+        results[i] = res
+    return to_frame(list(zip(jobs, results)))
@@ -0,0 +1,223 @@
+"""
+collision.py  –  exact segment tests against the environment height field
+
+pathPlanning/checkLineCollision.m walks a segment in 1 m steps and calls
+getOccupancy on the 3-D map at every step, so a test costs
+(length in metres) × (map lookups) and can still step over a corner.
+Here the segment is traversed cell by cell with the Amanatides–Woo DDA
+over the 2-D height field (environment.Environment.top): inside each
+ground cell the segment's z is linear, so it is free there iff its lowest
+z in that cell is at or above the building top.  Cost is proportional to
+the number of cells crossed and the test is exact – no step size.
+
+segments_collide() runs the DDA for a whole batch of segments at once:
+every iteration advances all still-active segments by one cell with NumPy,
+so thousands of candidate RRT edges take one call.  Batches of at most
+SCALAR_MAX segments (a single RRT edge) use a plain per-segment loop, which
+beats NumPy's call overhead at that size.  Batches of a few long segments
+(path shortcuts spanning the map) would need one iteration per cell of the
+longest; those go through a cell table instead – every grid-line crossing
+of every segment, sorted into traversal order in one pass – which visits
+the same cells with the same tie-breaks.
+
+Conventions match Environment.occupied3d: a point outside the map (x, y
+outside [0, W) × [0, H), z outside [0, depth)) counts as occupied; a z
+within GROUND_EPS below 0 is float round-off on the ground plane and is
+taken as z = 0.
+"""
+
+import math
+
+import numpy as np
+
+from .environment import GROUND_EPS
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+MIN_LENGTH  = 1e-6     # (m) shorter segments never collide, as in the .m file
+SCALAR_MAX  = 16       # batches up to this size use the per-segment loop
+TABLE_CELLS = 200      # cell table if it has fewer cells per loop iteration
+
+# ------------------------------------------------------------------
+# Batched DDA
+# ------------------------------------------------------------------
+def _as3d(p):
+    p = np.atleast_2d(np.asarray(p, dtype=float))
+    if p.shape[1] == 2:                     # '2D' mode: embed z = 0
+        return np.column_stack([p, np.zeros(len(p))])
+    ground = (p[:, 2] < 0) & (p[:, 2] >= -GROUND_EPS)
+    if ground.any():
+        p = p.copy()
+        p[ground, 2] = 0.0
+    return p
+
+def segments_collide(env, p1, p2):
+    """
+    (N,) bool: does the segment p1[i] -> p2[i] touch an occupied voxel or
+    leave the map?  p1, p2 are (N, 2) (ground, z = 0) or (N, 3) arrays.
+    """
+    p1, p2 = _as3d(p1), _as3d(p2)
+    n      = len(p1)
+    d      = p2 - p1
+    length = np.linalg.norm(d, axis=1)
+    hit    = np.zeros(n, dtype=bool)
+
+    # z range and x/y bounds are linear, so the endpoints decide them
+    W, H, D = env.width, env.height, env.depth
+    lo, hi  = np.minimum(p1, p2), np.maximum(p1, p2)
+    hit |= (lo[:, 0] < 0) | (hi[:, 0] >= W) | (lo[:, 1] < 0) | (hi[:, 1] >= H)
+    hit |= (lo[:, 2] < 0) | (hi[:, 2] >= D)
+    active = ~hit & (length >= MIN_LENGTH)
+
+    idx = np.flatnonzero(active)
+    if idx.size == 0:
+        return hit & (length >= MIN_LENGTH)
+    if idx.size <= SCALAR_MAX:
+        # NumPy's per-call overhead dominates for a handful of short edges
+        top = env.top
+        for i in idx.tolist():
+            hit[i] = _segment_hits(top, *p1[i].tolist(), *d[i].tolist())
+        return hit
+    x0, y0, z0 = p1[idx, 0], p1[idx, 1], p1[idx, 2]
+    dx, dy, dz = d[idx, 0], d[idx, 1], d[idx, 2]
+
+    ix, iy = np.floor(x0).astype(np.int64), np.floor(y0).astype(np.int64)
+    sx, sy = np.sign(dx).astype(np.int64), np.sign(dy).astype(np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_dx = np.where(dx != 0, np.abs(1.0 / dx), np.inf)
+        t_dy = np.where(dy != 0, np.abs(1.0 / dy), np.inf)
+        t_mx = np.where(dx != 0, (ix + (sx > 0) - x0) / dx, np.inf)
+        t_my = np.where(dy != 0, (iy + (sy > 0) - y0) / dy, np.inf)
+
+    # every segment crosses at most |Δix| + |Δiy| + 1 cells
+    n_x = np.where(dx != 0, np.abs(np.floor(p2[idx, 0]).astype(np.int64) - ix), 0)
+    n_y = np.where(dy != 0, np.abs(np.floor(p2[idx, 1]).astype(np.int64) - iy), 0)
+    n_cells = n_x + n_y + 1
+    if n_cells.sum() >= TABLE_CELLS * n_cells.max():
+        _walk(hit, idx, env, z0, dz, ix, iy, sx, sy, t_mx, t_my, t_dx, t_dy,
+              int(n_cells.max()))
+    else:
+        _table(hit, idx, env, z0, dz, ix, iy, sx, sy, t_mx, t_my, t_dx, t_dy, n_x, n_y)
+    return hit & (length >= MIN_LENGTH)
+
+def _walk(hit, idx, env, z0, dz, ix, iy, sx, sy, t_mx, t_my, t_dx, t_dy, n_steps):
+    """Short segments: advance all of them one cell per iteration."""
+    W, H = env.width, env.height
+    t    = np.zeros(idx.size)
+    live = np.arange(idx.size)
+    top  = env.top
+    for _ in range(n_steps):
+        t_exit = np.minimum(np.minimum(t_mx[live], t_my[live]), 1.0)
+        z_min  = z0[live] + dz[live] * np.where(dz[live] < 0, t_exit, t[live])
+        cx = np.minimum(np.maximum(ix[live], 0), W - 1)
+        cy = np.minimum(np.maximum(iy[live], 0), H - 1)
+        blocked = z_min < top[cy, cx]
+        hit[idx[live[blocked]]] = True
+
+        more = ~blocked & (t_exit < 1.0)
+        live = live[more]
+        if live.size == 0:
+            break
+        step_x = t_mx[live] <= t_my[live]
+        ax, ay = live[step_x], live[~step_x]
+        t[ax] = t_mx[ax]; ix[ax] += sx[ax]; t_mx[ax] += t_dx[ax]
+        t[ay] = t_my[ay]; iy[ay] += sy[ay]; t_my[ay] += t_dy[ay]
+
+def _table(hit, idx, env, z0, dz, ix, iy, sx, sy, t_mx, t_my, t_dx, t_dy, n_x, n_y):
+    """
+    Long segments: list every cell of every segment in one table instead
+    of one iteration per cell, so the cost is one pass over all cells.
+    """
+    W, H, m = env.width, env.height, idx.size
+    # grid-line crossings: row i of _crossings() is t_m, t_m + t_d, ...
+    # summed in _walk's own order, so corner ties break exactly as there
+    # (one spare crossing per axis covers rounding; those past t = 1 drop)
+    seg_x, t_x = _crossings(t_mx, t_dx, np.where(t_dx < np.inf, n_x + 1, 0))
+    seg_y, t_y = _crossings(t_my, t_dy, np.where(t_dy < np.inf, n_y + 1, 0))
+
+    # rows: each segment's start cell (rank 0), then its x (1) and y (2)
+    # crossings in traversal order – x first on a tie, as the DDA steps
+    seg  = np.concatenate([np.arange(m), seg_x, seg_y])
+    t    = np.concatenate([np.zeros(m), t_x, t_y])
+    rank = np.repeat(np.array([0, 1, 2], dtype=np.int8), [m, seg_x.size, seg_y.size])
+    keep = t < 1.0
+    seg, t, rank = seg[keep], t[keep], rank[keep]
+    order = np.lexsort((rank, t, seg))
+    seg, t, rank = seg[order], t[order], rank[order]
+
+    # cell entered at each row and the t at which the segment leaves it
+    first = np.searchsorted(seg, np.arange(m))
+    n_sx  = np.cumsum(rank == 1); n_sx -= n_sx[first][seg]
+    n_sy  = np.cumsum(rank == 2); n_sy -= n_sy[first][seg]
+    cx = np.minimum(np.maximum(ix[seg] + sx[seg] * n_sx, 0), W - 1)
+    cy = np.minimum(np.maximum(iy[seg] + sy[seg] * n_sy, 0), H - 1)
+    t_exit = np.append(t[1:], 1.0)
+    t_exit[first[1:] - 1] = 1.0
+    z_min  = z0[seg] + dz[seg] * np.where(dz[seg] < 0, t_exit, t)
+    hit[idx[seg[z_min < env.top[cy, cx]]]] = True
+
+def _crossings(t_first, t_step, counts):
+    """(segment, t) of the first counts[i] grid-line crossings of segment i."""
+    n = int(counts.max()) if counts.size else 0
+    steps = np.empty((counts.size, max(n, 1)))
+    steps[:, 0], steps[:, 1:] = t_first, t_step[:, None]
+    t = np.cumsum(steps, axis=1)
+    live = np.arange(steps.shape[1]) < counts[:, None]
+    return np.nonzero(live)[0], t[live]
+
+def segment_collides(env, p1, p2):
+    """Pure-Python single-segment test; p1, p2 are 2- or 3-sequences."""
+    x0, y0 = float(p1[0]), float(p1[1])
+    x1, y1 = float(p2[0]), float(p2[1])
+    z0 = float(p1[2]) if len(p1) > 2 else 0.0
+    z1 = float(p2[2]) if len(p2) > 2 else 0.0
+    z0 = 0.0 if -GROUND_EPS <= z0 < 0 else z0
+    z1 = 0.0 if -GROUND_EPS <= z1 < 0 else z1
+    dx, dy, dz = x1 - x0, y1 - y0, z1 - z0
+    if dx * dx + dy * dy + dz * dz < MIN_LENGTH * MIN_LENGTH:
+        return False
+    if (min(x0, x1) < 0 or max(x0, x1) >= env.width or
+            min(y0, y1) < 0 or max(y0, y1) >= env.height or
+            min(z0, z1) < 0 or max(z0, z1) >= env.depth):
+        return True
+    return _segment_hits(env.top, x0, y0, z0, dx, dy, dz)
+
+def _segment_hits(top, x0, y0, z0, dx, dy, dz):
+    """Scalar DDA for one in-bounds segment (same rules as the batched loop)."""
+    H, W = top.shape
+    ix, iy = math.floor(x0), math.floor(y0)
+    sx = (dx > 0) - (dx < 0)
+    sy = (dy > 0) - (dy < 0)
+    t_dx = abs(1.0 / dx) if dx else math.inf
+    t_dy = abs(1.0 / dy) if dy else math.inf
+    t_mx = (ix + (sx > 0) - x0) / dx if dx else math.inf
+    t_my = (iy + (sy > 0) - y0) / dy if dy else math.inf
+    t = 0.0
+    while True:
+        t_exit = min(t_mx, t_my, 1.0)
+        z_min  = z0 + dz * (t_exit if dz < 0 else t)
+        if z_min < top[min(max(iy, 0), H - 1), min(max(ix, 0), W - 1)]:
+            return True
+        if t_exit >= 1.0:
+            return False
+        if t_mx <= t_my:
+            t, ix, t_mx = t_mx, ix + sx, t_mx + t_dx
+        else:
+            t, iy, t_my = t_my, iy + sy, t_my + t_dy
+
+# ------------------------------------------------------------------
+# checkLineCollision.m drop-in
+# ------------------------------------------------------------------
+def check_line_collision(p1, p2, env, mode="3D"):
+    """Single-segment version with checkLineCollision's argument order."""
+    if mode == "2D":
+        p1, p2 = p1[:2], p2[:2]
+    return segment_collides(env, p1, p2)
+
+def path_collides(env, path):
+    """True if any leg of an (N, 2|3) waypoint path collides."""
+    path = np.asarray(path, dtype=float)
+    if len(path) < 2:
+        return False
+    return bool(segments_collide(env, path[:-1], path[1:]).any())
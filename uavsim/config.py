@@ -0,0 +1,73 @@
+"""
+config.py  –  Python mirror of config.m
+
+Field names are kept in MATLAB camelCase so that code ported from the .m
+files reads the same (cfg.mapWidth, cfg.rrtStepSize, ...).  Fields that
+runExperiments.m / runRescueMission.m add on top of config.m
+(numBuildings, useRRTStar) get their createEnvironment / runExperiments
+defaults here.
+"""
+
+from types import SimpleNamespace
+
+
+def config(**overrides):
+    """Default simulation parameters; keyword arguments override fields."""
+    cfg = SimpleNamespace(
+        # Simulation timing
+        timeStep     = 0.1,        # (s) time step per iteration
+        totalSimTime = 300,        # (s) maximum allowed simulation time
+
+        # Environment dimensions
+        mapWidth  = 300,           # (m) horizontal X-extent
+        mapHeight = 300,           # (m) horizontal Y-extent
+        mapDepth  = 100,           # (m) vertical Z-extent for aerial flight
+
+        # Vehicle settings
+        numAerial   = 2,
+        numGround   = 2,
+        aerialSpeed = 15,          # (m/s)
+        groundSpeed = 5,           # (m/s)
+
+        # Environment contents
+        numBuildings = 30,         # createEnvironment default
+        numSurvivors = 5,
+
+        # Path planning (RRT)
+        rrtPlannerType    = "rrt", # 'rrt' or 'rrtstar'
+        rrtMaxIterations  = 10000,
+        rrtStepSize       = 5,     # (m)
+        rrtGoalBias       = 0.3,
+        useRRTStar        = False,
+        rrtStarIterations = 1500,  # RRT* refinement budget after the first path
+        rrtTimeBudget     = None,  # (s) hard wall-clock limit per plan, None = off
+        groundPlanner     = "rrt", # planning.PLANNERS key per vehicle kind
+                                   # ("jps", "hier", "roadmap")
+        aerialPlanner     = "rrt", # ("hier", "layered", "roadmap")
+        groundClearance   = 0,     # (m) grid planner keeps this off buildings
+        pathCache         = False, # reuse paths via path_cache.shared_cache
+        pathCacheDir      = None,  # its disk tier (None = memory only)
+
+        # Path post-processing (smoothing.py)
+        pathShortcut  = True,      # greedy + randomized shortcutting
+        pathSpline    = False,     # spline resampling of the shortcut path
+        splineSpacing = 10,        # (m) spacing of the resampled waypoints
+
+        # Visualization and debug
+        show3D       = False,      # headless by default on the Python side
+        show2D       = False,
+        debug        = False,
+        plotInterval = 0.1,
+
+        # Survivor assignment approaches
+        centroidApproach  = False,
+        kmeansApproach    = False,
+        hungarianApproach = False,         # optimal fleet-wide assignment
+        assignmentCost    = "euclidean",   # or "path" (roadmap path lengths)
+        assignmentSolver  = "hungarian",   # or "auction" (warm-started)
+    )
+    for name, value in overrides.items():
+        if not hasattr(cfg, name):
+            raise AttributeError(f"unknown config field {name!r}")
+        setattr(cfg, name, value)
+    return cfg
@@ -0,0 +1,207 @@
+"""
+environment.py  –  headless NumPy version of environment/createEnvironment.m
+
+createEnvironment.m fills a mapWidth × mapHeight × mapDepth occupancyMap3D
+point by point and marks every building footprint with a double for-loop
+of setOccupancy calls – minutes on a 500 m map.  Buildings are extruded
+prisms standing on the ground, so the whole 3-D map is really a 2-D height
+field:
+
+    top[y, x]   number of occupied voxel layers above cell (x, y)
+                (0 = free ground, h + 1 for a building of height h, since
+                createEnvironment marks z = 0 .. h)
+
+    voxel (x, y, z) occupied  <=>  z < top[y, x]
+
+The ground map is `top > 0`, stored bit-packed along x (np.packbits), and
+the full voxel grid is only materialised on request (voxels()).  Each
+building is one slice assignment, survivors are drawn by vectorized
+rejection sampling, so generating an environment takes well under a
+millisecond.
+
+Cell (x, y) covers [x, x+1) × [y, y+1) in metres; arrays are indexed
+[y, x] (row = y) like the groundMap calls in runRescueMission.m.
+
+As in createEnvironment.m the layout is seeded with a fixed ENV_SEED, not
+the experiment seed, so every run of a sweep shares one map per
+(size, buildings, survivors).  The generator is NumPy's, so layouts are
+statistically equivalent to MATLAB's but not cell-identical.
+"""
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+ENV_SEED        = 12345            # rng(12345) in createEnvironment.m
+BUILDING_SIZE   = (20, 40)         # (m) footprint side, inclusive
+BUILDING_HEIGHT = (30, 80)         # (m) inclusive
+PRIORITY        = (1, 3)           # survivor priority, inclusive
+CACHE_SIZE      = 256              # environments kept by cached_environment
+GROUND_EPS      = 1e-6             # (m) z this far below 0 is still the ground
+
+# ------------------------------------------------------------------
+# Environment
+# ------------------------------------------------------------------
+class Environment:
+    """Height field, packed ground map, buildings and survivors of a scenario."""
+
+    def __init__(self, top, depth, buildings, survivors, priority):
+        self.top       = top                       # (H, W) voxel layer counts
+        self.depth     = int(depth)
+        self.buildings = buildings                 # (K, 5) x0, y0, x1, y1, h
+        self.survivors = survivors                 # (S, 3) positions, z = 0
+        self.priority  = priority                  # (S,)   1 (high) .. 3
+        self.ground    = np.packbits(top > 0, axis=1)
+        self._digest   = None
+
+    @property
+    def width(self):
+        return self.top.shape[1]
+
+    @property
+    def height(self):
+        return self.top.shape[0]
+
+    # -------------------------------------------------------------- maps
+    def ground_map(self):
+        """(H, W) bool occupancy of the ground layer."""
+        return np.unpackbits(self.ground, axis=1, count=self.width).astype(bool)
+
+    def voxels(self, packed=True):
+        """
+        Full (H, W, depth) occupancy; packed=True bit-packs it along z
+        (depth / 8 bytes per column), which is what an occupancyMap3D holds.
+        """
+        occ = np.arange(self.depth)[None, None, :] < self.top[:, :, None]
+        return np.packbits(occ, axis=2) if packed else occ
+
+    # ----------------------------------------------------------- queries
+    def _cells(self, xy):
+        xy = np.asarray(xy, dtype=float)
+        c  = np.floor(xy).astype(np.int64)
+        inside = ((c[..., 0] >= 0) & (c[..., 0] < self.width) &
+                  (c[..., 1] >= 0) & (c[..., 1] < self.height))
+        cx = np.clip(c[..., 0], 0, self.width - 1)
+        cy = np.clip(c[..., 1], 0, self.height - 1)
+        return cx, cy, inside
+
+    def occupied2d(self, xy):
+        """Ground occupancy at (..., 2) points; outside the map counts as occupied."""
+        cx, cy, inside = self._cells(xy)
+        return ~inside | (self.top[cy, cx] > 0)
+
+    def occupied3d(self, xyz):
+        """
+        Voxel occupancy at (..., 3) points; outside the map counts as
+        occupied, except for float round-off just below the ground plane.
+        """
+        xyz = np.asarray(xyz, dtype=float)
+        cx, cy, inside = self._cells(xyz[..., :2])
+        z = xyz[..., 2]
+        z = np.where((z < 0) & (z >= -GROUND_EPS), 0.0, z)
+        inside &= (z >= 0) & (z < self.depth)
+        return ~inside | (np.floor(z) < self.top[cy, cx])
+
+    def digest(self):
+        """Content hash of the obstacle layout (for planner caches)."""
+        if self._digest is None:
+            h = hashlib.sha1(self.top.tobytes())
+            h.update(np.array([self.width, self.height, self.depth]).tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    # --------------------------------------------------------------- I/O
+    def save(self, path):
+        np.savez_compressed(path, top=self.top, depth=self.depth,
+                            buildings=self.buildings, survivors=self.survivors,
+                            priority=self.priority)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            return cls(z["top"], int(z["depth"]), z["buildings"],
+                       z["survivors"], z["priority"])
+
+# ------------------------------------------------------------------
+# Generation
+# ------------------------------------------------------------------
+def _place_buildings(rng, W, H, n):
+    """(n, 5) int array: xStart, yStart, xEnd, yEnd (inclusive), height."""
+    x0 = rng.integers(0, max(0, W - 40) + 1, n)
+    y0 = rng.integers(0, max(0, H - 40) + 1, n)
+    bw = rng.integers(BUILDING_SIZE[0], BUILDING_SIZE[1] + 1, n)
+    bl = rng.integers(BUILDING_SIZE[0], BUILDING_SIZE[1] + 1, n)
+    h  = rng.integers(BUILDING_HEIGHT[0], BUILDING_HEIGHT[1] + 1, n)
+    x1 = np.minimum(x0 + bw, W - 1)
+    y1 = np.minimum(y0 + bl, H - 1)
+    return np.column_stack([x0, y0, x1, y1, h])
+
+def _place_survivors(rng, top, n):
+    """Uniform positions on free ground, as createEnvironment's rejection loop."""
+    H, W = top.shape
+    pts  = np.empty((0, 2))
+    while len(pts) < n:
+        k    = max(2 * (n - len(pts)), 16)
+        cand = np.column_stack([1 + (W - 2) * rng.random(k),
+                                1 + (H - 2) * rng.random(k)])
+        free = top[cand[:, 1].astype(int), cand[:, 0].astype(int)] == 0
+        pts  = np.vstack([pts, cand[free]])
+    pts = pts[:n]
+    return np.column_stack([pts, np.zeros(n)])
+
+def create_environment(cfg, seed=ENV_SEED):
+    """Environment for *cfg* (mapWidth/Height/Depth, numBuildings, numSurvivors)."""
+    W, H, D = int(cfg.mapWidth), int(cfg.mapHeight), int(cfg.mapDepth)
+    rng = np.random.default_rng(seed)
+
+    buildings = _place_buildings(rng, W, H, int(getattr(cfg, "numBuildings", 30)))
+    top = np.zeros((H, W), dtype=np.uint8 if D < 256 else np.uint16)
+    for x0, y0, x1, y1, h in buildings.tolist():
+        blk = top[y0:y1 + 1, x0:x1 + 1]
+        np.maximum(blk, top.dtype.type(min(h + 1, D)), out=blk)
+
+    n = int(getattr(cfg, "numSurvivors", 15))
+    survivors = _place_survivors(rng, top, n)
+    priority  = rng.integers(PRIORITY[0], PRIORITY[1] + 1, n)
+    return Environment(top, D, buildings, survivors, priority)
+
+# ------------------------------------------------------------------
+# Caching by seed
+# ------------------------------------------------------------------
+_CACHE = OrderedDict()
+
+def _key(cfg, seed):
+    return (seed, int(cfg.mapWidth), int(cfg.mapHeight), int(cfg.mapDepth),
+            int(getattr(cfg, "numBuildings", 30)),
+            int(getattr(cfg, "numSurvivors", 15)))
+
+def cached_environment(cfg, seed=ENV_SEED, cache_dir=None):
+    """
+    create_environment() memoised on (seed, map size, buildings, survivors):
+    an in-process LRU of CACHE_SIZE entries and, with *cache_dir*, one .npz
+    per key on disk.  Callers must treat the result as read-only.
+    """
+    key = _key(cfg, seed)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    path = Path(cache_dir) / ("env-" + "-".join(map(str, key)) + ".npz") \
+           if cache_dir else None
+    if path is not None and path.exists():
+        env = Environment.load(path)
+    else:
+        env = create_environment(cfg, seed)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            env.save(path)
+
+    _CACHE[key] = env
+    if len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return env
@@ -0,0 +1,251 @@
+"""
+gridplan.py  –  A* with Jump Point Search on the ground map
+
+GroundVehicle.planPath runs the SE(2) plannerRRT on a 1 m groundMap: a
+random search for what is a plain 8-connected grid problem.  Here the
+ground vehicle plans on the grid itself with A* + Jump Point Search
+(Harabor & Grastien), octile-distance heuristic, no corner cutting (a
+diagonal step needs both orthogonal neighbours free, so every leg between
+cell centres passes collision.py's exact test).  The search is
+deterministic and returns the grid-optimal path as its jump points.
+
+JumpGrid holds, per environment,
+
+    free     padded flat occupancy (one cell of wall around the map)
+    nxt      for each of the four straight directions the next cell that
+             stops a jump (building or forced neighbour), from a NumPy
+             accumulate scan – so a straight jump is one lookup, and only
+             diagonal jumps step cell by cell in Python
+
+With cfg.groundClearance > 0 cells whose Euclidean distance transform
+(scipy.ndimage.distance_transform_edt of the free ground) is at or below
+that many metres count as blocked too, which keeps the vehicle off the
+walls.  If the inflated map leaves no route (or the start or goal lies in
+the margin), the plan is retried on the plain ground map.
+
+Grids are cached per (Environment.digest(), clearance), so the whole fleet
+and every later assignment reuse one set of tables.
+
+    path = plan_jps(start, goal, env, cfg, mode="2D")   # (N, 3), z = 0
+"""
+
+import heapq
+import math
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+SQRT2 = math.sqrt(2.0)
+
+# ------------------------------------------------------------------
+# Jump tables
+# ------------------------------------------------------------------
+def _next_stop(stop, axis, forward):
+    """Index along *axis* of the nearest stop cell at or beyond each cell."""
+    n   = stop.shape[axis]
+    idx = np.arange(n).reshape((-1, 1) if axis == 0 else (1, -1))
+    if forward:
+        at = np.where(stop, idx, n)
+        return np.flip(np.minimum.accumulate(np.flip(at, axis), axis=axis), axis)
+    at = np.where(stop, idx, -1)
+    return np.maximum.accumulate(at, axis=axis)
+
+
+class JumpGrid:
+    """Occupancy and straight-jump tables of one (possibly inflated) ground map."""
+
+    def __init__(self, blocked):
+        blocked = np.asarray(blocked, dtype=bool)
+        self.height, self.width = H, W = blocked.shape
+        free = np.zeros((H + 2, W + 2), dtype=bool)
+        free[1:-1, 1:-1] = ~blocked
+        c = free[1:-1, 1:-1]
+        up, down   = free[2:, 1:-1], free[:-2, 1:-1]      # y + 1, y − 1
+        right, left = free[1:-1, 2:], free[1:-1, :-2]     # x + 1, x − 1
+
+        # forced neighbours of a straight move arriving in the cell (the
+        # no-corner-cutting rules): moving east, a free cell above / below
+        # whose west neighbour is blocked; likewise for the other three
+        f_e = (up & ~free[2:, :-2]) | (down & ~free[:-2, :-2])
+        f_w = (up & ~free[2:, 2:])  | (down & ~free[:-2, 2:])
+        f_n = (right & ~free[:-2, 2:]) | (left & ~free[:-2, :-2])
+        f_s = (right & ~free[2:, 2:])  | (left & ~free[2:, :-2])
+        self.nxt = {(1, 0):  _next_stop(~c | f_e, 1, True).ravel().tolist(),
+                    (-1, 0): _next_stop(~c | f_w, 1, False).ravel().tolist(),
+                    (0, 1):  _next_stop(~c | f_n, 0, True).ravel().tolist(),
+                    (0, -1): _next_stop(~c | f_s, 0, False).ravel().tolist()}
+        self.free = free.ravel().tolist()
+
+    def is_free(self, x, y):
+        return self.free[(y + 1) * (self.width + 2) + x + 1]
+
+    # ------------------------------------------------------------ jumps
+    def _straight(self, x, y, dx, dy, gx, gy):
+        """Jump point reached from (x, y) moving (dx, 0) or (0, dy), or None."""
+        W, H = self.width, self.height
+        if dx:
+            if not 0 <= x + dx < W:
+                return None
+            stop = self.nxt[dx, 0][y * W + x + dx]
+            if gy == y and (x < gx <= stop if dx > 0 else stop <= gx < x):
+                return gx, gy
+            if stop in (-1, W) or not self.is_free(stop, y):
+                return None
+            return stop, y
+        if not 0 <= y + dy < H:
+            return None
+        stop = self.nxt[0, dy][(y + dy) * W + x]
+        if gx == x and (y < gy <= stop if dy > 0 else stop <= gy < y):
+            return gx, gy
+        if stop in (-1, H) or not self.is_free(x, stop):
+            return None
+        return x, stop
+
+    def _jump(self, x, y, dx, dy, gx, gy):
+        if not (dx and dy):
+            return self._straight(x, y, dx, dy, gx, gy)
+        free = self.is_free
+        while free(x + dx, y) and free(x, y + dy) and free(x + dx, y + dy):
+            x += dx; y += dy
+            if (x, y) == (gx, gy):
+                return x, y
+            if (self._straight(x, y, dx, 0, gx, gy) is not None or
+                    self._straight(x, y, 0, dy, gx, gy) is not None):
+                return x, y
+        return None
+
+    def _directions(self, x, y, px, py):
+        """Pruned successor directions of (x, y) reached from (px, py)."""
+        free = self.is_free
+        if px is None:
+            out = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                   if (dx or dy) and free(x + dx, y + dy)]
+            return [(dx, dy) for dx, dy in out
+                    if not (dx and dy) or (free(x + dx, y) and free(x, y + dy))]
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        out = []
+        if dx and dy:
+            fx, fy = free(x + dx, y), free(x, y + dy)
+            if fy:
+                out.append((0, dy))
+            if fx:
+                out.append((dx, 0))
+            if fx and fy:
+                out.append((dx, dy))
+        elif dx:
+            fu, fd = free(x, y + 1), free(x, y - 1)
+            if free(x + dx, y):
+                out.append((dx, 0))
+                if fu and free(x + dx, y + 1):
+                    out.append((dx, 1))
+                if fd and free(x + dx, y - 1):
+                    out.append((dx, -1))
+            if fu:
+                out.append((0, 1))
+            if fd:
+                out.append((0, -1))
+        else:
+            fr, fl = free(x + 1, y), free(x - 1, y)
+            if free(x, y + dy):
+                out.append((0, dy))
+                if fr and free(x + 1, y + dy):
+                    out.append((1, dy))
+                if fl and free(x - 1, y + dy):
+                    out.append((-1, dy))
+            if fr:
+                out.append((1, 0))
+            if fl:
+                out.append((-1, 0))
+        return out
+
+    # ----------------------------------------------------------- search
+    def search(self, start, goal):
+        """Jump points [(x, y), ...] from cell *start* to cell *goal*, or None."""
+        (sx, sy), (gx, gy) = start, goal
+        if not (self.is_free(sx, sy) and self.is_free(gx, gy)):
+            return None
+
+        def h(x, y):
+            ax, ay = abs(x - gx), abs(y - gy)
+            return max(ax, ay) + (SQRT2 - 1.0) * min(ax, ay)
+
+        g, parent, closed = {start: 0.0}, {start: None}, set()
+        heap = [(h(sx, sy), 0.0, start)]
+        while heap:
+            _, g0, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            if node == goal:
+                out = [node]
+                while parent[out[-1]] is not None:
+                    out.append(parent[out[-1]])
+                return out[::-1]
+            closed.add(node)
+            x, y = node
+            px, py = parent[node] or (None, None)
+            for dx, dy in self._directions(x, y, px, py):
+                jp = self._jump(x, y, dx, dy, gx, gy)
+                if jp is None or jp in closed:
+                    continue
+                ax, ay = abs(jp[0] - x), abs(jp[1] - y)
+                ng = g0 + max(ax, ay) + (SQRT2 - 1.0) * min(ax, ay)
+                if ng < g.get(jp, math.inf):
+                    g[jp], parent[jp] = ng, node
+                    heapq.heappush(heap, (ng + h(*jp), ng, jp))
+        return None
+
+# ------------------------------------------------------------------
+# Shared grids
+# ------------------------------------------------------------------
+_GRIDS = {}
+
+def clearance(env):
+    """(H, W) distance (m) from each free ground cell to the nearest building."""
+    key = (env.digest(), "edt")
+    if key not in _GRIDS:
+        _GRIDS[key] = distance_transform_edt(env.top == 0)
+    return _GRIDS[key]
+
+def grid_for(env, margin=0.0):
+    """The cached JumpGrid of *env*, cells within *margin* m of a building blocked."""
+    key = (env.digest(), float(margin))
+    if key not in _GRIDS:
+        blocked = env.top > 0 if margin <= 0 else clearance(env) <= margin
+        _GRIDS[key] = JumpGrid(blocked)
+    return _GRIDS[key]
+
+def plan_jps(start, goal, env, cfg, mode="2D", rng=None, **_):
+    """plan_rrt's signature on the ground map: (N, 3) path, z = 0, or None."""
+    if mode != "2D":
+        raise ValueError("the grid planner plans on the ground map only (mode '2D')")
+    start = np.asarray(start, dtype=float)[:2]
+    goal  = np.asarray(goal, dtype=float)[:2]
+    s = tuple(int(v) for v in np.floor(start))
+    t = tuple(int(v) for v in np.floor(goal))
+    if not (0 <= s[0] < env.width and 0 <= s[1] < env.height and
+            0 <= t[0] < env.width and 0 <= t[1] < env.height):
+        return None
+    margin = float(getattr(cfg, "groundClearance", 0) or 0)
+    cells  = grid_for(env, margin).search(s, t) if margin > 0 else None
+    if cells is None:
+        cells = grid_for(env).search(s, t)
+    if cells is None:
+        return None
+    return cells_to_path(start, cells, goal)
+
+def cells_to_path(start, cells, goal, origin=(0, 0)):
+    """
+    (N, 3) path, z = 0: exact *start*, the centres of the jump-point
+    *cells* (offset by *origin*), exact *goal*.  The centres of the start
+    and goal cells keep the first and last legs on the searched lines.
+    """
+    xy = np.vstack([np.asarray(start, dtype=float)[:2],
+                    np.asarray(cells, dtype=float) + np.asarray(origin) + 0.5,
+                    np.asarray(goal, dtype=float)[:2]])
+    keep = np.concatenate([[True], np.abs(np.diff(xy, axis=0)).sum(axis=1) > 0])
+    xy = xy[keep]
+    return np.column_stack([xy, np.zeros(len(xy))])
@@ -0,0 +1,274 @@
+"""
+hierarchy.py  –  coarse-to-fine planning for large maps
+
+planRRT / plannerRRT sample the whole map, so planning cost grows with its
+area (the 500 m rows of a sweep already plan far slower than the 300 m
+ones) and a 5 km map is out of reach.  Here a plan is made in two passes:
+
+    pyramid   occupied fraction of 2 × 2, 4 × 4, ... blocks of the ground
+              map, built once per environment
+    coarse    a graph of the blocks about COARSE_CELL_M wide: neighbours
+              are linked where a free cell on one side of their common
+              edge faces a free cell on the other (diagonals through two
+              such edges), weighted by distance stretched by
+              OCCUPIED_COST × occupied fraction.  One SciPy Dijkstra
+              towards each goal block serves every start and is cached
+              per environment; the result is a corridor of blocks
+    refine    the corridor is cut into windows of WINDOW_BLOCKS blocks.
+              A window whose straight leg is free (one batched
+              segments_collide call for all of them) is kept as it is;
+              the others are planned at full resolution with JPS, but
+              only inside the window's blocks padded by PAD_BLOCKS[0]
+
+Full-resolution work is thus limited to a few small windows along the
+route, and a plan's cost grows with the length of the route rather than
+the area of the map.  A window that cannot be refined is retried with the
+wider paddings of PAD_BLOCKS; if that fails too, its partly built blocks are
+banned and the corridor is planned again around them (up to MAX_REPAIRS
+times).  Only then do maps of up to
+FULL_GRID_CELLS cells fall back to plain gridplan.plan_jps.
+
+Ground vehicles get the 2-D route (z = 0).  In '3D' mode the drone flies
+the same route at the higher of its start and goal altitudes, leaving the
+start and reaching the exact goal on the first and last legs: the route
+only crosses free ground, so any altitude on it is free, and keeping off
+z = 0 until the goal keeps round-off from pushing it below the map.  A
+drone that starts (or ends) above a roof has no such route and is planned
+with RRT.
+
+    path = plan_hierarchical(start, goal, env, cfg, mode="2D")
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy.ndimage import maximum_filter
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from .collision import segments_collide
+from .gridplan import SQRT2, JumpGrid, cells_to_path, plan_jps
+from .rrt import plan_rrt
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+COARSE_CELL_M    = 16          # (m) target block size of the coarse level
+WINDOW_BLOCKS    = 8           # corridor blocks refined together
+PAD_BLOCKS       = (1, 3, 8)   # blocks of slack around a window, per attempt
+FULL_GRID_CELLS  = 1_000_000   # last resort: full-map JPS up to this size
+OCCUPIED_COST    = 2.0         # coarse edge stretch per unit occupied fraction
+COARSE_CACHE     = 256         # goal blocks whose coarse field is kept
+MAX_REPAIRS      = 4           # corridor re-plans around blocks refinement failed in
+
+# ------------------------------------------------------------------
+# Occupancy pyramid
+# ------------------------------------------------------------------
+class Pyramid:
+    """
+    Occupied fraction of 2^k × 2^k blocks of the ground map, k = 1, 2, ...,
+    and the portal graph of the coarsest level.
+    """
+
+    def __init__(self, env, max_factor=COARSE_CELL_M):
+        self.blocked0 = env.top > 0
+        self.levels   = {}                 # factor -> (H_k, W_k) fraction
+        occ, f = self.blocked0.astype(np.float32), 1
+        while 2 * f <= max_factor and min(occ.shape) > 1:
+            H, W = occ.shape
+            pad = np.ones((H + H % 2, W + W % 2), np.float32)   # outside = built
+            pad[:H, :W] = occ
+            occ = pad.reshape(pad.shape[0] // 2, 2, pad.shape[1] // 2, 2).mean(axis=(1, 3))
+            f  *= 2
+            self.levels[f] = occ
+        self.factor   = f
+        self.fraction = occ
+        self.edges    = self._portals() if f > 1 else None
+
+    def _portals(self):
+        """
+        (i, j, w) edges between blocks that share a free pair of cells
+        across their common side, plus diagonals through two such sides;
+        w is the block distance stretched by the blocks' occupied fraction.
+        """
+        f, (Hc, Wc) = self.factor, self.fraction.shape
+        free = np.zeros((Hc * f, Wc * f), dtype=bool)
+        free[:self.blocked0.shape[0], :self.blocked0.shape[1]] = ~self.blocked0
+        h = (free[:, f - 1:-1:f] & free[:, f::f]).reshape(Hc, f, Wc - 1).any(axis=1)
+        v = (free[f - 1:-1:f, :] & free[f::f, :]).reshape(Hc - 1, Wc, f).any(axis=2)
+        d1 = (h[:-1] & v[:, 1:]) | (v[:, :-1] & h[1:])    # (x, y) -> (x+1, y+1)
+        d2 = (h[:-1] & v[:, :-1]) | (v[:, 1:] & h[1:])    # (x+1, y) -> (x, y+1)
+
+        node = np.arange(Hc * Wc).reshape(Hc, Wc)
+        cost = 1.0 + OCCUPIED_COST * self.fraction.ravel()
+        i, j, w = [], [], []
+        for ok, a, b, step in ((h, node[:, :-1], node[:, 1:], 1.0),
+                               (v, node[:-1, :], node[1:, :], 1.0),
+                               (d1, node[:-1, :-1], node[1:, 1:], SQRT2),
+                               (d2, node[:-1, 1:], node[1:, :-1], SQRT2)):
+            a, b = a[ok], b[ok]
+            i.append(a); j.append(b)
+            w.append(step * f * (cost[a] + cost[b]) / 2)
+        return np.concatenate(i), np.concatenate(j), np.concatenate(w)
+
+    def graph(self, banned=()):
+        """Sparse coarse graph, edges touching *banned* blocks removed."""
+        i, j, w = self.edges
+        if banned:
+            out = np.zeros(self.fraction.size, dtype=bool)
+            out[[y * self.fraction.shape[1] + x for x, y in banned]] = True
+            keep = ~(out[i] | out[j])
+            i, j, w = i[keep], j[keep], w[keep]
+        n = self.fraction.size
+        return coo_matrix((w, (i, j)), shape=(n, n)).tocsr()
+
+    def block_goal(self, cell):
+        """A free full-resolution cell of coarse block *cell* nearest its centre, or None."""
+        f = self.factor
+        x0, y0 = cell[0] * f, cell[1] * f
+        sub = self.blocked0[y0:y0 + f, x0:x0 + f]
+        free = np.argwhere(~sub)
+        if not len(free):
+            return None
+        c = (np.array(sub.shape) - 1) / 2.0
+        y, x = free[np.argmin(((free - c) ** 2).sum(axis=1))]
+        return int(x0 + x), int(y0 + y)
+
+# ------------------------------------------------------------------
+# Shared pyramids and coarse corridors
+# ------------------------------------------------------------------
+_PYRAMIDS = {}
+_FIELDS   = OrderedDict()
+
+def pyramid_for(env):
+    """The cached occupancy pyramid of *env*."""
+    key = env.digest()
+    if key not in _PYRAMIDS:
+        _PYRAMIDS[key] = Pyramid(env)
+    return _PYRAMIDS[key]
+
+def _field(pyr, goal_block, banned=()):
+    """Dijkstra predecessors of every block towards *goal_block*."""
+    Wc = pyr.fraction.shape[1]
+    _, pred = dijkstra(pyr.graph(banned), directed=False,
+                       indices=goal_block[1] * Wc + goal_block[0],
+                       return_predecessors=True)
+    return pred
+
+def corridor(env, start_block, goal_block, banned=()):
+    """
+    Blocks of the coarse plan from *start_block* to *goal_block*, or None.
+    One Dijkstra per goal block serves every start and is cached (survivors
+    do not move); plans that must avoid *banned* blocks are not cached.
+    """
+    pyr = pyramid_for(env)
+    if banned:
+        pred = _field(pyr, goal_block, banned)
+    else:
+        key = (env.digest(), goal_block)
+        if key in _FIELDS:
+            _FIELDS.move_to_end(key)
+        else:
+            _FIELDS[key] = _field(pyr, goal_block)
+            if len(_FIELDS) > COARSE_CACHE:
+                _FIELDS.popitem(last=False)
+        pred = _FIELDS[key]
+    Wc = pyr.fraction.shape[1]
+    k, goal = start_block[1] * Wc + start_block[0], goal_block[1] * Wc + goal_block[0]
+    out = [k]
+    while k != goal:
+        k = pred[k]
+        if k < 0:
+            return None
+        out.append(k)
+    return [(k % Wc, k // Wc) for k in out]
+
+# ------------------------------------------------------------------
+# Refinement
+# ------------------------------------------------------------------
+def _refine(pyr, blocks, a, b, pad):
+    """Full-resolution JPS from cell *a* to cell *b* inside *blocks* ± *pad*."""
+    f = pyr.factor
+    H, W = pyr.blocked0.shape
+    bl = np.array(blocks)
+    lo = np.maximum(bl.min(axis=0) - pad, 0)
+    hi = bl.max(axis=0) + pad + 1
+    mask = np.zeros((hi[1] - lo[1], hi[0] - lo[0]), dtype=bool)
+    mask[bl[:, 1] - lo[1], bl[:, 0] - lo[0]] = True
+    mask = maximum_filter(mask, size=2 * pad + 1, mode="constant")
+    mask = np.repeat(np.repeat(mask, f, axis=0), f, axis=1)
+
+    x0, y0 = int(lo[0]) * f, int(lo[1]) * f
+    x1, y1 = min(hi[0] * f, W), min(hi[1] * f, H)
+    blocked = pyr.blocked0[y0:y1, x0:x1] | ~mask[:y1 - y0, :x1 - x0]
+    cells = JumpGrid(blocked).search((a[0] - x0, a[1] - y0), (b[0] - x0, b[1] - y0))
+    return None if cells is None else [(x + x0, y + y0) for x, y in cells]
+
+def plan_hierarchical(start, goal, env, cfg, mode="2D", rng=None, **_):
+    """plan_rrt's signature: (N, 3) path or None, via the coarse corridor."""
+    start, goal = np.asarray(start, dtype=float), np.asarray(goal, dtype=float)
+    s = (int(np.floor(start[0])), int(np.floor(start[1])))
+    t = (int(np.floor(goal[0])), int(np.floor(goal[1])))
+    if env.occupied2d(np.array([s, t], dtype=float)).any():
+        # a drone above a roof has no ground route to follow
+        return plan_rrt(start, goal, env, cfg, mode, rng=rng) if mode != "2D" else None
+    pyr = pyramid_for(env)
+    if pyr.factor == 1:
+        xy = plan_jps(start, goal, env, cfg)
+    else:
+        xy = _plan_2d(pyr, env, cfg, start, goal, s, t)
+    if xy is None or mode == "2D":
+        return xy
+    # drone: same ground route at cruise altitude, exact start and goal
+    xy[1:-1, 2] = min(max(start[2], goal[2]), env.depth - 1)
+    xy[0], xy[-1] = start, goal
+    return xy
+
+def _plan_2d(pyr, env, cfg, start, goal, s, t):
+    f = pyr.factor
+    sb, tb, banned = (s[0] // f, s[1] // f), (t[0] // f, t[1] // f), set()
+    for _ in range(MAX_REPAIRS + 1):
+        blocks = corridor(env, sb, tb, banned)
+        if blocks is None:
+            break
+        out    = [start[None, :2]]
+        failed = _follow(pyr, env, blocks, s, start[:2], t, goal[:2], out)
+        if failed is None:
+            xy = np.vstack(out)
+            return np.column_stack([xy, np.zeros(len(xy))])
+        # the corridor squeezes through built-up blocks the window could
+        # not get past: ban those and re-plan the corridor around them
+        banned |= {b for b in failed if pyr.fraction[b[1], b[0]] > 0} - {sb, tb}
+    if env.width * env.height > FULL_GRID_CELLS:
+        return None
+    return plan_jps(start, goal, env, cfg)
+
+def _follow(pyr, env, blocks, s, start, t, goal, out):
+    """
+    Refine *blocks* window by window from cell *s* (point *start*) to cell
+    *t* (point *goal*), appending to *out*.  Returns None once at the goal,
+    else the blocks of the window that could not be refined.
+    """
+    # window ends: every WINDOW_BLOCKS-th block of the corridor (those with
+    # free ground inside the map), then the goal
+    ends  = [i for i in range(WINDOW_BLOCKS, len(blocks) - 1, WINDOW_BLOCKS)
+             if pyr.block_goal(blocks[i]) is not None]
+    cells = [s] + [pyr.block_goal(blocks[i]) for i in ends] + [t]
+    ends  = [0] + ends + [len(blocks) - 1]
+    pts   = np.array(cells, dtype=float) + 0.5
+    pts[0], pts[-1] = start, goal
+    free  = ~segments_collide(env, pts[:-1], pts[1:])
+
+    for w in range(len(cells) - 1):
+        if free[w]:
+            out.append(pts[w + 1:w + 2])
+            continue
+        span = blocks[ends[w]:ends[w + 1] + 1]
+        for pad in PAD_BLOCKS:
+            jp = _refine(pyr, span, cells[w], cells[w + 1], pad)
+            if jp is not None:
+                break
+        else:
+            return span
+        out.append(cells_to_path(pts[w], jp, pts[w + 1])[1:, :2])
+    return None
@@ -0,0 +1,95 @@
+"""
+layered.py  –  climb / cruise / descend routes for the aerial drones
+
+createEnvironment.m extrudes buildings to at most 80 m in a 100 m deep
+map, yet AerialDrone.planPath runs a full plannerRRT in 3-D for every
+survivor, even when flying over the roofs is trivially free.  Here the
+drone first tries analytic routes, in order:
+
+    straight   start -> goal
+    layered    climb (or sink) vertically to a cruise altitude, fly level
+               to above the goal, descend; cruise altitudes tried are the
+               ceiling along the leg, then the ceiling of the whole map,
+               each plus CRUISE_MARGIN_M
+
+All candidates are checked with one batched segments_collide call (four
+legs in all for the common case), the first free one is returned, and
+only when none is free (a ceiling above the map's depth, a start inside a
+building's footprint below its roof, ...) does the plan fall back to
+rrt.plan_rrt.
+
+The ceiling comes from a max-height field built once per environment:
+env.top max-pooled over TILE_M × TILE_M tiles and dilated by one tile, so
+sampling it every TILE_M metres along a leg bounds the roofs of every cell
+the leg crosses.
+
+    path = plan_layered(start, goal, env, cfg, mode="3D")   # (N, 3)
+"""
+
+import numpy as np
+from scipy.ndimage import maximum_filter
+
+from .collision import segments_collide
+from .rrt import plan_rrt
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+TILE_M          = 8        # (m) tile side of the max-height field
+CRUISE_MARGIN_M = 5.0      # (m) cruise this far above the highest roof
+
+# ------------------------------------------------------------------
+# Max-height field
+# ------------------------------------------------------------------
+_CEILINGS = {}
+
+def ceiling_for(env):
+    """(Hc, Wc) highest occupied layer within one tile of each TILE_M tile."""
+    key = env.digest()
+    if key not in _CEILINGS:
+        H, W = env.top.shape
+        Hc, Wc = -(-H // TILE_M), -(-W // TILE_M)
+        pad = np.zeros((Hc * TILE_M, Wc * TILE_M), dtype=env.top.dtype)
+        pad[:H, :W] = env.top
+        tiles = pad.reshape(Hc, TILE_M, Wc, TILE_M).max(axis=(1, 3))
+        _CEILINGS[key] = maximum_filter(tiles, size=3, mode="nearest")
+    return _CEILINGS[key]
+
+def leg_ceiling(env, a, b):
+    """Upper bound (m) on the roofs under the ground track of leg *a* -> *b*."""
+    ceil = ceiling_for(env)
+    n  = int(np.hypot(*(b[:2] - a[:2])) // TILE_M) + 2
+    xy = a[:2] + np.linspace(0.0, 1.0, n)[:, None] * (b[:2] - a[:2])
+    tx = np.clip((xy[:, 0] // TILE_M).astype(int), 0, ceil.shape[1] - 1)
+    ty = np.clip((xy[:, 1] // TILE_M).astype(int), 0, ceil.shape[0] - 1)
+    return float(ceil[ty, tx].max())
+
+# ------------------------------------------------------------------
+# Planner
+# ------------------------------------------------------------------
+def layered_routes(start, goal, env):
+    """Candidate (N, 3) paths, straight line first, then by cruise altitude."""
+    out = [np.array([start, goal])]
+    for roof in sorted({leg_ceiling(env, start, goal), float(ceiling_for(env).max())}):
+        z = roof + CRUISE_MARGIN_M
+        if z >= env.depth:
+            break
+        path = np.array([start, [start[0], start[1], z], [goal[0], goal[1], z], goal])
+        keep = np.concatenate([[True], np.abs(np.diff(path, axis=0)).sum(axis=1) > 0])
+        out.append(path[keep])
+    return out
+
+def plan_layered(start, goal, env, cfg, mode="3D", rng=None, **_):
+    """plan_rrt's signature: the first free layered route, else plan_rrt."""
+    if mode == "2D":
+        raise ValueError("layered routes are for the aerial drones (mode '3D')")
+    start = np.asarray(start, dtype=float)
+    goal  = np.asarray(goal, dtype=float)
+    routes = layered_routes(start, goal, env)
+    legs   = np.cumsum([0] + [len(p) - 1 for p in routes])
+    hit    = segments_collide(env, np.vstack([p[:-1] for p in routes]),
+                              np.vstack([p[1:] for p in routes]))
+    for path, i, j in zip(routes, legs[:-1], legs[1:]):
+        if not hit[i:j].any():
+            return path
+    return plan_rrt(start, goal, env, cfg, mode, rng=rng)
@@ -0,0 +1,338 @@
+"""
+mission.py  –  runRescueMission.m, fixed-step and event-driven
+
+runRescueMission advances simTime by dt = 1 s per tick: every vehicle
+takes a moveStep, assigned vehicles within RESCUE_M (xy) of their survivor
+rescue it, idle vehicles pick a survivor and plan a path, and the figure
+is redrawn with a pause(0.05) – even when nothing happens for minutes of
+simulated time.
+
+    kernel="fixed"   the same tick loop, headless (reference behaviour)
+    kernel="event"   a discrete-event kernel: when a vehicle gets a path,
+                     its waypoint arrival ticks follow analytically from the
+                     leg lengths and speed (moveStep's one-waypoint-per-tick
+                     rule included), so its position at any tick and the
+                     first tick it comes within RESCUE_M of its survivor are
+                     closed-form.  A priority queue then jumps straight
+                     from one "survivor reached" / "retry assignment" event
+                     to the next.
+
+Both kernels share the assignment step and draw planner randomness in the
+same order, so they agree on TimeTaken and distances (to float rounding
+of positions, well within one dt).
+
+    t, rescues, dists = run_rescue_mission(cfg, seed=1)
+
+sweep_job() adapts this to sweep.py's backend interface.
+"""
+
+import heapq
+import warnings
+
+import numpy as np
+
+from .assignment import Assigner
+from .config import config
+from .environment import cached_environment
+from .planning import plan_path, start_blocked
+from .smoothing import smooth_path
+from .vehicles import make_fleet
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+DT           = 1.0       # (s) dt in runRescueMission.m
+MAX_SIM_TIME = 600       # (s) maxSimTime in runRescueMission.m
+RESCUE_M     = 5.0       # (m) xy distance that counts as reaching a survivor
+TOL          = 1e-9      # moveDist >= distToWP slack for float round-off
+
+# runRescueMission.m ignores config.m's fleet fields and builds g1, g2 at
+# 2 m/s and d1, d2 at 4 m/s; sweep jobs use these unless the grid has a
+# NumGround / NumAerial axis.
+MISSION_FLEET = dict(numGround=2, numAerial=2, groundSpeed=2, aerialSpeed=4)
+
+# ------------------------------------------------------------------
+# Shared mission state and assignment step
+# ------------------------------------------------------------------
+class Mission:
+    """Survivors, fleet and the per-tick assignment step of one run."""
+
+    def __init__(self, cfg, env, fleet, rng):
+        self.cfg       = cfg
+        self.env       = env
+        self.fleet     = fleet
+        self.rng       = rng
+        self.assigner  = Assigner(cfg, seed=int(rng.integers(2 ** 31)))
+        # own stream, so smoothing leaves the planner's draws unchanged
+        self.smooth_rng = rng.spawn(1)[0]
+        n              = len(env.survivors)
+        self.rescued   = np.zeros(n, dtype=bool)
+        self.taken     = np.zeros(n, dtype=bool)       # assignedVehicle set
+        # (vehicle, survivor) pairs whose plan failed, kept out of the next
+        # picks until the vehicle plans successfully again
+        self.failed    = np.zeros((len(fleet), n), dtype=bool)
+        self.counts    = np.zeros(len(fleet), dtype=int)
+        self.speed     = fleet.speed
+        self.modes     = fleet.modes
+        self.plan_raw    = np.zeros(len(fleet))    # planned length before / after
+        self.plan_smooth = np.zeros(len(fleet))    # smoothing.py, per vehicle
+
+    def available(self):
+        return ~self.rescued & ~self.taken
+
+    def rescue(self, k, sid):
+        v = self.fleet[k]
+        self.rescued[sid] = True
+        self.taken[sid]   = False
+        v.assigned_survivor = None
+        self.counts[k] += 1
+
+    def _goal(self, v, sid):
+        g = self.env.survivors[sid].copy()
+        g[0] = max(0.0, min(g[0], self.cfg.mapWidth - 1))
+        g[1] = max(0.0, min(g[1], self.cfg.mapHeight - 1))
+        g[2] = 0.0 if v.kind == "ground" else max(0.0, min(g[2], self.cfg.mapDepth - 1))
+        return g
+
+    def assign_step(self, positions, on_path):
+        """
+        Step (3) of the tick for every idle vehicle in id order.  *positions*
+        are the vehicles' current positions, on_path(k, path) installs a new
+        path.  Returns True if a survivor was left for a later tick (goal
+        occupied or planning failed), i.e. the next tick must run it again.
+        """
+        idle  = self.fleet.assigned < 0
+        # a vehicle stuck in a building cannot plan: leave it out of the picks
+        idle &= [not start_blocked(self.env, p, mode)
+                 for p, mode in zip(positions, self.modes)]
+        if not idle.any() or not self.available().any():
+            return False
+        # a vehicle that failed on every open survivor may try them all again
+        spent = idle & ~(self.available() & ~self.failed).any(axis=1)
+        self.failed[spent] = False
+        batch = self.assigner.approach == "hungarian"
+        if batch:
+            picks = self.assigner.assign(positions, self.speed, idle,
+                                         self.env.survivors, self.env.priority,
+                                         self.available(), self.env, self.modes,
+                                         banned=self.failed)
+        retry = False
+        for k in np.flatnonzero(idle):
+            v = self.fleet[k]
+            if batch:
+                sid = picks[k]
+                if sid >= 0 and not self.available()[sid]:
+                    sid = -1
+            else:
+                only = np.zeros(len(self.fleet), dtype=bool); only[k] = True
+                sid  = self.assigner.assign(positions, self.speed, only,
+                                            self.env.survivors, self.env.priority,
+                                            self.available() & ~self.failed[k],
+                                            self.env, self.modes)[k]
+            if sid < 0:
+                continue
+            self.taken[sid], v.assigned_survivor = True, int(sid)
+            goal = self._goal(v, sid)
+            v.position = np.asarray(positions[k], dtype=float)
+
+            if self.env.occupied2d(goal[:2]):
+                path = None                          # goal cell occupied -> skip
+            else:
+                path = plan_path(v, goal, self.env, self.cfg, self.rng)
+                if path is None:
+                    warnings.warn(f"PlanPath failed for UAV {v.id} to Surv {sid + 1}")
+                else:
+                    path, before, after = smooth_path(path, self.env, self.cfg,
+                                                      self.smooth_rng)
+                    self.plan_raw[k]    += before
+                    self.plan_smooth[k] += after
+            if path is None:
+                # unassign so the vehicle does not get stuck
+                self.taken[sid], v.assigned_survivor = False, None
+                self.failed[k, sid] = True
+                retry = True
+                continue
+            self.failed[k] = False
+            on_path(k, path)
+        return retry
+
+# ------------------------------------------------------------------
+# Fixed-step kernel
+# ------------------------------------------------------------------
+def _run_fixed(m):
+    sim_time, fleet = 0.0, m.fleet
+    max_ticks = int(round(MAX_SIM_TIME / DT))
+    for _ in range(max_ticks):
+        sim_time += DT
+        fleet.step(DT)                                           # (1) move
+        sid  = fleet.assigned.copy()                             # (2) rescue
+        busy = np.flatnonzero(sid >= 0)
+        d2   = ((fleet.pos[busy, :2] - m.env.survivors[sid[busy], :2]) ** 2).sum(axis=1)
+        for k in busy[d2 < RESCUE_M ** 2]:
+            if not m.rescued[sid[k]]:
+                m.rescue(k, sid[k])
+        m.assign_step(fleet.pos.copy(),                          # (3) assign
+                      lambda k, p: fleet.set_path(k, p))
+        if m.rescued.all():                                      # (4) done
+            break
+    return sim_time, fleet.dist.tolist()
+
+# ------------------------------------------------------------------
+# Event-driven kernel
+# ------------------------------------------------------------------
+class Schedule:
+    """
+    A path followed from tick t0 under moveStep's rules.  Leg j (from the
+    previous waypoint, or the start position, to waypoint j) takes
+    max(1, ceil(L_j / (speed·dt))) ticks; positions in between are linear.
+    """
+
+    def __init__(self, start, path, speed, t0):
+        pts  = np.vstack([start, path])
+        legs = np.diff(pts, axis=0)
+        self.pts    = pts
+        self.len    = np.linalg.norm(legs, axis=1)
+        step        = speed * DT
+        ticks       = np.maximum(1, np.ceil(self.len / step - TOL)).astype(np.int64)
+        self.arrive = t0 + np.cumsum(ticks)          # tick waypoint j is reached
+        self.t0     = t0
+        self.step   = step
+
+    def at(self, ticks):
+        """(positions (k, 3), distance travelled since t0) at absolute *ticks*."""
+        ticks = np.atleast_1d(ticks)
+        j     = np.searchsorted(self.arrive, ticks)            # leg in progress
+        done  = j >= len(self.arrive)
+        j     = np.minimum(j, len(self.arrive) - 1)
+        start = np.where(j > 0, self.arrive[j - 1], self.t0)
+        s     = np.minimum((ticks - start) * self.step, self.len[j])
+        s     = np.where(done, self.len[j], s)
+        frac  = np.divide(s, self.len[j], out=np.ones_like(s), where=self.len[j] > 0)
+        pos   = self.pts[j] + frac[:, None] * (self.pts[j + 1] - self.pts[j])
+        cum   = np.concatenate([[0.0], np.cumsum(self.len)])
+        return pos, cum[j] + s
+
+    def first_within(self, target_xy, radius, t_max):
+        """First tick in (t0, t_max] whose position is within *radius* (xy)."""
+        ticks = np.arange(self.t0 + 1, min(t_max, self.arrive[-1]) + 1)
+        if ticks.size == 0:
+            return None
+        pos, _ = self.at(ticks)
+        close  = np.flatnonzero(((pos[:, :2] - target_xy) ** 2).sum(axis=1) < radius ** 2)
+        return int(ticks[close[0]]) if close.size else None
+
+
+def _run_event(m):
+    fleet     = m.fleet
+    max_ticks = int(round(MAX_SIM_TIME / DT))
+    sched     = [None] * len(fleet)
+    travelled = np.zeros(len(fleet))              # distance of finished schedules
+    version   = [0] * len(fleet)
+    queue     = [(1, 1, -1, -1, 0)]               # (tick, kind, vehicle, survivor, version)
+    RESCUE, ASSIGN = 0, 1
+
+    def position(k, t):
+        if sched[k] is None:
+            return fleet[k].position
+        return sched[k].at(t)[0][0]
+
+    def on_path(k, path, t):
+        if sched[k] is not None:
+            travelled[k] += sched[k].at(t)[1][0]
+        start = position(k, t)
+        sched[k] = Schedule(start, path, fleet[k].speed, t)
+        version[k] += 1
+        sid = fleet[k].assigned_survivor
+        hit = sched[k].first_within(m.env.survivors[sid, :2], RESCUE_M, max_ticks)
+        if hit is not None:
+            heapq.heappush(queue, (hit, RESCUE, k, sid, version[k]))
+
+    t = 0
+    while queue:
+        t = queue[0][0]
+        if t > max_ticks:
+            break
+        need_assign = False
+        while queue and queue[0][0] == t:
+            _, kind, k, sid, ver = heapq.heappop(queue)
+            if kind == RESCUE:
+                if ver == version[k] and fleet[k].assigned_survivor == sid:
+                    m.rescue(k, sid)
+                    need_assign = True
+            else:
+                need_assign = True
+        if need_assign:
+            pos = np.array([position(k, t) for k in range(len(fleet))])
+            if m.assign_step(pos, lambda k, p: on_path(k, p, t)):
+                heapq.heappush(queue, (t + 1, ASSIGN, -1, -1, 0))
+        if m.rescued.all():
+            break
+    else:
+        t = max_ticks                              # nothing left to happen
+    if not m.rescued.all():
+        t = max_ticks
+
+    dist = [travelled[k] + (sched[k].at(t)[1][0] if sched[k] is not None else 0.0)
+            for k in range(len(fleet))]
+    return t * DT, dist
+
+# ------------------------------------------------------------------
+# Entry points
+# ------------------------------------------------------------------
+def run_rescue_mission(cfg=None, env=None, seed=0, kernel="event", fleet=None,
+                       stats=None):
+    """
+    (timeTaken, uavRescueCounts, uavDistances) as runRescueMission.m, one
+    entry per vehicle in UAV-id order.  The fleet is built from cfg
+    (numGround, numAerial, groundSpeed, aerialSpeed) unless given.  *seed*
+    drives planning and assignment; the environment comes from
+    cached_environment (fixed ENV_SEED, as createEnvironment.m).  A *stats*
+    dict receives per-vehicle planned path lengths before and after
+    smoothing ("plan_raw", "plan_smooth").
+    """
+    cfg   = cfg or config()
+    env   = env if env is not None else cached_environment(cfg)
+    fleet = fleet if fleet is not None else make_fleet(cfg, env)
+    m     = Mission(cfg, env, fleet, np.random.default_rng(seed))
+    t, dist = (_run_event if kernel == "event" else _run_fixed)(m)
+    if stats is not None:
+        stats["plan_raw"]    = m.plan_raw.tolist()
+        stats["plan_smooth"] = m.plan_smooth.tolist()
+    return t, m.counts.tolist(), [float(d) for d in dist]
+
+def job_config(job):
+    """
+    cfg for one sweep grid row (runSingleExperiment.m's field mapping); an
+    optional PathCache / PathCacheDir key turns on the shared path cache.
+    """
+    fleet = dict(MISSION_FLEET,
+                 numGround=int(job.get("NumGround", MISSION_FLEET["numGround"])),
+                 numAerial=int(job.get("NumAerial", MISSION_FLEET["numAerial"])))
+    return config(mapWidth=job["MapWidth"], mapHeight=job["MapHeight"],
+                  numBuildings=job["NumBuildings"], numSurvivors=job["NumSurvivors"],
+                  useRRTStar=bool(job["useRRTStar"]),
+                  centroidApproach=job["Approach"] == "centroid",
+                  kmeansApproach=job["Approach"] == "kmeans",
+                  hungarianApproach=job["Approach"] == "hungarian",
+                  pathCache=bool(job.get("PathCache", False)),
+                  pathCacheDir=job.get("PathCacheDir"), **fleet)
+
+def sweep_job(job, kernel="event"):
+    """
+    sweep.py backend: one grid row -> TimeTaken, UAV<i>resc, UAV<i>dist,
+    the planned lengths UAV<i>planraw / UAV<i>plansmooth, and their totals
+    PlanLenRaw / PlanLenSmooth.
+    """
+    cfg, stats = job_config(job), {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        t, counts, dist = run_rescue_mission(cfg, seed=int(job["Seed"]),
+                                             kernel=kernel, stats=stats)
+    out = {"TimeTaken": t}
+    for i, (c, d) in enumerate(zip(counts, dist), start=1):
+        out[f"UAV{i}resc"], out[f"UAV{i}dist"] = c, d
+        out[f"UAV{i}planraw"]    = stats["plan_raw"][i - 1]
+        out[f"UAV{i}plansmooth"] = stats["plan_smooth"][i - 1]
+    out["PlanLenRaw"]    = float(sum(stats["plan_raw"]))
+    out["PlanLenSmooth"] = float(sum(stats["plan_smooth"]))
+    return out
@@ -0,0 +1,176 @@
+"""
+path_cache.py  –  reuse planned paths across assignments and sweep runs
+
+runRescueMission plans from scratch every time a vehicle goes idle, and
+a sweep replays the same environment (createEnvironment's fixed seed) for
+every seed × planner × approach, so near-identical start/goal pairs are
+planned over and over.  PathCache keys a path by
+
+    (vehicle type, planner, start cell, goal cell, Environment.digest())
+
+with start/goal snapped to CELL_M cells, and keeps it in two tiers:
+
+    memory  LRU bounded by MAX_ENTRIES paths and MAX_BYTES of waypoints
+    disk    one .npy per key under cache_dir/<env digest>/ (optional)
+
+A hit is never trusted blindly: the cached waypoints get the caller's exact
+start and goal as end points and the whole path is re-checked with one
+batched collision query (collision.segments_collide); a path that fails is
+dropped and reported as a miss.
+
+    cache = PathCache(cache_dir="sweep/paths")
+    plan  = cache.wrap(plan_rrt)          # same signature as plan_rrt
+    path  = plan(start, goal, env, cfg, mode="2D")
+
+planning.plan_path puts the process-wide shared_cache(cfg.pathCacheDir) in
+front of every planner when cfg.pathCache is set, so missions, sweeps and
+batches reuse paths across assignments and across the jobs a worker runs.
+"""
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .collision import segments_collide
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+CELL_M      = 1.0              # (m) start / goal discretisation
+MAX_ENTRIES = 4096
+MAX_BYTES   = 64 * 2 ** 20     # waypoint payload of the memory tier
+
+# ------------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------------
+def _cell(p, size):
+    return tuple(int(v) for v in np.floor(np.asarray(p, dtype=float) / size))
+
+def planner_tag(cfg, mode):
+    """Vehicle type, its planner and the planner settings a path depends on."""
+    kind = "ground" if mode == "2D" else "aerial"
+    star = bool(getattr(cfg, "useRRTStar", False))
+    return (kind, getattr(cfg, f"{kind}Planner", "rrt"),
+            "rrtstar" if star else getattr(cfg, "rrtPlannerType", "rrt"),
+            float(cfg.rrtStepSize), float(cfg.rrtGoalBias), int(cfg.rrtMaxIterations),
+            int(getattr(cfg, "rrtStarIterations", 0)) if star else 0,
+            getattr(cfg, "rrtTimeBudget", None),
+            float(getattr(cfg, "groundClearance", 0) or 0) if kind == "ground" else 0.0)
+
+
+class PathCache:
+    """Size-bounded in-memory LRU of planned paths with an optional disk tier."""
+
+    def __init__(self, cache_dir=None, max_entries=MAX_ENTRIES,
+                 max_bytes=MAX_BYTES, cell=CELL_M):
+        self.dir         = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.cell        = cell
+        self._mem        = OrderedDict()
+        self._bytes      = 0
+        self.hits = self.misses = self.rejected = 0
+
+    # ------------------------------------------------------------ keys
+    def key(self, start, goal, env, tag):
+        return (tag, _cell(start, self.cell), _cell(goal, self.cell), env.digest())
+
+    def _file(self, key):
+        tag, s, g, digest = key
+        name = hashlib.sha1(repr((tag, s, g)).encode()).hexdigest()[:20]
+        return self.dir / digest[:16] / f"{name}.npy"
+
+    # ----------------------------------------------------------- tiers
+    def _remember(self, key, path):
+        if key in self._mem:
+            self._bytes -= self._mem.pop(key).nbytes
+        self._mem[key] = path
+        self._bytes   += path.nbytes
+        while self._mem and (len(self._mem) > self.max_entries or
+                             self._bytes > self.max_bytes):
+            _, old = self._mem.popitem(last=False)
+            self._bytes -= old.nbytes
+
+    def _forget(self, key):
+        if key in self._mem:
+            self._bytes -= self._mem.pop(key).nbytes
+        if self.dir is not None:
+            self._file(key).unlink(missing_ok=True)
+
+    def _lookup(self, key):
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return self._mem[key]
+        if self.dir is not None:
+            f = self._file(key)
+            if f.exists():
+                path = np.load(f)
+                self._remember(key, path)
+                return path
+        return None
+
+    # ------------------------------------------------------------- API
+    def get(self, start, goal, env, tag):
+        """Validated path for *start* -> *goal*, or None on a miss."""
+        key  = self.key(start, goal, env, tag)
+        path = self._lookup(key)
+        if path is None:
+            self.misses += 1
+            return None
+
+        path = path.copy()
+        dim  = 2 if tag[0] == "ground" else 3
+        path[0, :dim]  = np.asarray(start, dtype=float)[:dim]
+        path[-1, :dim] = np.asarray(goal,  dtype=float)[:dim]
+        legs = path[:, :dim]
+        if len(legs) > 1 and segments_collide(env, legs[:-1], legs[1:]).any():
+            self._forget(key)
+            self.rejected += 1
+            self.misses   += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, start, goal, env, tag, path):
+        if path is None or len(path) == 0:
+            return
+        key  = self.key(start, goal, env, tag)
+        path = np.asarray(path, dtype=float)
+        self._remember(key, path)
+        if self.dir is not None:
+            f = self._file(key)
+            f.parent.mkdir(parents=True, exist_ok=True)
+            tmp = f.with_suffix(".tmp.npy")
+            np.save(tmp, path)
+            tmp.replace(f)
+
+    def wrap(self, planner):
+        """planner(start, goal, env, cfg, mode=..., **kw) with this cache in front."""
+        def plan(start, goal, env, cfg, mode="3D", **kw):
+            tag  = planner_tag(cfg, mode)
+            path = self.get(start, goal, env, tag)
+            if path is None:
+                path = planner(start, goal, env, cfg, mode=mode, **kw)
+                self.put(start, goal, env, tag, path)
+            return path
+        plan.cache = self
+        return plan
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "rejected": self.rejected, "entries": len(self._mem),
+                "bytes": self._bytes}
+
+# ------------------------------------------------------------------
+# Shared caches
+# ------------------------------------------------------------------
+_SHARED = {}
+
+def shared_cache(cache_dir=None):
+    """The process-wide PathCache of *cache_dir* (None = memory tier only)."""
+    key = None if cache_dir is None else str(cache_dir)
+    if key not in _SHARED:
+        _SHARED[key] = PathCache(cache_dir)
+    return _SHARED[key]
@@ -0,0 +1,59 @@
+"""
+planning.py  –  planPath dispatch for the simulated vehicles
+
+GroundVehicle.planPath / AerialDrone.planPath in one place: the ground
+vehicle plans in 2-D on the ground map, the drone in 3-D, both with the
+array-backed RRT (rrt.py) unless cfg selects another planner by name:
+
+    cfg.groundPlanner   "rrt" | "jps" (grid A* + Jump Point Search, gridplan.py)
+                        | "hier" (coarse-to-fine for large maps, hierarchy.py)
+                        | "roadmap" (shared per-environment roadmap, roadmap.py)
+    cfg.aerialPlanner   "rrt" | "hier" | "roadmap"
+                        | "layered" (climb / cruise / descend over the roofs,
+                        layered.py, RRT only when no such route is free)
+
+With cfg.pathCache the planner is wrapped in path_cache.shared_cache (disk
+tier under cfg.pathCacheDir, if set), so repeated start / goal cells on
+one environment are served from the cache.  Off by default: a hit skips
+the planner's random draws, so cached runs do not replay uncached ones.
+"""
+
+import numpy as np
+
+from .gridplan import plan_jps
+from .hierarchy import plan_hierarchical
+from .layered import plan_layered
+from .path_cache import shared_cache
+from .roadmap import plan_roadmap
+from .rrt import plan_rrt
+
+# ------------------------------------------------------------------
+# Planners by name
+# ------------------------------------------------------------------
+PLANNERS = {
+    "rrt": plan_rrt,
+    "jps": plan_jps,
+    "hier": plan_hierarchical,
+    "layered": plan_layered,
+    "roadmap": plan_roadmap,
+}
+
+def start_blocked(env, position, mode):
+    """True if *position* is no valid start state ('2D': its ground cell)."""
+    position = np.asarray(position, dtype=float)
+    if mode == "2D":
+        return bool(env.occupied2d(position[None, :2])[0])
+    return bool(env.occupied3d(position[None, :3])[0])
+
+def plan_path(vehicle, goal, env, cfg, rng=None):
+    """(N, 3) path for *vehicle* from its position to *goal*, or None."""
+    name  = getattr(cfg, f"{vehicle.kind}Planner", "rrt")
+    start = np.asarray(vehicle.position, dtype=float)
+    if vehicle.mode == "2D":
+        start = np.array([start[0], start[1], 0.0])
+    if start_blocked(env, start, vehicle.mode):
+        return None      # plannerRRT rejects an invalid start state outright
+    plan = PLANNERS[name]
+    if getattr(cfg, "pathCache", False):
+        plan = shared_cache(getattr(cfg, "pathCacheDir", None)).wrap(plan)
+    return plan(start, goal, env, cfg, mode=vehicle.mode, rng=rng)
@@ -0,0 +1,165 @@
+"""
+roadmap.py  –  multi-goal planning on a shared probabilistic roadmap
+
+pickSurvivor chooses one survivor and planPath then grows a fresh RRT to
+that single goal; the next assignment starts again from nothing, and the
+assignment step only ever sees straight-line distances.  The environment
+is static, so each vehicle class (ground '2D' / aerial '3D') shares one
+roadmap per environment instead:
+
+    build     sample free nodes, link each to its K_NEAREST neighbours
+              within CONNECT_M (one batched collision query for all
+              candidate edges)  -> sparse weighted graph
+    query     attach the vehicle position and every goal to their visible
+              nearest nodes (plus direct start -> goal links when free),
+              then a single Dijkstra from the start gives the path length
+              and waypoints to every goal at once; goals are sinks (edges
+              only lead into them), so no path runs through another goal
+              and each cost is what the single-goal query would find
+
+Roadmaps are cached per (Environment.digest(), mode, node count) in an
+LRU of ROADMAP_CACHE graphs, so the whole fleet and every later assignment
+reuse the same graph.  The same roadmap both prices assignments
+(assignment.cost_matrix, metric "path") and, as planning.PLANNERS
+"roadmap", plans the path to the chosen survivor.
+
+    costs, paths = plan_many(start, survivor_xyz, env, cfg, mode="2D")
+
+Unreachable goals get cost inf and path None.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+from .collision import segments_collide
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+NODE_SPACING_M = 12.0      # (m) mean spacing of roadmap nodes in x/y
+AERIAL_LAYERS  = 3         # aerial roadmaps get this many × more nodes
+MAX_NODES      = 20_000
+K_NEAREST      = 10        # neighbours tried per node
+CONNECT_M      = 40.0      # (m) longest roadmap edge
+ROADMAP_SEED   = 0
+ROADMAP_CACHE  = 16        # roadmaps kept (one per environment and mode)
+
+# ------------------------------------------------------------------
+# Roadmap
+# ------------------------------------------------------------------
+class Roadmap:
+    """Free-space nodes and collision-free edges for one vehicle class."""
+
+    def __init__(self, env, mode="2D", n_nodes=None, seed=ROADMAP_SEED):
+        self.env = env
+        self.dim = 2 if mode == "2D" else 3
+        if n_nodes is None:
+            n_nodes = int(env.width * env.height / NODE_SPACING_M ** 2)
+            n_nodes *= AERIAL_LAYERS if self.dim == 3 else 1
+        self.nodes = self._sample(min(n_nodes, MAX_NODES),
+                                  np.random.default_rng(seed))
+        self.kd    = cKDTree(self.nodes)
+        self.i, self.j, self.w = self._link(self.nodes, skip_self=True)
+
+    def _sample(self, n, rng):
+        hi  = np.array([self.env.width, self.env.height, self.env.depth][:self.dim],
+                       dtype=float)
+        out = np.empty((0, self.dim))
+        occupied = self.env.occupied2d if self.dim == 2 else self.env.occupied3d
+        while len(out) < n:
+            cand = rng.random((2 * (n - len(out)) + 16, self.dim)) * hi
+            out  = np.vstack([out, cand[~occupied(cand)]])
+        return out[:n]
+
+    def _link(self, points, skip_self=False):
+        """(i, j, length) of free edges points[i] -> nodes[j] among K nearest."""
+        k = min(K_NEAREST + (1 if skip_self else 0), len(self.nodes))
+        dist, nbr = self.kd.query(points, k=k, distance_upper_bound=CONNECT_M)
+        dist, nbr = dist.reshape(len(points), -1), nbr.reshape(len(points), -1)
+        src = np.repeat(np.arange(len(points)), nbr.shape[1])
+        dst = nbr.ravel()
+        d   = dist.ravel()
+        ok  = np.isfinite(d)
+        src, dst, d = src[ok], dst[ok], d[ok]
+        if skip_self:
+            # node-node edges: drop self loops and keep each pair once
+            lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+            _, first = np.unique(lo * len(self.nodes) + hi, return_index=True)
+            first = first[lo[first] != hi[first]]
+            src, dst, d = lo[first], hi[first], d[first]
+        free = ~segments_collide(self.env, points[src], self.nodes[dst])
+        return src[free], dst[free], d[free]
+
+    # -------------------------------------------------------------- query
+    def query(self, start, goals):
+        """
+        (costs (G,), paths [ (N, 3) array | None ]) from *start* to every goal
+        with one Dijkstra run on the roadmap augmented by start and goals.
+        """
+        start = np.asarray(start, dtype=float)[:self.dim]
+        goals = np.atleast_2d(np.asarray(goals, dtype=float))[:, :self.dim]
+        n, g  = len(self.nodes), len(goals)
+        s_id  = n
+        g_ids = n + 1 + np.arange(g)
+
+        # roadmap edges both ways, start -> nodes, nodes -> goals
+        rows, cols, wts = [self.i, self.j], [self.j, self.i], [self.w, self.w]
+        a, b, w = self._link(start[None, :])
+        rows.append(np.full(len(a), s_id)); cols.append(b); wts.append(w)
+        a, b, w = self._link(goals)
+        rows.append(b); cols.append(g_ids[a]); wts.append(w)
+        # direct start -> goal hops (short legs need no roadmap at all)
+        d    = np.linalg.norm(goals - start, axis=1)
+        free = ~segments_collide(self.env, np.broadcast_to(start, goals.shape), goals)
+        rows.append(np.full(free.sum(), s_id)); cols.append(g_ids[free]); wts.append(d[free])
+
+        r, c, w = map(np.concatenate, (rows, cols, wts))
+        w = np.maximum(w, 1e-9)                  # zero weight would mean "no edge"
+        size  = n + 1 + g
+        graph = coo_matrix((w, (r, c)), shape=(size, size)).tocsr()
+        dist, pred = dijkstra(graph, directed=True, indices=s_id,
+                              return_predecessors=True)
+
+        pts   = np.vstack([self.nodes, start[None, :], goals])
+        paths = []
+        for gid in g_ids:
+            if not np.isfinite(dist[gid]):
+                paths.append(None)
+                continue
+            chain = [gid]
+            while chain[-1] != s_id:
+                chain.append(pred[chain[-1]])
+            p = pts[chain[::-1]]
+            if self.dim == 2:
+                p = np.column_stack([p, np.zeros(len(p))])
+            paths.append(p)
+        return dist[g_ids], paths
+
+# ------------------------------------------------------------------
+# Shared roadmaps
+# ------------------------------------------------------------------
+_ROADMAPS = OrderedDict()
+
+def roadmap_for(env, mode="2D", n_nodes=None):
+    """The cached roadmap of *env* for one vehicle class."""
+    key = (env.digest(), mode, n_nodes)
+    if key in _ROADMAPS:
+        _ROADMAPS.move_to_end(key)
+    else:
+        _ROADMAPS[key] = Roadmap(env, mode, n_nodes)
+        while len(_ROADMAPS) > ROADMAP_CACHE:
+            _ROADMAPS.popitem(last=False)
+    return _ROADMAPS[key]
+
+def plan_many(start, goals, env, cfg=None, mode="2D"):
+    """Path lengths and waypoints from *start* to every goal (one graph search)."""
+    return roadmap_for(env, mode).query(start, goals)
+
+def plan_roadmap(start, goal, env, cfg=None, mode="3D", **_):
+    """Single-goal form with plan_rrt's signature: (N, 3) path or None."""
+    _, paths = plan_many(start, [goal], env, cfg, mode)
+    return paths[0]
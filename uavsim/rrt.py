@@ -0,0 +1,310 @@
+"""
+rrt.py  –  array-backed RRT / RRT* (pathPlanning/planRRT.m)
+
+planRRT.m keeps the tree as a struct array grown with treeNodes(end+1),
+and findNearest scans every node with norm() on each of up to
+rrtMaxIterations expansions – O(n²) per plan.  Here
+
+    Tree       positions (N × dim), parent index and cost-to-come arrays,
+               preallocated for rrtMaxIterations + 2 nodes
+    NodeIndex  cKDTree over the first nodes plus a brute-force block of the
+               newest ones; rebuilt when that block reaches REBUILD_FRAC of
+               the tree, so nearest / within-radius queries are O(log n)
+               amortised
+
+The search itself follows planRRT.m: goal-biased sampling (rrtGoalBias),
+extension by rrtStepSize, collision check of the new edge (collision.py),
+stop once a node is within REACH_M of the goal, then a final link to the
+exact goal if it is free.  With star=True the new node takes the cheapest
+collision-free parent within the RRT* radius and rewires its neighbours
+(one batched edge check, subtree costs pushed down level by level).
+
+RRT* runs anytime: after the first solution it keeps refining until its
+budget – cfg.rrtStarIterations iterations and/or cfg.rrtTimeBudget
+seconds – is spent, then returns the cheapest path so far.  The wall-clock
+budget is a hard stop (None if nothing was found by then); the iteration
+budget only ends the refinement, so a hard search still gets up to
+rrtMaxIterations to find its first path.  The tree is kept, and
+RRT.plan() can be called again to improve on the same search.
+
+Paths come back as (N, 3) arrays, z = 0 in '2D' mode, or None if no path
+was found.
+"""
+
+import math
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .collision import segments_collide, segment_collides
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+REACH_M      = 5.0     # (m) "close enough" to the goal, as reachThreshold
+REBUILD_MIN  = 64      # nodes kept outside the KD-tree before a rebuild ...
+REBUILD_FRAC = 0.25    # ... or this fraction of the tree, whichever is larger
+GAMMA_STAR   = 2.0     # RRT* radius factor (× rrtStepSize)
+
+# ------------------------------------------------------------------
+# Tree storage and nearest-neighbour index
+# ------------------------------------------------------------------
+class Tree:
+    """Preallocated node arrays; node 0 is the root."""
+
+    def __init__(self, root, capacity):
+        root = np.asarray(root, dtype=float)
+        self.pos    = np.empty((capacity, len(root)))
+        self.parent = np.full(capacity, -1, dtype=np.int64)
+        self.cost   = np.zeros(capacity)
+        self.pos[0] = root
+        self.n      = 1
+
+    def add(self, p, parent, cost):
+        if self.n == len(self.pos):                      # rare: grow by doubling
+            k = len(self.pos)
+            self.pos    = np.vstack([self.pos, np.empty_like(self.pos)])
+            self.parent = np.concatenate([self.parent, np.full(k, -1, np.int64)])
+            self.cost   = np.concatenate([self.cost, np.zeros(k)])
+        i = self.n
+        self.pos[i], self.parent[i], self.cost[i] = p, parent, cost
+        self.n += 1
+        return i
+
+    def path_to(self, i):
+        """Positions from the root to node *i*."""
+        chain = []
+        while i >= 0:
+            chain.append(i)
+            i = self.parent[i]
+        return self.pos[chain[::-1]]
+
+
+class NodeIndex:
+    """Nearest / radius queries over a growing Tree."""
+
+    def __init__(self, tree):
+        self.tree  = tree
+        self.kd    = None
+        self.split = 0                 # nodes [0, split) are in the KD-tree
+
+    def _refresh(self):
+        pending = self.tree.n - self.split
+        if pending > max(REBUILD_MIN, REBUILD_FRAC * self.split):
+            self.kd    = cKDTree(self.tree.pos[:self.tree.n])
+            self.split = self.tree.n
+
+    def nearest(self, p):
+        """(index, distance) of the node closest to *p*."""
+        self._refresh()
+        best_i, best_d = -1, math.inf
+        if self.kd is not None:
+            best_d, best_i = self.kd.query(p)
+        tail = self.tree.pos[self.split:self.tree.n]
+        if len(tail):
+            d = np.sqrt(((tail - p) ** 2).sum(axis=1))
+            j = int(d.argmin())
+            if d[j] < best_d:
+                best_i, best_d = self.split + j, d[j]
+        return int(best_i), float(best_d)
+
+    def near(self, p, r):
+        """Indices of all nodes within distance *r* of *p*."""
+        self._refresh()
+        out = []
+        if self.kd is not None:
+            out = self.kd.query_ball_point(p, r)
+        tail = self.tree.pos[self.split:self.tree.n]
+        d    = np.sqrt(((tail - p) ** 2).sum(axis=1))
+        return np.concatenate([np.asarray(out, dtype=np.int64),
+                               self.split + np.flatnonzero(d <= r)])
+
+# ------------------------------------------------------------------
+# Planner
+# ------------------------------------------------------------------
+class RRT:
+    """
+    One search tree rooted at *start*.  grow() runs the planRRT loop; the
+    tree (and its index) can be kept and queried again afterwards.
+    """
+
+    def __init__(self, start, env, cfg, mode="3D", star=None, rng=None):
+        self.dim  = 2 if mode == "2D" else 3
+        self.env  = env
+        self.cfg  = cfg
+        self.star = (getattr(cfg, "useRRTStar", False) or
+                     getattr(cfg, "rrtPlannerType", "rrt") == "rrtstar") \
+                    if star is None else star
+        self.rng  = rng if rng is not None else np.random.default_rng()
+        self.step = float(cfg.rrtStepSize)
+        self.hi   = np.array([cfg.mapWidth, cfg.mapHeight, cfg.mapDepth][:self.dim],
+                             dtype=float)
+        self.tree  = Tree(np.asarray(start, dtype=float)[:self.dim],
+                          int(cfg.rrtMaxIterations) + 2)
+        self.index = NodeIndex(self.tree)
+        self._children = [[]] if self.star else None
+        self.best  = -1                # node of the cheapest goal hit so far
+
+    # --------------------------------------------------------- helpers
+    def _free(self, a, b):
+        """(k,) bool: edges a[k] -> b[k] are collision-free."""
+        return ~segments_collide(self.env, np.atleast_2d(a), np.atleast_2d(b))
+
+    def _sample(self, goal):
+        if self.rng.random() < self.cfg.rrtGoalBias:
+            return goal
+        return self.rng.random(self.dim) * self.hi
+
+    def _steer(self, p, q):
+        d = q - p
+        n = math.sqrt(float(d @ d))
+        return q if n < self.step else p + (self.step / n) * d
+
+    def _radius(self):
+        """Shrinking RRT* neighbourhood, clamped to [step, GAMMA_STAR × step]."""
+        d, n = self.dim, self.tree.n + 1
+        ball  = math.pi if d == 2 else 4.0 / 3.0 * math.pi
+        gamma = 2 * (1 + 1 / d) ** (1 / d) * (float(np.prod(self.hi)) / ball) ** (1 / d)
+        r = gamma * (math.log(n) / n) ** (1 / d)
+        return min(max(r, self.step), GAMMA_STAR * self.step)
+
+    def _add(self, p, parent, cost):
+        i = self.tree.add(p, parent, cost)
+        if self.star:
+            self._children.append([])
+            self._children[parent].append(i)
+        return i
+
+    def _rewire(self, nodes, new_parent, new_cost):
+        """
+        Move *nodes* under *new_parent* and push each one's cost change
+        down its subtree, one array update per tree level.  The subtrees
+        are disjoint once the nodes are moved (new_parent is a fresh leaf).
+        """
+        t, kids = self.tree, self._children
+        for j in nodes.tolist():
+            kids[t.parent[j]].remove(j)
+        kids[new_parent].extend(nodes.tolist())
+        t.parent[nodes] = new_parent
+        level, delta = nodes, new_cost - t.cost[nodes]
+        while len(level):
+            t.cost[level] += delta
+            counts = [len(kids[j]) for j in level.tolist()]
+            if not sum(counts):
+                break
+            level = np.fromiter((c for j in level.tolist() for c in kids[j]),
+                                dtype=np.int64, count=sum(counts))
+            delta = np.repeat(delta, counts)
+
+    def _extend_star(self, near_i, new):
+        """RRT* insertion: cheapest free parent, then rewire the neighbours."""
+        t    = self.tree
+        nbrs = self.index.near(new, self._radius())
+        nbrs = nbrs[nbrs != near_i]
+        cand = np.concatenate([[near_i], nbrs])
+        dist = np.linalg.norm(t.pos[cand] - new, axis=1)
+        cost = t.cost[cand] + dist
+        # cheapest parent first; usually the first candidate is already free
+        for k in np.argsort(cost, kind="stable").tolist():
+            if not segment_collides(self.env, t.pos[cand[k]], new):
+                break
+        else:
+            return -1
+        i = self._add(new, int(cand[k]), float(cost[k]))
+
+        if len(nbrs):
+            d_n   = np.linalg.norm(t.pos[nbrs] - new, axis=1)
+            gain  = t.cost[i] + d_n < t.cost[nbrs] - 1e-9
+            cands = nbrs[gain]
+            if len(cands):
+                ok = self._free(np.broadcast_to(new, (len(cands), self.dim)), t.pos[cands])
+                if ok.any():
+                    self._rewire(cands[ok], i, t.cost[i] + d_n[gain][ok])
+        return i
+
+    # ------------------------------------------------------------ search
+    def grow(self, goal, max_iter=None, refine_iter=None, deadline=None):
+        """
+        Run the planRRT loop towards *goal*; returns the index of the node
+        that reached it (within REACH_M) or -1.  Plain RRT stops at the first
+        hit.  RRT* keeps the cheapest hit and goes on until *max_iter*
+        iterations, or *refine_iter* iterations once it has a hit, or the
+        time.perf_counter() *deadline* – whichever comes first.  Calling
+        it again continues the same search.
+        """
+        goal  = np.asarray(goal, dtype=float)[:self.dim]
+        t     = self.tree
+        limit = int(max_iter or self.cfg.rrtMaxIterations)
+        first = 0 if self.best >= 0 else None      # iteration of the first hit
+        for it in range(limit):
+            if deadline is not None and not it % 16 and time.perf_counter() >= deadline:
+                break
+            if refine_iter is not None and first is not None and it - first >= refine_iter:
+                break
+            sample = self._sample(goal)
+            near_i, _ = self.index.nearest(sample)
+            new = self._steer(t.pos[near_i], sample)
+
+            if self.star:
+                i = self._extend_star(near_i, new)
+                if i < 0:
+                    continue
+            else:
+                if segment_collides(self.env, t.pos[near_i], new):
+                    continue
+                i = self._add(new, near_i,
+                              t.cost[near_i] + float(np.linalg.norm(new - t.pos[near_i])))
+
+            if np.linalg.norm(new - goal) < REACH_M:
+                if not self.star:
+                    self.best = i
+                    return i
+                if self.best < 0:
+                    first = it
+                if self.best < 0 or t.cost[i] < t.cost[self.best]:
+                    self.best = i
+        if self.star and self.best >= 0:   # rewiring may since have cheapened another hit
+            hits = np.flatnonzero(np.linalg.norm(t.pos[:t.n] - goal, axis=1) < REACH_M)
+            self.best = int(hits[np.argmin(t.cost[hits])])
+        return self.best
+
+    def plan(self, goal, iterations=None, seconds=None):
+        """
+        Anytime search: (N, 3) path to *goal* or None.  RRT* refines for
+        *iterations* (default cfg.rrtStarIterations) once a path exists and
+        stops after *seconds* (default cfg.rrtTimeBudget) in any case; call
+        again to keep improving the same tree.
+        """
+        if iterations is None and self.star:
+            iterations = getattr(self.cfg, "rrtStarIterations", None)
+        if seconds is None:
+            seconds = getattr(self.cfg, "rrtTimeBudget", None)
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        i = self.grow(goal, refine_iter=iterations, deadline=deadline)
+        return None if i < 0 else self.path(i, goal)
+
+    def path(self, i, goal):
+        """(N, 3) waypoints root -> node *i*, plus *goal* if it can be linked."""
+        goal = np.asarray(goal, dtype=float)[:self.dim]
+        pts  = self.tree.path_to(i)
+        if not segment_collides(self.env, pts[-1], goal):
+            pts = np.vstack([pts, goal])
+        if self.dim == 2:
+            pts = np.column_stack([pts, np.zeros(len(pts))])
+        return pts
+
+
+def plan_rrt(start, goal, env, cfg, mode="3D", star=None, rng=None):
+    """planRRT.m equivalent: (N, 3) path from *start* to *goal*, or None."""
+    rrt  = RRT(start, env, cfg, mode, star, rng)
+    path = rrt.plan(goal)
+    if path is None and cfg.debug:
+        print(f"RRT: No path after {cfg.rrtMaxIterations} iterations.")
+    return path
+
+
+def path_length(path):
+    """Total length of an (N, 2|3) waypoint path."""
+    path = np.asarray(path, dtype=float)
+    return float(np.linalg.norm(np.diff(path, axis=0), axis=1).sum())
@@ -0,0 +1,146 @@
+"""
+smoothing.py  –  shortcut and smooth planned paths before they are flown
+
+RRT paths come out as chains of rrtStepSize (5 m) edges that zig-zag
+around the random samples, and BaseUAV.moveStep ends every tick at the
+next waypoint, so each extra waypoint costs a tick as well as distance.
+Between planning and execution a path goes through
+
+    greedy     from each kept waypoint jump to the farthest later waypoint
+               that is directly reachable – all candidates checked in one
+               segments_collide() call
+    random     SHORTCUT_ROUNDS rounds of SHORTCUT_BATCH random shortcuts
+               between points anywhere along the path (not only
+               waypoints); each round checks its batch in one call and
+               applies the non-overlapping free ones, best saving first
+    spline     optional: a smoothing spline through the waypoints,
+               resampled every splineSpacing metres and kept only if every
+               resampled edge is free
+
+Endpoints are kept exactly, every edge of the result is collision-free,
+and the path never gets longer.  cfg.pathShortcut / cfg.pathSpline switch
+the stages; smooth_path() returns the new path with its length before
+and after.
+"""
+
+import numpy as np
+from scipy.interpolate import splev, splprep
+
+from .collision import segments_collide
+from .rrt import path_length
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+SHORTCUT_ROUNDS = 20       # random shortcut rounds
+SHORTCUT_BATCH  = 32       # candidate shortcuts checked per round
+MIN_GAIN_M      = 1e-6     # (m) shortcuts saving less than this are skipped
+SPLINE_SMOOTH   = 1.0      # splprep smoothing factor per waypoint (m²)
+
+# ------------------------------------------------------------------
+# Shortcutting
+# ------------------------------------------------------------------
+def shortcut_greedy(path, env):
+    """Keep a waypoint only if the farthest one before it is not reachable."""
+    path = np.asarray(path, dtype=float)
+    if len(path) <= 2:
+        return path
+    keep, i = [0], 0
+    while i < len(path) - 1:
+        later = np.arange(i + 1, len(path))
+        free  = ~segments_collide(env, np.broadcast_to(path[i], (len(later), 3)),
+                                  path[later])
+        free[0] = True                 # the original edge is free by construction
+        i = int(later[np.flatnonzero(free)[-1]])
+        keep.append(i)
+    return path[keep]
+
+def _point_at(path, cum, s, env):
+    """Points at arc lengths *s* along *path* (cum = cumulative lengths)."""
+    j = np.clip(np.searchsorted(cum, s, side="right") - 1, 0, len(path) - 2)
+    seg = cum[j + 1] - cum[j]
+    t = np.divide(s - cum[j], seg, out=np.zeros_like(s), where=seg > 0)
+    p = path[j] + t[:, None] * (path[j + 1] - path[j])
+    # interpolation round-off must not step off the map (z < 0 on the ground)
+    hi = np.nextafter(np.array([env.width, env.height, env.depth], dtype=float), 0)
+    return np.clip(p, 0.0, hi), j
+
+def _dedupe(path):
+    """Drop repeated points, always keeping the exact first and last one."""
+    step = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    dup  = np.flatnonzero(step <= MIN_GAIN_M) + 1           # later point of a pair
+    dup  = np.where(dup == len(path) - 1, dup - 1, dup)     # ... unless it is the goal
+    keep = np.ones(len(path), dtype=bool)
+    keep[dup[dup > 0]] = False
+    return path[keep]
+
+def shortcut_random(path, env, rng, rounds=SHORTCUT_ROUNDS, batch=SHORTCUT_BATCH):
+    """Randomized partial shortcuts between arbitrary points of the path."""
+    path = np.asarray(path, dtype=float)
+    for _ in range(rounds):
+        if len(path) <= 2:
+            break
+        cum = np.concatenate([[0.0], np.cumsum(
+              np.linalg.norm(np.diff(path, axis=0), axis=1))])
+        s   = np.sort(rng.random((batch, 2)) * cum[-1], axis=1)
+        a, ja = _point_at(path, cum, s[:, 0], env)
+        b, jb = _point_at(path, cum, s[:, 1], env)
+        gain  = (s[:, 1] - s[:, 0]) - np.sqrt(((b - a) ** 2).sum(axis=1))
+        cand  = np.flatnonzero((jb > ja) & (gain > MIN_GAIN_M))
+        if not len(cand):
+            continue
+        cand = cand[~segments_collide(env, a[cand], b[cand])]
+        # apply non-overlapping shortcuts, largest saving first
+        used, pieces = [], []
+        for k in cand[np.argsort(-gain[cand])]:
+            if all(s[k, 1] <= lo or s[k, 0] >= hi for lo, hi in used):
+                used.append((s[k, 0], s[k, 1]))
+                pieces.append(k)
+        pieces.sort(key=lambda k: s[k, 0])
+        out, last = [path[:1]], 0
+        for k in pieces:
+            out += [path[last + 1:ja[k] + 1], a[k:k + 1], b[k:k + 1]]
+            last = jb[k]
+        out.append(path[last + 1:])
+        path = np.vstack(out)
+        # drop repeated points left where a shortcut starts or ends on a waypoint
+        path = _dedupe(path)
+    return path
+
+# ------------------------------------------------------------------
+# Spline resampling
+# ------------------------------------------------------------------
+def spline_resample(path, env, spacing):
+    """
+    Smoothing-spline version of *path* with points every *spacing* metres,
+    or *path* unchanged if the spline would be longer or hit anything.
+    """
+    path = np.asarray(path, dtype=float)
+    if len(path) < 4:
+        return path
+    try:
+        tck, _ = splprep(path.T, s=SPLINE_SMOOTH * len(path),
+                         k=min(3, len(path) - 1))
+    except (ValueError, TypeError):
+        return path
+    n   = max(2, int(np.ceil(path_length(path) / spacing)) + 1)
+    out = np.column_stack(splev(np.linspace(0.0, 1.0, n), tck))
+    out[0], out[-1] = path[0], path[-1]
+    if (path_length(out) > path_length(path) or
+            segments_collide(env, out[:-1], out[1:]).any()):
+        return path
+    return out
+
+# ------------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------------
+def smooth_path(path, env, cfg, rng=None):
+    """(path, length before, length after) after the stages cfg enables."""
+    before = path_length(path)
+    if getattr(cfg, "pathShortcut", True):
+        path = shortcut_greedy(path, env)
+        rng  = rng if rng is not None else np.random.default_rng()
+        path = shortcut_random(path, env, rng)
+    if getattr(cfg, "pathSpline", False):
+        path = spline_resample(path, env, float(cfg.splineSpacing))
+    return path, before, path_length(path)
@@ -0,0 +1,239 @@
+"""
+vehicles.py  –  BaseUAV / GroundVehicle / AerialDrone (classes/*.m)
+
+runRescueMission builds four handle objects and calls moveStep on each of
+them every tick.  For fleets of hundreds the state lives in one Fleet
+instead, as a structure of arrays:
+
+    pos      (N, 3)   current positions
+    speed    (N,)     m/s
+    wp       (N,)     index of the next waypoint within the vehicle's path
+    dist     (N,)     totalDistanceTraveled
+    assigned (N,)     survivor index, −1 = none
+    paths    one flat (M, 3) waypoint buffer; vehicle k's path is
+             buf[start[k] : start[k] + count[k]]
+
+Fleet.step(dt) advances every vehicle in one vectorized update.  It keeps
+BaseUAV.moveStep's rule that a tick ends at the next waypoint even if
+speed × dt would carry the vehicle further (the overshoot is dropped, not
+carried over) – the fixed-step kernel in mission.py and the analytic
+schedules of the event kernel both rely on that rule.
+
+GroundVehicle / AerialDrone are thin views (fleet, row) whose attributes
+read and write the arrays, so code written against the per-object API
+(vehicle.position, vehicle.move_step(dt), ...) keeps working.
+"""
+
+import numpy as np
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+# runRescueMission.m builds exactly this fleet: (class, id, start, speed)
+DEFAULT_FLEET = [("ground", 1, (10, 10, 0),  2),
+                 ("ground", 2, (20, 20, 0),  2),
+                 ("aerial", 3, (10, 10, 50), 4),
+                 ("aerial", 4, (30, 30, 60), 4)]
+
+PATH_CAPACITY = 1024     # initial waypoint rows in the shared path buffer
+START_GRID_M  = 10       # (m) spacing of the start lattice for extra vehicles
+
+# ------------------------------------------------------------------
+# Fleet state
+# ------------------------------------------------------------------
+class Fleet:
+    """Structure-of-arrays state of N vehicles; indexable into vehicle views."""
+
+    def __init__(self, specs=()):
+        specs = list(specs)
+        n = len(specs)
+        self.kind     = [kind for kind, *_ in specs]
+        self.ids      = np.array([i for _, i, *_ in specs], dtype=int)
+        self.pos      = np.array([p for *_, p, _ in specs], dtype=float).reshape(n, 3)
+        self.speed    = np.array([s for *_, s in specs], dtype=float)
+        self.wp       = np.zeros(n, dtype=np.int64)
+        self.dist     = np.zeros(n)
+        self.assigned = np.full(n, -1)
+        self.start    = np.zeros(n, dtype=np.int64)
+        self.count    = np.zeros(n, dtype=np.int64)
+        self._buf     = np.empty((PATH_CAPACITY, 3))
+        self._used    = 0
+        self._views   = [VIEW_CLASS[kind](self, k) for k, kind in enumerate(self.kind)]
+
+    def __len__(self):
+        return len(self._views)
+
+    def __getitem__(self, k):
+        return self._views[k]
+
+    def __iter__(self):
+        return iter(self._views)
+
+    @property
+    def modes(self):
+        return [v.mode for v in self._views]
+
+    # ------------------------------------------------------ path buffer
+    def path(self, k):
+        return self._buf[self.start[k]:self.start[k] + self.count[k]]
+
+    def set_path(self, k, path):
+        """Replace vehicle k's path (copied into the shared buffer)."""
+        path = np.asarray(path, dtype=float).reshape(-1, 3)
+        if self._used + len(path) > len(self._buf):
+            self._compact(len(path))
+        self.start[k], self.count[k] = self._used, len(path)
+        self._buf[self._used:self._used + len(path)] = path
+        self._used += len(path)
+        self.wp[k] = 0
+
+    def _compact(self, extra):
+        """Drop replaced paths; grow the buffer if the live ones still don't fit."""
+        live = int(self.count.sum()) + extra
+        size = len(self._buf)
+        while size < 2 * live:
+            size *= 2
+        buf, used = np.empty((size, 3)), 0
+        for k in np.flatnonzero(self.count):
+            c = self.count[k]
+            buf[used:used + c] = self._buf[self.start[k]:self.start[k] + c]
+            self.start[k], used = used, used + c
+        self._buf, self._used = buf, used
+
+    # ------------------------------------------------------------- step
+    def step(self, dt, mask=None):
+        """moveStep for every vehicle (or those in *mask*) at once."""
+        active = self.wp < self.count
+        if mask is not None:
+            active &= mask
+        k = np.flatnonzero(active)
+        if not k.size:
+            return
+        target  = self._buf[self.start[k] + self.wp[k]]
+        d_vec   = target - self.pos[k]
+        dist_to = np.sqrt((d_vec ** 2).sum(axis=1))
+        move    = self.speed[k] * dt
+        arrive  = move >= dist_to
+        frac    = np.divide(move, dist_to, out=np.zeros_like(move), where=~arrive)
+        self.pos[k]  = np.where(arrive[:, None], target, self.pos[k] + frac[:, None] * d_vec)
+        self.dist[k] += np.where(arrive, dist_to, move)
+        self.wp[k]   += arrive
+
+# ------------------------------------------------------------------
+# Vehicle views
+# ------------------------------------------------------------------
+class BaseUAV:
+    """One row of a Fleet, with the attribute names of classes/BaseUAV.m."""
+
+    kind = None        # 'ground' | 'aerial'
+    mode = None        # planning space: '2D' | '3D'
+
+    def __init__(self, fleet, k):
+        self.fleet, self.k = fleet, k
+
+    @classmethod
+    def standalone(cls, id, start_pos, speed):
+        """A vehicle in a fleet of its own (BaseUAV(id, type, startPos, spd))."""
+        return Fleet([(cls.kind, id, start_pos, speed)])[0]
+
+    id       = property(lambda self: int(self.fleet.ids[self.k]))
+    speed    = property(lambda self: float(self.fleet.speed[self.k]))
+    path     = property(lambda self: self.fleet.path(self.k))
+    path_idx = property(lambda self: int(self.fleet.wp[self.k]))
+
+    @property
+    def position(self):
+        return self.fleet.pos[self.k]
+
+    @position.setter
+    def position(self, p):
+        self.fleet.pos[self.k] = p
+
+    @property
+    def total_distance(self):
+        return float(self.fleet.dist[self.k])
+
+    @property
+    def assigned_survivor(self):
+        sid = self.fleet.assigned[self.k]
+        return None if sid < 0 else int(sid)
+
+    @assigned_survivor.setter
+    def assigned_survivor(self, sid):
+        self.fleet.assigned[self.k] = -1 if sid is None else sid
+
+    def set_path(self, path):
+        self.fleet.set_path(self.k, path)
+
+    def move_step(self, dt):
+        """Advance along the path by speed × dt, stopping at the next waypoint."""
+        mask = np.zeros(len(self.fleet), dtype=bool)
+        mask[self.k] = True
+        self.fleet.step(dt, mask)
+
+
+class GroundVehicle(BaseUAV):
+    """Drives on the ground map; plans in 2-D (z = 0)."""
+    kind, mode = "ground", "2D"
+
+
+class AerialDrone(BaseUAV):
+    """Flies in the 3-D map."""
+    kind, mode = "aerial", "3D"
+
+
+VIEW_CLASS = {"ground": GroundVehicle, "aerial": AerialDrone}
+
+def default_fleet():
+    """The four vehicles runRescueMission.m creates, in UAV-id order."""
+    return Fleet(DEFAULT_FLEET)
+
+def _starts(kind, n, cfg, env):
+    """
+    Start positions for *n* vehicles of *kind*: those of DEFAULT_FLEET
+    first, then a START_GRID_M lattice from the (10, 10) corner, skipping
+    points taken already or (with *env*) inside a building – fixed starts
+    included, which the layout may have built over.
+    """
+    def blocked(pts):
+        if env is None:
+            return np.zeros(len(pts), dtype=bool)
+        return env.occupied2d(pts[:, :2]) if kind == "ground" else env.occupied3d(pts)
+
+    fixed = [p for k, _, p, _ in DEFAULT_FLEET if k == kind]
+    out   = [tuple(map(float, p)) for p in fixed[:n]]
+    if out:
+        out = [p for p, b in zip(out, blocked(np.array(out))) if not b]
+    if len(out) == n:
+        return out
+    taken = {p[:2] for p in out}
+    xs    = np.arange(START_GRID_M, cfg.mapWidth, START_GRID_M, dtype=float)
+    ys    = np.arange(START_GRID_M, cfg.mapHeight, START_GRID_M, dtype=float)
+    gx, gy = np.meshgrid(xs, ys)
+    # ring by ring away from the corner, so small fleets stay together
+    order = np.lexsort((gx.ravel(), np.maximum(gx, gy).ravel()))
+    xy    = np.column_stack([gx.ravel(), gy.ravel()])[order]
+    z     = 0.0 if kind == "ground" else float(fixed[-1][2]) if fixed else 0.0
+    pts   = np.column_stack([xy, np.full(len(xy), z)])
+    pts   = pts[~blocked(pts)]
+    for p in map(tuple, pts):
+        if len(out) == n:
+            break
+        if p[:2] not in taken:
+            out.append(p)
+    if len(out) < n:
+        raise ValueError(f"no room for {n} {kind} vehicles on the start lattice")
+    return out
+
+def make_fleet(cfg, env=None):
+    """
+    cfg.numGround ground vehicles at cfg.groundSpeed, then cfg.numAerial
+    drones at cfg.aerialSpeed, with UAV ids 1..N in that order (as g1, g2,
+    d1, d2 in runRescueMission.m).
+    """
+    specs = []
+    for kind, n, speed in (("ground", cfg.numGround, cfg.groundSpeed),
+                           ("aerial", cfg.numAerial, cfg.aerialSpeed)):
+        for p in _starts(kind, int(n), cfg, env):
+            specs.append((kind, len(specs) + 1, p, speed))
+    return Fleet(specs)